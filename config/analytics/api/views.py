@@ -2,13 +2,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from analytics.models import AnalyticsSnapshot
 from analytics.api.serializers import AnalyticsSnapshotSerializer
-from system.db_registry import ensure_tenant_db_registered
+from system.read_replicas import get_tenant_read_db
 
 
 class ProjectAnalyticsAPIView(APIView):
     def get(self, request, project_id):
         user = request.user
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_read_db(user)
 
         snapshots = AnalyticsSnapshot.objects.using(db).filter(
             project_id=project_id
@@ -1,6 +1,8 @@
 from datetime import date
 from django.db.models import Avg
+from django.utils import timezone
 from tasks.models import Task, TaskSLA
+from tasks.services.task_counter_service import TaskCounterService
 from analytics.models import AnalyticsSnapshot
 
 
@@ -13,6 +15,27 @@ class AnalyticsService:
     def generate_daily_snapshot(*,db, project, snapshot_date=None):
         snapshot_date = snapshot_date or date.today()
 
+        if snapshot_date == timezone.localdate():
+            # Today's snapshot is a copy of the maintained counters, O(1)
+            # instead of a scan over the project's tasks.
+            # Clamped: a drifted counter must not fail the snapshot (the
+            # fields are unsigned); reconcile_task_counters repairs it.
+            counters = {
+                field: max(value, 0)
+                for field, value in TaskCounterService.current(db=db, project_id=project.id).items()
+            }
+            sla_tasks = counters.pop("sla_tasks")
+            in_progress_seconds = counters.pop("in_progress_seconds")
+            snapshot, _ = AnalyticsSnapshot.objects.using(db).update_or_create(
+                project=project,
+                date=snapshot_date,
+                defaults={
+                    **counters,
+                    "avg_completion_seconds": in_progress_seconds // sla_tasks if sla_tasks else 0,
+                },
+            )
+            return snapshot
+
         tasks = Task.objects.using(db).filter(
             project=project,
             is_deleted=False,
@@ -26,3 +26,15 @@ def generate_project_snapshot(self, *, db: str, project_id: int, snapshot_date=N
         snapshot_date=snapshot_date,
     )
 
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_kwargs={"max_retries": 3})
+def refresh_project_snapshot(self, *, tenant_id: str, project_id: int) -> None:
+    """
+    Debounced refresh scheduled by SnapshotRefreshService.mark_dirty.
+    """
+    from analytics.services.snapshot_refresh import SnapshotRefreshService
+
+    SnapshotRefreshService.clear(tenant_id=tenant_id, project_id=project_id)
+    db = ensure_tenant_db_registered(tenant_id)
+    generate_project_snapshot(db=db, project_id=project_id)
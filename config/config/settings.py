@@ -59,13 +59,15 @@ AUTH_USER_MODEL = "system.User"
 
 
 MIDDLEWARE = [
-    'system.tenant_db_middleware.TenantDatabaseMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # sheds over-limit tenants (JWT claim) before any other work
+    'system.middleware_rate_limit.TenantRateLimitMiddleware',
+    # caps each tenant's in-flight requests across workers
+    'system.middleware_rate_limit.TenantConcurrencyLimitMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
 
     # custome tenant middleware
     'system.middleware.TenantMiddleware',
-    'system.middleware_rate_limit.TenantRateLimitMiddleware',
 
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -169,7 +171,11 @@ CELERY_BEAT_SCHEDULE = {
     "daily-project-analytics": {
         "task": "analytics.tasks.generate_daily_project_analytics",
         "schedule": crontab(hour=0, minute=0),
-    }
+    },
+    "replenish-tenant-warm-pool": {
+        "task": "system.tasks.replenish_warm_pool",
+        "schedule": 60.0,
+    },
 }
 
 # Celery / Redis configuration
@@ -192,16 +198,169 @@ CACHES = {
     }
 }
 
-# Rate limiting defaults (per-tenant)
+# Rate limiting defaults (per-tenant); algorithm is "gcra",
+# "sliding_window_counter", "sliding_window_log" or a dotted RateLimiter path
 RATE_LIMIT = {
     "requests": int(os.getenv("RATE_LIMIT_REQUESTS", 200)),
     "window_seconds": int(os.getenv("RATE_LIMIT_WINDOW", 60)),
+    "algorithm": os.getenv("RATE_LIMIT_ALGORITHM", "gcra"),
+    # units a request costs, by URL name or view class name (tenants on
+    # a Plan get its requests/window_seconds instead of the above)
+    "default_cost": 1,
+    "costs": {
+        "project-analytics": 10,
+        "projects-list": 3,
+        "tasks-list": 3,
+        "tasks-bulk": 20,
+        "tasks-bulk-update": 10,
+    },
+    # "redis": check every request in Redis; "hybrid": in-process buckets
+    # reconciled with Redis every sync_interval_ms, each worker admitting
+    # at most error_budget * requests per key between reconciliations
+    "mode": os.getenv("RATE_LIMIT_MODE", "redis"),
+    "sync_interval_ms": int(os.getenv("RATE_LIMIT_SYNC_INTERVAL_MS", 200)),
+    "error_budget": float(os.getenv("RATE_LIMIT_ERROR_BUDGET", 0.1)),
+    # consecutive Redis failures before skipping Redis, and seconds
+    # between background probes while it is skipped
+    "breaker_failures": int(os.getenv("RATE_LIMIT_BREAKER_FAILURES", 5)),
+    "breaker_reset_seconds": float(os.getenv("RATE_LIMIT_BREAKER_RESET", 5)),
+}
+
+# Fleet-wide cap on in-flight API requests per tenant. The cap starts at
+# "initial" and adapts between minimum and maximum: a request slower
+# than target_latency_ms multiplies it by backoff (at most once per
+# lease_seconds), fast ones grow it by about one per cap's worth of
+# requests. Leases of crashed workers expire after lease_seconds.
+CONCURRENCY_LIMIT = {
+    "enabled": os.getenv("CONCURRENCY_LIMIT_ENABLED", "true").lower() == "true",
+    "initial": int(os.getenv("CONCURRENCY_LIMIT_INITIAL", 4)),
+    "minimum": int(os.getenv("CONCURRENCY_LIMIT_MIN", 1)),
+    "maximum": int(os.getenv("CONCURRENCY_LIMIT_MAX", 16)),
+    "target_latency_ms": int(os.getenv("CONCURRENCY_LIMIT_TARGET_MS", 1000)),
+    "backoff": float(os.getenv("CONCURRENCY_LIMIT_BACKOFF", 0.9)),
+    "lease_seconds": int(os.getenv("CONCURRENCY_LIMIT_LEASE", 60)),
+    "retry_after_seconds": 1,
+    # consecutive Redis failures before admitting without a lease, and
+    # seconds between background probes while Redis is skipped
+    "breaker_failures": int(os.getenv("CONCURRENCY_LIMIT_BREAKER_FAILURES", 5)),
+    "breaker_reset_seconds": float(os.getenv("CONCURRENCY_LIMIT_BREAKER_RESET", 5)),
+}
+
+# Per-process tenant DB alias registry (LRU + TTL bound on live aliases)
+TENANT_DB_REGISTRY = {
+    "max_aliases": int(os.getenv("TENANT_DB_MAX_ALIASES", 100)),
+    "ttl_seconds": int(os.getenv("TENANT_DB_ALIAS_TTL", 900)),
+}
+
+# Pooled connections for tenant aliases (per tenant min/max, process-wide cap)
+TENANT_DB_POOL = {
+    "enabled": os.getenv("TENANT_DB_POOL_ENABLED", "true").lower() == "true",
+    "engine": "system.db_backends.postgresql_pool",
+    "min_size": int(os.getenv("TENANT_DB_POOL_MIN", 0)),
+    "max_size": int(os.getenv("TENANT_DB_POOL_MAX", 5)),
+    "max_total": int(os.getenv("TENANT_DB_POOL_MAX_TOTAL", 50)),
+    # Pool shared by all schema-mode tenants of one physical database
+    "shared_max_size": int(os.getenv("TENANT_DB_POOL_SHARED_MAX", 20)),
+    "acquire_timeout": float(os.getenv("TENANT_DB_POOL_TIMEOUT", 5)),
+    "idle_timeout": int(os.getenv("TENANT_DB_POOL_IDLE_TIMEOUT", 300)),
+}
+
+# Tenant resolution cache: per-process LRU (L1) in front of Redis (L2)
+TENANT_CACHE = {
+    "local_max_size": int(os.getenv("TENANT_CACHE_LOCAL_SIZE", 1000)),
+    "local_ttl_seconds": int(os.getenv("TENANT_CACHE_LOCAL_TTL", 30)),
+    "shared_ttl_seconds": int(os.getenv("TENANT_CACHE_SHARED_TTL", 300)),
+    "invalidation_channel": os.getenv("TENANT_CACHE_CHANNEL", "tenant:invalidate"),
+    # Unknown/rejected tenant IDs: negative cache TTL and Bloom filter of valid IDs
+    "negative_ttl_seconds": int(os.getenv("TENANT_CACHE_NEGATIVE_TTL", 60)),
+    "bloom_error_rate": float(os.getenv("TENANT_BLOOM_ERROR_RATE", 0.001)),
+    "bloom_rebuild_seconds": int(os.getenv("TENANT_BLOOM_REBUILD", 600)),
 }
 
 # Database superuser for tenant creation
 DB_SUPERUSER = os.getenv('DB_SUPERUSER', 'postgres')
 DB_SUPERUSER_PASSWORD = os.getenv('DB_SUPERUSER_PASSWORD', 'postgres')
 
+# Tenant isolation: "DATABASE" (one Postgres DB each) or "SCHEMA"
+# (one schema each inside the shared database below, on the placed host)
+TENANT_DEFAULT_ISOLATION_MODE = os.getenv("TENANT_ISOLATION_MODE", "DATABASE")
+TENANT_SCHEMA_DATABASE = {
+    "NAME": os.getenv("TENANT_SHARED_DB_NAME", "tenants_shared"),
+}
+
+# Migrated template each new tenant DB is cloned from (CREATE DATABASE
+# ... TEMPLATE); rebuilt by rebuild_tenant_templates when migrations change
+TENANT_TEMPLATE_DATABASE = {
+    "enabled": os.getenv("TENANT_TEMPLATE_ENABLED", "true").lower() == "true",
+    "NAME": os.getenv("TENANT_TEMPLATE_DB_NAME", "tenant_template"),
+}
+
+# migrate_tenants defaults: worker processes, per-tenant time limit
+# (seconds) and how many tenants to migrate first as canaries
+TENANT_MIGRATIONS = {
+    "concurrency": int(os.getenv("TENANT_MIGRATE_CONCURRENCY", 8)),
+    "timeout_seconds": float(os.getenv("TENANT_MIGRATE_TIMEOUT", 300)),
+    "canary": int(os.getenv("TENANT_MIGRATE_CANARY", 1)),
+}
+
+# Migrated, unassigned tenant databases kept ready per host for signups
+# (topped up by the replenish-tenant-warm-pool beat task)
+TENANT_WARM_POOL = {
+    "enabled": os.getenv("TENANT_WARM_POOL_ENABLED", "true").lower() == "true",
+    "size": int(os.getenv("TENANT_WARM_POOL_SIZE", 5)),
+    "lock_seconds": int(os.getenv("TENANT_WARM_POOL_LOCK", 600)),
+}
+
+# Which registered DatabaseHost a new tenant goes to:
+# "least_loaded", "round_robin", "pinned" or a dotted PlacementPolicy path.
+# Without any DatabaseHost rows tenants go to the default host.
+TENANT_PLACEMENT = {
+    "policy": os.getenv("TENANT_PLACEMENT_POLICY", "least_loaded"),
+    "pinned_host": os.getenv("TENANT_PLACEMENT_PINNED_HOST"),
+    "default_host": os.getenv("TENANT_DB_HOST", "localhost"),
+    "default_port": os.getenv("TENANT_DB_PORT", "5432"),
+}
+
+# Read replicas (TenantDatabase.replicas) for list/analytics reads:
+# reads stay on the primary for sticky_seconds after a user's write and
+# whenever replica lag exceeds max_lag_seconds (probed every lag_check_seconds,
+# connecting with a connect_timeout_seconds timeout)
+TENANT_READ_REPLICAS = {
+    "enabled": os.getenv("TENANT_READ_REPLICAS_ENABLED", "true").lower() == "true",
+    "sticky_seconds": int(os.getenv("TENANT_REPLICA_STICKY_SECONDS", 5)),
+    "max_lag_seconds": float(os.getenv("TENANT_REPLICA_MAX_LAG", 10)),
+    "lag_check_seconds": float(os.getenv("TENANT_REPLICA_LAG_CHECK", 5)),
+    "connect_timeout_seconds": int(os.getenv("TENANT_REPLICA_CONNECT_TIMEOUT", 2)),
+}
+
+# Online tenant moves (relocate_tenant / move_tenant_storage): rows per
+# copy batch and how long in-flight writes may drain once every worker
+# sees the tenant read-only (the wait is TENANT_CACHE local TTL + this)
+TENANT_RELOCATION = {
+    "batch_size": int(os.getenv("TENANT_RELOCATION_BATCH", 1000)),
+    "drain_seconds": float(os.getenv("TENANT_RELOCATION_DRAIN", 2)),
+}
+
+# Task writes mark their project dirty; one snapshot refresh per project
+# runs refresh_window_seconds after the first write of a window
+ANALYTICS_SNAPSHOTS = {
+    "refresh_window_seconds": int(os.getenv("ANALYTICS_SNAPSHOT_REFRESH_WINDOW", 30)),
+}
+
+# POST /api/v1/tasks/bulk/ and bulk-update/: most items accepted per
+# request and rows per INSERT/UPDATE statement
+TASK_BULK = {
+    "max_items": int(os.getenv("TASK_BULK_MAX_ITEMS", 5000)),
+    "batch_size": int(os.getenv("TASK_BULK_BATCH_SIZE", 500)),
+}
+
+# Keyset pagination of list endpoints: rows per page by default and the
+# most a client may ask for with ?page_size=
+PAGINATION = {
+    "page_size": int(os.getenv("PAGINATION_PAGE_SIZE", 50)),
+    "max_page_size": int(os.getenv("PAGINATION_MAX_PAGE_SIZE", 500)),
+}
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -209,6 +368,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_PAGINATION_CLASS": "config.pagination.KeysetPagination",
 }
 SESSION_ENGINE = "django.contrib.sessions.backends.db"
 SESSION_COOKIE_NAME = "master_sessionid"
\ No newline at end of file
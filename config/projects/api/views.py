@@ -59,7 +59,7 @@
 #         return Response(serializer.data, status=status.HTTP_201_CREATED)
 # projects/api/views.py
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 
 from projects.api.serializers import ProjectSerializer
 from projects.services.project_service import ProjectService
@@ -78,7 +78,12 @@ class ProjectViewSet(ModelViewSet):
         Time: O(N)
         Space: O(1)
         """
-        return ProjectService.list_projects(user=self.request.user)
+        # Updates/deletes look objects up through here too; only safe
+        # requests may read from a replica.
+        return ProjectService.list_projects(
+            user=self.request.user,
+            read_only=self.request.method in SAFE_METHODS,
+        )
 
     def perform_create(self, serializer):
         project = ProjectService.create_project(
@@ -17,6 +17,11 @@ class Project(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["is_deleted"]),
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_deleted=False),
+                name="project_live_created_idx",
+            ),
         ]
 
     def __str__(self) -> str:
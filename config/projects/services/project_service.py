@@ -3,13 +3,14 @@ from django.core.exceptions import PermissionDenied
 from config.permissions import Permissions
 from system.tenant_context import set_current_tenant_db as set_current_tenant
 from system.tenant_context import get_current_tenant_db
-from system.db_registry import ensure_tenant_db_registered
+from system.db_registry import get_tenant_db
+from system.read_replicas import get_tenant_read_db
 
 class ProjectService:
 
     @staticmethod
-    def list_projects(*, user):
-        db = ensure_tenant_db_registered(user.tenant)
+    def list_projects(*, user, read_only: bool = False):
+        db = get_tenant_read_db(user) if read_only else get_tenant_db(user)
         set_current_tenant(db)
 
         return Project.objects.using(db).filter(is_deleted=False)
@@ -20,7 +21,7 @@ class ProjectService:
             raise PermissionDenied("Not allowed to create project")
 
         # Ensure tenant context is set for the user's tenant
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
         set_current_tenant(db)
 
         return Project.objects.using(db).create(
@@ -31,7 +32,7 @@ class ProjectService:
 
     @staticmethod
     def get_project(*, user, project_id):
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
         set_current_tenant(db)
         return Project.objects.using(db).get(id=project_id, is_deleted=False)
 
@@ -40,7 +41,7 @@ class ProjectService:
         if not Permissions.can_update_project(user):  # assuming such permission
             raise PermissionDenied("Not allowed to update project")
 
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
         set_current_tenant(db)
         project = Project.objects.using(db).get(id=project_id, is_deleted=False)
         project.name = name
@@ -53,7 +54,8 @@ class ProjectService:
         if not Permissions.can_delete_project(user):  # assuming
             raise PermissionDenied("Not allowed to delete project")
 
-        set_current_tenant(user.tenant)
-        project = Project.objects.using("tenant").get(id=project_id, is_deleted=False)
+        db = get_tenant_db(user)
+        set_current_tenant(db)
+        project = Project.objects.using(db).get(id=project_id, is_deleted=False)
         project.is_deleted = True
         project.save()
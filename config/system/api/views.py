@@ -1,9 +1,14 @@
+import os
 from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from system.models import Tenant
 from system.api.serializers import TenantSerializer
 from drf_yasg.utils import swagger_auto_schema
 from config.swagger import TENANT_HEADER
+from system.db_pool import tenant_pools
+from system.db_registry import tenant_connections
+from system.tenant_cache import tenant_resolver
 
 
 class TenantListAPIView(APIView):
@@ -14,4 +19,21 @@ class TenantListAPIView(APIView):
     def get(self, request):
         tenants = Tenant.objects.filter(is_active=True)
         return Response(TenantSerializer(tenants, many=True).data)
-    
\ No newline at end of file
+
+
+class TenantCacheStatsAPIView(APIView):
+    """
+    Per-process counters for tenant resolution, the alias registry and
+    the tenant connection pools.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "pid": os.getpid(),
+                "tenant_resolver": tenant_resolver.stats(),
+                "db_registry": tenant_connections.stats(),
+                "db_pools": tenant_pools.stats(),
+            }
+        )
@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency.
+
+    After ``failure_threshold`` consecutive failures the breaker opens
+    and ``allow()`` returns False without touching the dependency. Once
+    ``reset_timeout`` seconds have passed it is probed again: with a
+    ``probe`` callable the probe runs on a background thread (callers
+    never wait on it), otherwise a single caller is let through as the
+    half-open trial. Success closes the breaker, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        probe: Optional[Callable[[], object]] = None,
+    ):
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.reset_timeout = reset_timeout
+        self._probe = probe
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return self.CLOSED
+            return self.HALF_OPEN if self._probing else self.OPEN
+
+    def allow(self) -> bool:
+        """
+        Time: O(1)
+        Space: O(1)
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+
+            self._probing = True
+            if self._probe is None:
+                return True
+
+        threading.Thread(target=self._run_probe, name="circuit-breaker-probe", daemon=True).start()
+        return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuit breaker closed")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+                if self._opened_at is None:
+                    logger.warning("Circuit breaker opened after %s failures", self._failures)
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def _run_probe(self) -> None:
+        try:
+            self._probe()
+        except Exception:
+            self.record_failure()
+        else:
+            self.record_success()
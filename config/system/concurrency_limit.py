@@ -0,0 +1,152 @@
+import uuid
+from dataclasses import dataclass
+
+# Per-key semaphore as a sorted set of leases scored by expiry, so a
+# worker that dies mid-request only holds its slot until the lease
+# runs out. The adaptive limit lives next to it as a float (AIMD needs
+# fractional increases) and resets to ``initial`` when a key goes idle;
+# a third key holds when the limit was last cut. Both scripts read the
+# clock with TIME, like system.rate_limit.
+
+ACQUIRE = """
+local leases = KEYS[1]
+local limit_key = KEYS[2]
+local lease_id = ARGV[1]
+local lease_ms = tonumber(ARGV[2])
+local initial = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+redis.call('ZREMRANGEBYSCORE', leases, '-inf', now)
+local limit = math.floor(tonumber(redis.call('GET', limit_key) or initial))
+local in_flight = redis.call('ZCARD', leases)
+
+if in_flight >= limit then
+    return {0, in_flight, limit}
+end
+
+redis.call('ZADD', leases, now + lease_ms, lease_id)
+redis.call('PEXPIRE', leases, lease_ms)
+return {1, in_flight + 1, limit}
+"""
+
+# ARGV: lease id, latency (ms), target latency (ms), initial, minimum,
+# maximum, backoff factor, limit ttl (ms), lease (ms). Returns the new
+# limit.
+RELEASE = """
+local leases = KEYS[1]
+local limit_key = KEYS[2]
+local decreased_key = KEYS[3]
+local latency = tonumber(ARGV[2])
+local target = tonumber(ARGV[3])
+local minimum = tonumber(ARGV[5])
+local maximum = tonumber(ARGV[6])
+
+redis.call('ZREM', leases, ARGV[1])
+local limit = tonumber(redis.call('GET', limit_key) or ARGV[4])
+
+if latency > target then
+    -- multiplicative decrease, at most once per lease period: the other
+    -- slow requests of a burst were admitted under the old limit
+    local clock = redis.call('TIME')
+    local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+    local decreased = tonumber(redis.call('GET', decreased_key) or 0)
+    if now - decreased >= tonumber(ARGV[9]) then
+        limit = math.max(minimum, limit * tonumber(ARGV[7]))
+        redis.call('SET', decreased_key, now, 'PX', ARGV[8])
+    end
+else
+    -- additive increase: about +1 once a full limit of requests was fast
+    limit = math.min(maximum, limit + 1 / math.max(math.floor(limit), 1))
+end
+
+redis.call('SET', limit_key, string.format('%.4f', limit), 'PX', ARGV[8])
+return math.floor(limit)
+"""
+
+
+@dataclass(frozen=True)
+class Lease:
+    key: str
+    lease_id: str
+    acquired: bool
+    in_flight: int
+    limit: int
+
+
+class ConcurrencyLimiter:
+    """
+    Fleet-wide cap on in-flight requests per key, held in Redis.
+
+    The cap adapts AIMD-style to observed latency: a request slower than
+    ``target_latency`` multiplies it by ``backoff`` (down to ``minimum``),
+    at most once per ``lease_seconds``, and fast requests raise it by one per cap's worth of
+    completions (up to ``maximum``).
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        *,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 16,
+        target_latency: float = 1.0,
+        backoff: float = 0.9,
+        lease_seconds: float = 60,
+        limit_ttl_seconds: float = 600,
+    ):
+        self.redis = redis_client
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.lease_seconds = lease_seconds
+        self.limit_ttl_seconds = limit_ttl_seconds
+        self._acquire = redis_client.register_script(ACQUIRE)
+        self._release = redis_client.register_script(RELEASE)
+
+    @staticmethod
+    def _keys(key: str):
+        # One hash slot per key, should Redis be clustered.
+        return [f"cl:{{{key}}}:leases", f"cl:{{{key}}}:limit", f"cl:{{{key}}}:decreased"]
+
+    def acquire(self, key: str) -> Lease:
+        """
+        Takes a slot for ``key`` if one is free. Raises redis errors.
+
+        Time: O(log N) in Redis where N = in-flight requests for the key
+        Space: O(1)
+        """
+        lease_id = uuid.uuid4().hex
+        acquired, in_flight, limit = self._acquire(
+            keys=self._keys(key),
+            args=[lease_id, int(self.lease_seconds * 1000), self.initial],
+        )
+        return Lease(key, lease_id, bool(acquired), int(in_flight), int(limit))
+
+    def release(self, lease: Lease, latency: float) -> int:
+        """
+        Frees ``lease`` and feeds ``latency`` (seconds) into the cap.
+        Returns the new cap.
+
+        Time: O(log N) in Redis
+        Space: O(1)
+        """
+        return int(
+            self._release(
+                keys=self._keys(lease.key),
+                args=[
+                    lease.lease_id,
+                    int(latency * 1000),
+                    int(self.target_latency * 1000),
+                    self.initial,
+                    self.minimum,
+                    self.maximum,
+                    self.backoff,
+                    int(self.limit_ttl_seconds * 1000),
+                    int(self.lease_seconds * 1000),
+                ],
+            )
+        )
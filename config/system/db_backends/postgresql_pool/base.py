@@ -0,0 +1,86 @@
+from uuid import UUID
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from system.db_pool import tenant_pools
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """
+    PostgreSQL backend for tenant aliases that borrows connections from
+    ``tenant_pools`` instead of opening one per request.
+
+    ``close()`` (end of request, ``tenant_db_context`` exit) hands the
+    connection back to the pool; only the pool ever really closes it.
+    Per-alias limits can be set with a ``POOL`` dict in the alias
+    settings (``min_size`` / ``max_size``; ``False`` disables pooling).
+
+    Aliases with ``TENANT_SCHEMA`` share the pool named by ``POOL_KEY``
+    and get their ``search_path`` set on every checkout.
+
+    Aliases with ``TENANT_ID`` (those registered from a tenant
+    resolution) check out read-only sessions while the tenant is
+    read-only, so writers outside TenantMiddleware (Celery tasks,
+    commands) fail instead of writing to storage that is being moved.
+    """
+
+    @property
+    def _pooled(self) -> bool:
+        return self.settings_dict.get("POOL") is not False
+
+    def get_new_connection(self, conn_params):
+        if not self._pooled:
+            return super().get_new_connection(conn_params)
+
+        connection = tenant_pools.acquire(
+            self.settings_dict.get("POOL_KEY") or self.alias,
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+            self.settings_dict.get("POOL"),
+        )
+
+        # The parent only sets this when it opens a connection.
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        try:
+            self.isolation_level = (
+                IsolationLevel(isolation_level)
+                if isolation_level is not None
+                else IsolationLevel.READ_COMMITTED
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level {isolation_level} specified."
+            )
+        return connection
+
+    def init_connection_state(self):
+        super().init_connection_state()
+
+        schema = self.settings_dict.get("TENANT_SCHEMA")
+        if schema:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"SET search_path TO {self.ops.quote_name(schema)}")
+            if not self.get_autocommit():
+                self.connection.commit()
+
+        read_only = False
+        tenant_id = self.settings_dict.get("TENANT_ID")
+        if tenant_id:
+            # Imported lazily: tenant_cache builds on the DB registry.
+            from system.tenant_cache import tenant_resolver
+
+            resolved = tenant_resolver.resolve(UUID(tenant_id))
+            read_only = resolved is None or resolved.is_read_only
+        # Also resets sessions a shared pool hands over from a read-only
+        # tenant. psycopg2 tracks the flag; SET only runs when it changes.
+        if bool(self.connection.readonly) != read_only:
+            self.connection.readonly = read_only
+
+    def _close(self):
+        if self.connection is not None and self._pooled:
+            tenant_pools.release(self.connection)
+            # Connection can no longer be used by this wrapper.
+            self.connection = None
+        else:
+            super()._close()
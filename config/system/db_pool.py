@@ -0,0 +1,314 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolExhausted(Exception):
+    """
+    No connection could be handed out within ``acquire_timeout``.
+    """
+
+    def __init__(self, key: str, retry_after: int):
+        super().__init__(f"Connection pool exhausted for {key}")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class _TenantPool:
+    """
+    Idle connections and checkout count for one tenant alias.
+    """
+
+    def __init__(self, *, min_size: int, max_size: int):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle: List[Any] = []
+        self.in_use = 0
+        self.closed = False
+        self.last_used = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.idle) + self.in_use
+
+
+class TenantPoolManager:
+    """
+    Per-tenant connection pools sharing one process-wide budget.
+
+    Each tenant alias keeps between ``min_size`` and ``max_size``
+    connections; across all tenants at most ``max_total`` connections
+    are open. When the budget is spent, an idle connection is taken
+    from the least recently used pool (those above their ``min_size``
+    first); if every connection is checked out the caller waits up to
+    ``acquire_timeout`` and then gets ``PoolExhausted``.
+
+    Pools idle longer than ``idle_timeout`` are shrunk back to
+    ``min_size`` and dropped entirely once nothing is checked out.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_total: int,
+        min_size: int = 0,
+        max_size: int = 5,
+        acquire_timeout: float = 5,
+        idle_timeout: float = 300,
+    ):
+        if max_total < 1 or max_size < 1:
+            raise ValueError("max_total and max_size must be >= 1")
+
+        self.max_total = max_total
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+
+        self._pools: Dict[str, _TenantPool] = {}
+        self._owners: Dict[int, _TenantPool] = {}
+        self._total = 0
+        self._cond = threading.Condition()
+        self._last_reap = time.monotonic()
+
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    @classmethod
+    def from_settings(cls) -> "TenantPoolManager":
+        cfg = getattr(settings, "TENANT_DB_POOL", {})
+        return cls(
+            max_total=int(cfg.get("max_total", 50)),
+            min_size=int(cfg.get("min_size", 0)),
+            max_size=int(cfg.get("max_size", 5)),
+            acquire_timeout=float(cfg.get("acquire_timeout", 5)),
+            idle_timeout=float(cfg.get("idle_timeout", 300)),
+        )
+
+    def acquire(self, key: str, connect: Callable[[], Any], limits: Optional[Dict] = None) -> Any:
+        """
+        Checks out an idle connection for ``key`` or opens a new one.
+
+        Time: O(P) when the budget forces an eviction, O(1) otherwise
+        where P = number of pools
+        Space: O(1)
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        victims = []
+
+        with self._cond:
+            pool = self._pool(key, limits)
+
+            while True:
+                if pool.idle:
+                    conn = pool.idle.pop()
+                    pool.in_use += 1
+                    pool.last_used = time.monotonic()
+                    self.reused += 1
+                    break
+
+                if pool.size < pool.max_size:
+                    if self._total >= self.max_total:
+                        victim = self._take_idle_victim(exclude=key)
+                        if victim is not None:
+                            victims.append(victim)
+                            self._total -= 1
+
+                    if self._total < self.max_total:
+                        pool.in_use += 1
+                        pool.last_used = time.monotonic()
+                        self._total += 1
+                        conn = None
+                        break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolExhausted(key, retry_after=max(1, round(self.acquire_timeout)))
+
+                self.waits += 1
+                self._cond.wait(remaining)
+                pool = self._pool(key, limits)
+
+        for victim in victims:
+            self._close_quietly(victim)
+
+        if conn is None:
+            try:
+                conn = connect()
+            except BaseException:
+                with self._cond:
+                    pool.in_use -= 1
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+            self.created += 1
+
+        with self._cond:
+            self._owners[id(conn)] = pool
+        return conn
+
+    def release(self, conn: Any) -> None:
+        """
+        Returns ``conn`` to its pool, or closes it if it is unusable or
+        its pool has been closed.
+
+        Time: O(1) amortised
+        Space: O(1)
+        """
+        reusable = self._reset(conn)
+
+        with self._cond:
+            pool = self._owners.pop(id(conn), None)
+            if pool is None:
+                # Not checked out from here (already released); just close it.
+                reusable = False
+            else:
+                pool.in_use -= 1
+                pool.last_used = time.monotonic()
+                if pool.closed:
+                    reusable = False
+                if reusable:
+                    pool.idle.append(conn)
+                else:
+                    self._total -= 1
+            self._cond.notify()
+
+        if not reusable:
+            self._close_quietly(conn)
+
+        if time.monotonic() - self._last_reap > min(self.idle_timeout, 60):
+            self.reap_idle()
+
+    def close_pool(self, key: str) -> None:
+        """
+        Closes idle connections for ``key``; checked-out ones are closed
+        when released (e.g. after the tenant's DB settings change).
+        """
+        with self._cond:
+            pool = self._pools.pop(key, None)
+            if pool is None:
+                return
+            pool.closed = True
+            idle, pool.idle = pool.idle, []
+            # Checked-out connections stay in the budget until released.
+            self._total -= len(idle)
+            self._cond.notify_all()
+
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def reap_idle(self) -> int:
+        """
+        Shrinks pools idle for ``idle_timeout`` to ``min_size`` and drops
+        those with nothing checked out. Returns connections closed.
+
+        Time: O(P)
+        Space: O(P)
+        """
+        now = time.monotonic()
+        to_close = []
+
+        with self._cond:
+            self._last_reap = now
+            for key, pool in list(self._pools.items()):
+                if now - pool.last_used < self.idle_timeout:
+                    continue
+
+                if pool.in_use == 0:
+                    to_close.extend(pool.idle)
+                    pool.idle = []
+                    pool.closed = True
+                    del self._pools[key]
+                elif len(pool.idle) > pool.min_size:
+                    excess = len(pool.idle) - pool.min_size
+                    to_close.extend(pool.idle[:excess])
+                    del pool.idle[:excess]
+
+            self._total -= len(to_close)
+            if to_close:
+                self._cond.notify_all()
+
+        for conn in to_close:
+            self._close_quietly(conn)
+        return len(to_close)
+
+    def close_all(self) -> None:
+        for key in list(self._pools):
+            self.close_pool(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "max_total": self.max_total,
+                "open": self._total,
+                "pools": len(self._pools),
+                "idle": sum(len(pool.idle) for pool in self._pools.values()),
+                "in_use": sum(pool.in_use for pool in self._pools.values()),
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+            }
+
+    def _pool(self, key: str, limits: Optional[Dict]) -> _TenantPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            limits = limits or {}
+            pool = _TenantPool(
+                min_size=int(limits.get("min_size", self.min_size)),
+                max_size=int(limits.get("max_size", self.max_size)),
+            )
+            self._pools[key] = pool
+        return pool
+
+    def _take_idle_victim(self, *, exclude: str) -> Optional[Any]:
+        """
+        Pops one idle connection from the least recently used pool,
+        preferring pools holding more than their ``min_size``.
+        """
+        candidates = [
+            pool for key, pool in self._pools.items()
+            if key != exclude and pool.idle
+        ]
+        if not candidates:
+            return None
+
+        above_min = [pool for pool in candidates if len(pool.idle) > pool.min_size]
+        pool = min(above_min or candidates, key=lambda p: p.last_used)
+        self.evicted += 1
+        # Oldest idle connection first; idle is used as a stack.
+        return pool.idle.pop(0)
+
+    @staticmethod
+    def _reset(conn: Any) -> bool:
+        """
+        Rolls back any open transaction; False if the connection is broken.
+        """
+        try:
+            if conn.closed:
+                return False
+            if conn.get_transaction_status() != 0:  # TRANSACTION_STATUS_IDLE
+                conn.rollback()
+            return conn.get_transaction_status() == 0
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            logger.debug("Error closing pooled connection", exc_info=True)
+
+
+tenant_pools = TenantPoolManager.from_settings()
@@ -1,31 +1,213 @@
+import copy
+from typing import Callable, Dict, Optional
+from uuid import UUID
+
 from django.conf import settings
+from django.core.exceptions import PermissionDenied
 from django.db import connections
+
+from system.db_pool import tenant_pools
+from system.lru_cache import LRUCache
 from system.models import TenantDatabase
+from system.tenant_context import get_current_tenant_db
+
+
+class TenantConnectionRegistry:
+    """
+    Bounded, per-process registry of tenant DB aliases.
+
+    Every alias lives in ``connections.databases`` only while it is in
+    the LRU. Aliases evicted for size or TTL have their connection
+    closed and their settings removed, so a worker's alias count and
+    open connections stay flat however many tenants it serves.
+    """
+
+    def __init__(self, *, max_aliases: int, ttl_seconds: Optional[float]):
+        self._aliases = LRUCache(
+            max_size=max_aliases,
+            ttl_seconds=ttl_seconds,
+            on_evict=self._release,
+        )
+
+    @classmethod
+    def from_settings(cls) -> "TenantConnectionRegistry":
+        cfg = getattr(
+            settings,
+            "TENANT_DB_REGISTRY",
+            {"max_aliases": 100, "ttl_seconds": 900},
+        )
+        ttl = cfg.get("ttl_seconds", 900)
+
+        return cls(
+            max_aliases=int(cfg.get("max_aliases", 100)),
+            ttl_seconds=float(ttl) if ttl else None,
+        )
+
+    def get_or_register(self, alias: str, loader: Callable[[], Dict]) -> str:
+        """
+        Returns ``alias``, registering it from ``loader()`` on a miss.
+
+        Time: O(1) on hit, one master-DB query on miss
+        Space: O(1)
+        """
+        if self._aliases.get(alias) is not None:
+            return alias
+
+        self.register(alias, loader())
+        return alias
+
+    def register_if_changed(self, alias: str, db_config: Dict) -> str:
+        """
+        Returns ``alias``, (re-)registering it unless it is already
+        registered with ``db_config``, so an alias never outlives a move
+        of the tenant's storage by more than the resolution it came from.
+
+        Time: O(K) where K = keys of db_config
+        Space: O(1)
+        """
+        registered = self._aliases.get(alias)
+        if registered is None or any(registered.get(key) != value for key, value in db_config.items()):
+            self.register(alias, db_config)
+        return alias
+
+    def register(self, alias: str, db_config: Dict) -> None:
+        """
+        Registers ``alias`` with ``db_config`` layered over the default DB.
+        """
+        config = copy.deepcopy(settings.DATABASES["default"])
+        config.update(db_config)
+
+        # The tenant backend also applies TENANT_SCHEMA, so it is used
+        # even when pooling is switched off.
+        pool_cfg = getattr(settings, "TENANT_DB_POOL", {})
+        config["ENGINE"] = pool_cfg.get("engine", "system.db_backends.postgresql_pool")
+        if not pool_cfg.get("enabled", True):
+            config["POOL"] = False
+        elif config.get("TENANT_SCHEMA"):
+            # Schema tenants share one pool per physical database.
+            config.setdefault(
+                "POOL_KEY",
+                "shared:{HOST}:{PORT}:{NAME}:{USER}".format(**config),
+            )
+            config.setdefault("POOL", {"max_size": int(pool_cfg.get("shared_max_size", 20))})
+
+        config.setdefault("ATOMIC_REQUESTS", False)
+        config.setdefault("AUTOCOMMIT", True)
+        config.setdefault("CONN_MAX_AGE", 0)
+        config.setdefault("CONN_HEALTH_CHECKS", False)
+        config.setdefault("OPTIONS", {})
+        config.setdefault("TIME_ZONE", "UTC")
+
+        self._aliases.set(alias, config)
+        connections.databases[alias] = config
+
+        # A wrapper built from an older config (e.g. evicted from another
+        # thread) would otherwise keep talking to the old server.
+        wrapper = connections[alias]
+        if wrapper.settings_dict is not config:
+            wrapper.close()
+            del connections[alias]
+
+    def evict(self, alias: str) -> None:
+        """
+        Drops ``alias`` and closes its connection (e.g. after a config change).
+        """
+        self._aliases.pop(alias)
+
+    def evict_tenant(self, alias: str) -> None:
+        """
+        Drops ``alias`` and the aliases derived from it (read replicas).
+
+        Time: O(A) where A = registered aliases
+        Space: O(A)
+        """
+        self.evict(alias)
+        for key in self._aliases.keys():
+            if key.startswith(f"{alias}_replica_"):
+                self.evict(key)
+
+    def clear(self) -> None:
+        self._aliases.clear()
+
+    def purge_expired(self) -> int:
+        return self._aliases.purge_expired()
+
+    def __contains__(self, alias: str) -> bool:
+        return alias in self._aliases
+
+    def stats(self) -> Dict[str, int]:
+        return self._aliases.stats()
+
+    @staticmethod
+    def _release(alias: str, config: Dict) -> None:
+        """
+        Closes the current thread's connection for ``alias``, drops its
+        pool and forgets it.
+        """
+        try:
+            connections[alias].close()
+        except Exception:
+            pass
+
+        if not config.get("POOL_KEY"):
+            tenant_pools.close_pool(alias)
+
+        try:
+            del connections[alias]
+        except AttributeError:
+            pass
+
+        # Only drop settings that still belong to the evicted entry; a
+        # re-registration may already have installed a newer config.
+        if connections.databases.get(alias) is config:
+            del connections.databases[alias]
+
+
+tenant_connections = TenantConnectionRegistry.from_settings()
+
+
+def tenant_db_alias(tenant_id) -> str:
+    return f"tenant_{tenant_id.hex}"
+
 
 def ensure_tenant_db_registered(tenant) -> str:
     """
     Ensures tenant DB alias exists in current execution context.
+    ``tenant`` is a Tenant or its id (UUID or string).
     """
-    alias = f"tenant_{tenant.id.hex}"
+    tenant_id = getattr(tenant, "id", tenant)
+    return _register_tenant_alias(tenant_id if isinstance(tenant_id, UUID) else UUID(str(tenant_id)))
 
-    if alias in connections.databases:
-        return alias
 
-    tenant_db = TenantDatabase.objects.get(tenant=tenant)
+def get_tenant_db(user) -> str:
+    """
+    Returns the tenant DB alias for ``user``.
+
+    Inside a request this is the alias TenantMiddleware bound for the
+    token's tenant; elsewhere (Celery, commands) the alias is registered
+    from ``user.tenant_id`` without loading the Tenant row.
+
+    Time: O(1)
+    Space: O(1)
+    """
+    if user.tenant_id is None:
+        raise PermissionDenied("User is not bound to a tenant")
+
+    alias = tenant_db_alias(user.tenant_id)
+    if get_current_tenant_db() == alias and alias in connections.databases:
+        return alias
 
-    # 🔑 Clone default DB settings (VERY IMPORTANT)
-    base_config = settings.DATABASES["default"].copy()
+    return _register_tenant_alias(user.tenant_id)
 
-    base_config.update(
-        {
-            "NAME": tenant_db.db_name,
-            "USER": tenant_db.db_user,
-            "PASSWORD": tenant_db.db_password,
-            "HOST": tenant_db.db_host,
-            "PORT": tenant_db.db_port,
-        }
-    )
 
-    connections.databases[alias] = base_config
+def _register_tenant_alias(tenant_id) -> str:
+    # Imported lazily: tenant_cache builds on this module.
+    from system.tenant_cache import tenant_resolver
 
-    return alias
+    # Resolved every time (an L1 hit): a worker that missed the
+    # invalidation of a storage move re-points its alias once its
+    # resolution expires instead of when the alias does.
+    resolved = tenant_resolver.resolve(tenant_id)
+    if resolved is None:
+        raise TenantDatabase.DoesNotExist(f"No database for tenant {tenant_id}")
+    return tenant_connections.register_if_changed(tenant_db_alias(tenant_id), resolved.db_config)
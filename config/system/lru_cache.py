@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded in-process cache with an optional TTL.
+
+    Entries evicted for size or age are passed to ``on_evict`` (outside
+    the lock) so owners can release resources tied to them.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl_seconds: Optional[float] = None,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._entries)
+
+    def _is_expired(self, entry: Tuple[Any, float]) -> bool:
+        if self.ttl_seconds is None:
+            return False
+        return time.monotonic() - entry[1] >= self.ttl_seconds
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Time: O(1)
+        Space: O(1)
+        """
+        expired = None
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and self._is_expired(entry):
+                expired = self._entries.pop(key)[0]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if expired is not None:
+            self._evicted([(key, expired)])
+
+        return default if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Time: O(1) amortised
+        Space: O(1)
+        """
+        evicted: List[Tuple[Hashable, Any]] = []
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            self._entries[key] = (value, time.monotonic())
+
+            while len(self._entries) > self.max_size:
+                old_key, (old_value, _) = self._entries.popitem(last=False)
+                evicted.append((old_key, old_value))
+                self.evictions += 1
+
+        if previous is not None and previous[0] is not value:
+            evicted.append((key, previous[0]))
+
+        self._evicted(evicted)
+
+    def pop(self, key: Hashable) -> Any:
+        """
+        Removes ``key`` and releases it through ``on_evict``.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return None
+
+        self._evicted([(key, entry[0])])
+        return entry[0]
+
+    def purge_expired(self) -> int:
+        """
+        Drops every expired entry.
+
+        Time: O(N)
+        Space: O(N)
+        """
+        if self.ttl_seconds is None:
+            return 0
+
+        with self._lock:
+            expired = [
+                (key, entry[0])
+                for key, entry in self._entries.items()
+                if self._is_expired(entry)
+            ]
+            for key, _ in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+
+        self._evicted(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            entries = [(key, entry[0]) for key, entry in self._entries.items()]
+            self._entries.clear()
+
+        self._evicted(entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _evicted(self, entries: List[Tuple[Hashable, Any]]) -> None:
+        if not self._on_evict:
+            return
+        for key, value in entries:
+            self._on_evict(key, value)
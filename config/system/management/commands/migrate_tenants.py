@@ -0,0 +1,79 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from system.services.tenant_migrations import TenantMigrationService
+
+
+class Command(BaseCommand):
+    help = 'Apply tenant migrations to every tenant database in parallel, canaries first'
+
+    def add_arguments(self, parser):
+        defaults = getattr(settings, 'TENANT_MIGRATIONS', {})
+        parser.add_argument(
+            '--concurrency', type=int, default=defaults.get('concurrency', 8),
+            help='Tenant databases migrated at the same time (worker processes)',
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=defaults.get('timeout_seconds', 300),
+            help='Seconds one tenant may take before it is given up on',
+        )
+        parser.add_argument(
+            '--canary', type=int, default=defaults.get('canary', 1),
+            help='Migrate this many tenants first and stop if any of them fails',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='JSON-lines file recording finished tenants; a rerun skips those that succeeded',
+        )
+        parser.add_argument('--tenant', action='append', dest='tenants', help='Only this tenant UUID (repeatable)')
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint']
+        done = TenantMigrationService.read_checkpoint(checkpoint)
+        plan = TenantMigrationService.plan(tenant_ids=options['tenants'], canary=options['canary'], done=done)
+        total = len(plan['canary']) + len(plan['rest'])
+        if done:
+            self.stdout.write(f'Skipping {len(done)} tenants already migrated per {checkpoint}')
+
+        started = time.monotonic()
+        results = []
+
+        def report(result):
+            results.append(result)
+            TenantMigrationService.write_checkpoint(checkpoint, result)
+            line = f'[{len(results)}/{total}] {result.tenant_id} {result.status} {result.seconds:.1f}s'
+            if result.status in ('ok', 'current'):
+                self.stdout.write(line)
+            else:
+                self.stderr.write(self.style.ERROR(f'{line} {result.error}'))
+
+        for stage in ('canary', 'rest'):
+            TenantMigrationService.migrate_all(
+                plan[stage],
+                concurrency=options['concurrency'],
+                timeout=options['timeout'],
+                on_result=report,
+            )
+            if stage == 'canary' and any(result.status not in ('ok', 'current') for result in results):
+                self._summary(results, started, total)
+                raise CommandError('Canary migration failed; remaining tenants were not touched')
+
+        self._summary(results, started, total)
+        if any(result.status not in ('ok', 'current') for result in results):
+            raise CommandError('Some tenants failed to migrate; rerun with the same --checkpoint to retry them')
+
+    def _summary(self, results, started, total):
+        counts = {
+            status: sum(result.status == status for result in results)
+            for status in ('ok', 'current', 'failed', 'timeout')
+        }
+        self.stdout.write(
+            f"Migrated {counts['ok']}/{total} tenants in {time.monotonic() - started:.1f}s "
+            f"(already current {counts['current']}, failed {counts['failed']}, "
+            f"timed out {counts['timeout']}, not run {total - len(results)})"
+        )
+        slowest = sorted(results, key=lambda result: result.seconds, reverse=True)[:5]
+        for result in slowest:
+            self.stdout.write(f'  slowest: {result.tenant_id} {result.seconds:.1f}s')
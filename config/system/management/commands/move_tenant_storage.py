@@ -0,0 +1,48 @@
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from system.models import TenantDatabase
+from system.services.tenant_storage import TenantStorageService
+
+
+class Command(BaseCommand):
+    help = 'Move a tenant between database-per-tenant and schema-per-tenant storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tenant_id', help='Tenant UUID')
+        parser.add_argument(
+            '--to',
+            required=True,
+            choices=TenantDatabase.IsolationMode.values,
+            help='Target isolation mode',
+        )
+        parser.add_argument(
+            '--drop-source',
+            action='store_true',
+            help='Drop the old database/schema after the switch',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            tenant_db = TenantDatabase.objects.select_related('tenant').get(
+                tenant_id=UUID(options['tenant_id']),
+            )
+        except (TenantDatabase.DoesNotExist, ValueError):
+            raise CommandError(f"No database for tenant {options['tenant_id']}")
+
+        try:
+            result = TenantStorageService.move_tenant(
+                tenant_db,
+                options['to'],
+                drop_source=options['drop_source'],
+            )
+        except ValidationError as exc:
+            raise CommandError(exc.detail)
+
+        for label, copied in result['copied'].items():
+            self.stdout.write(f"{label}: {copied} rows copied, {result['caught_up'][label]} caught up")
+        self.stdout.write(
+            self.style.SUCCESS(f'Tenant {tenant_db.tenant_id} now uses {options["to"]} isolation')
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from system.services.migration_utils import tenant_migration_fingerprint
+from system.services.placement import PlacementService
+from system.services.tenant_template import TenantTemplateService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the migrated tenant template database on every host whose template is stale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only report which templates are stale')
+        parser.add_argument('--force', action='store_true', help='Rebuild even if the template is current')
+
+    def handle(self, *args, **options):
+        expected = tenant_migration_fingerprint()
+        for host, port in PlacementService.servers():
+            current = TenantTemplateService.template_fingerprint(host, port) == expected
+            state = 'current' if current else 'stale'
+            self.stdout.write(f'{host}:{port}\t{state}')
+
+            if options['check'] or (current and not options['force']):
+                continue
+
+            TenantTemplateService.rebuild(host, port)
+            self.stdout.write(self.style.SUCCESS(f'{host}:{port}\trebuilt ({expected[:12]})'))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import Project
+from system.db_registry import ensure_tenant_db_registered
+from system.models import TenantDatabase
+from tasks.services.task_counter_service import TaskCounterService
+
+
+class Command(BaseCommand):
+    help = 'Recount the per-project task counters from the tasks and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', action='append', dest='tenants', help='Only this tenant UUID (repeatable)')
+
+    def handle(self, *args, **options):
+        databases = TenantDatabase.objects.order_by('tenant_id')
+        if options['tenants']:
+            databases = databases.filter(tenant_id__in=options['tenants'])
+
+        projects = drifted = failed = 0
+        for tenant_id in databases.values_list('tenant_id', flat=True):
+            try:
+                db = ensure_tenant_db_registered(tenant_id)
+                for project_id in Project.objects.using(db).order_by('id').values_list('id', flat=True):
+                    projects += 1
+                    drift = TaskCounterService.recount(db=db, project_id=project_id)
+                    if drift:
+                        drifted += 1
+                        fields = ', '.join(f'{field} {stored}->{actual}' for field, (stored, actual) in drift.items())
+                        self.stdout.write(f'{tenant_id}\tproject {project_id}\t{fields}')
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f'{tenant_id}\terror\t{exc}'))
+
+        self.stdout.write(f'{projects} projects: {drifted} repaired, {failed} tenants unreachable')
+        if failed:
+            raise CommandError('Some tenants could not be reconciled')
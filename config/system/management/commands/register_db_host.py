@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from system.models import DatabaseHost
+from system.services.placement import tenant_counts_by_host
+
+
+class Command(BaseCommand):
+    help = 'Register (or update) a Postgres host that tenant databases can be placed on'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help='Unique host name, e.g. shard-2')
+        parser.add_argument('--host', help='Hostname or IP')
+        parser.add_argument('--port', default='5432')
+        parser.add_argument('--weight', type=int, default=100, help='Relative capacity')
+        parser.add_argument('--deactivate', action='store_true', help='Stop placing new tenants here')
+        parser.add_argument('--list', action='store_true', help='List hosts with tenant counts')
+
+    def handle(self, *args, **options):
+        if options['name']:
+            if not options['host'] and not DatabaseHost.objects.filter(name=options['name']).exists():
+                raise CommandError('--host is required when registering a new host')
+
+            defaults = {
+                'port': options['port'],
+                'weight': options['weight'],
+                'is_active': not options['deactivate'],
+            }
+            if options['host']:
+                defaults['host'] = options['host']
+
+            host, created = DatabaseHost.objects.update_or_create(
+                name=options['name'],
+                defaults=defaults,
+            )
+            self.stdout.write(f"{'Registered' if created else 'Updated'} {host}")
+
+        if options['list'] or not options['name']:
+            counts = tenant_counts_by_host()
+            for host in DatabaseHost.objects.order_by('name'):
+                state = 'active' if host.is_active else 'inactive'
+                tenants = counts.get((host.host, host.port), 0)
+                self.stdout.write(
+                    f'{host.name}\t{host.host}:{host.port}\tweight={host.weight}\ttenants={tenants}\t{state}'
+                )
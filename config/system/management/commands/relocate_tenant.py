@@ -0,0 +1,47 @@
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from system.models import DatabaseHost, TenantDatabase
+from system.services.placement import Placement
+from system.services.tenant_storage import TenantStorageService
+
+
+class Command(BaseCommand):
+    help = 'Move a tenant database to another registered host with a short read-only window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tenant_id', help='Tenant UUID')
+        parser.add_argument('--to-host', required=True, help='Name of an active DatabaseHost')
+        parser.add_argument(
+            '--drop-source',
+            action='store_true',
+            help='Drop the old database/schema after the switch',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            tenant_db = TenantDatabase.objects.select_related('tenant').get(
+                tenant_id=UUID(options['tenant_id']),
+            )
+        except (TenantDatabase.DoesNotExist, ValueError):
+            raise CommandError(f"No database for tenant {options['tenant_id']}")
+
+        try:
+            host = DatabaseHost.objects.get(name=options['to_host'], is_active=True)
+        except DatabaseHost.DoesNotExist:
+            raise CommandError(f"No active database host {options['to_host']!r}")
+
+        try:
+            result = TenantStorageService.relocate_tenant(
+                tenant_db,
+                Placement(name=host.name, host=host.host, port=host.port),
+                drop_source=options['drop_source'],
+            )
+        except ValidationError as exc:
+            raise CommandError(exc.detail)
+
+        for label, copied in result['copied'].items():
+            self.stdout.write(f"{label}: {copied} rows copied, {result['caught_up'][label]} caught up")
+        self.stdout.write(self.style.SUCCESS(f'Tenant {tenant_db.tenant_id} now on {host}'))
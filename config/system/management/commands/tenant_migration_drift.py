@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from system.services.tenant_migrations import TenantMigrationService
+
+
+class Command(BaseCommand):
+    help = 'List tenant databases whose applied migrations differ from the code (behind or ahead)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            default=getattr(settings, 'TENANT_MIGRATIONS', {}).get('concurrency', 8),
+            help='Tenant databases checked at the same time',
+        )
+        parser.add_argument('--tenant', action='append', dest='tenants', help='Only this tenant UUID (repeatable)')
+        parser.add_argument('--list', action='store_true', help='List the missing/unknown migrations')
+
+    def handle(self, *args, **options):
+        plan = TenantMigrationService.plan(tenant_ids=options['tenants'])
+        states = TenantMigrationService.drift(plan['rest'], concurrency=options['concurrency'])
+
+        counts = {'current': 0, 'behind': 0, 'ahead': 0, 'error': 0}
+        for state in states:
+            if state['error']:
+                counts['error'] += 1
+                self.stderr.write(self.style.ERROR(f"{state['tenant_id']}\terror\t{state['error']}"))
+                continue
+            if not state['behind'] and not state['ahead']:
+                counts['current'] += 1
+                continue
+
+            for direction in ('behind', 'ahead'):
+                if state[direction]:
+                    counts[direction] += 1
+                    self.stdout.write(f"{state['tenant_id']}\t{direction}\t{len(state[direction])}")
+                    if options['list']:
+                        for name in state[direction]:
+                            self.stdout.write(f'\t{name}')
+
+        self.stdout.write(
+            f"{len(states)} tenants: {counts['current']} current, {counts['behind']} behind, "
+            f"{counts['ahead']} ahead, {counts['error']} unreachable"
+        )
+        if counts['behind'] or counts['ahead'] or counts['error']:
+            raise CommandError('Tenant migrations have drifted')
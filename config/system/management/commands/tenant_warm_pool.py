@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from system.services.warm_pool import WarmPoolService
+
+
+class Command(BaseCommand):
+    help = 'Report (or top up) the pool of pre-provisioned tenant databases per host'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fill', action='store_true', help='Replenish the pool now instead of waiting for beat')
+
+    def handle(self, *args, **options):
+        if options['fill']:
+            for server, created in WarmPoolService.replenish().items():
+                self.stdout.write(self.style.SUCCESS(f'{server}\tcreated {created}'))
+
+        for (host, port), counts in sorted(WarmPoolService.depth().items()):
+            self.stdout.write(f'{host}:{port}\tready={counts["ready"]}\tstale={counts["stale"]}')
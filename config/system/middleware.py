@@ -45,48 +45,101 @@ from django.contrib.auth.models import AnonymousUser
 #         if request.user.is_authenticated:
 #             # user DB already tenant-bound
 #             pass
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from system.models import TenantDatabase
-from system.tenant_context import set_current_tenant_db
-from django.http import HttpResponseForbidden
-from rest_framework_simplejwt.exceptions import InvalidToken
-from rest_framework.response import Response
-from rest_framework import status
 from django.http import JsonResponse
 from uuid import UUID
 
+from system.db_pool import PoolExhausted
+from system.db_registry import tenant_connections
+from system.read_replicas import mark_write
+from system.tenant_cache import tenant_resolver
+from system.tenant_context import set_current_tenant_db, reset_current_tenant_db
+from system.tenant_token import tenant_id_from_token
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+READ_ONLY_RETRY_AFTER = 5
+
 
 class TenantMiddleware:
+    """
+    Single tenant-resolution stage for every request.
+
+    The tenant is taken from the signed ``tenant_id`` claim of the
+    bearer token (falling back to ``X-Tenant-ID`` for token-less
+    requests), resolved through the tenant cache, and its DB alias is
+    bound in ``tenant_context`` for the rest of the request. Services
+    read that binding via ``get_tenant_db`` instead of resolving again.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
-        self.jwt_auth = JWTAuthentication()
 
     def __call__(self, request):
-        tenant_id = request.headers.get("X-Tenant-ID")
+        token_tenant = tenant_id_from_token(request)
+        header_tenant = request.headers.get("X-Tenant-ID")
+
+        tenant_uuid = token_tenant
+        if header_tenant:
+            try:
+                header_uuid = UUID(header_tenant)
+            except ValueError:
+                return JsonResponse(
+                    {"detail": "Invalid tenant id"},
+                    status=403,
+                )
+
+            if token_tenant and header_uuid != token_tenant:
+                return JsonResponse(
+                    {"detail": "Tenant does not match token"},
+                    status=403,
+                )
+            tenant_uuid = header_uuid
 
-        if not tenant_id:
+        if not tenant_uuid:
             return self.get_response(request)
 
-        try:
-            tenant_uuid = UUID(tenant_id)
-        except ValueError:
-            return JsonResponse(
-                {"detail": "Invalid tenant id"},
-                status=403,
-            )
+        resolved = tenant_resolver.resolve(tenant_uuid)
 
-        try:
-            tenant_db = TenantDatabase.objects.select_related("tenant").get(
-                tenant_id=tenant_uuid,
-                tenant__is_active=True,
-            )
-        except TenantDatabase.DoesNotExist:
+        if resolved is None or not resolved.is_active:
             return JsonResponse(
                 {"detail": "Invalid or inactive tenant"},
                 status=403,
             )
 
-        # set_current_tenant_id(tenant_uuid)
-        # set_current_tenant_db(tenant_db.db_name)
+        if resolved.is_read_only and request.method not in SAFE_METHODS:
+            response = JsonResponse(
+                {"detail": "Tenant is read-only during maintenance, retry later"},
+                status=503,
+            )
+            response["Retry-After"] = READ_ONLY_RETRY_AFTER
+            return response
+
+        # Later layers reuse this instead of querying the master DB again
+        request.tenant = resolved
 
-        return self.get_response(request)
+        alias = tenant_connections.register_if_changed(resolved.db_alias, resolved.db_config)
+        token = set_current_tenant_db(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_current_tenant_db(token)
+
+        if request.method not in SAFE_METHODS:
+            # DRF sets the authenticated user on the underlying request.
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                mark_write(user)
+
+        return response
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, PoolExhausted):
+            response = JsonResponse(
+                {
+                    "detail": "Tenant database is busy, retry later",
+                    "retry_after": exception.retry_after,
+                },
+                status=503,
+            )
+            response["Retry-After"] = exception.retry_after
+            return response
+        return None
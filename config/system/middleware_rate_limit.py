@@ -54,13 +54,35 @@
 #
 #         return None
 import time
+
 import redis
 from django.conf import settings
 from django.http import JsonResponse
+from django.urls import Resolver404, resolve
 from django.utils.deprecation import MiddlewareMixin
 
+from system.circuit_breaker import CircuitBreaker
+from system.concurrency_limit import ConcurrencyLimiter
+from system.rate_limit import HybridRateLimiter, get_limiter, rate_limit_headers, retry_after_header
+from system.tenant_cache import tenant_resolver
+from system.tenant_token import tenant_id_from_token
+
 
 class TenantRateLimitMiddleware(MiddlewareMixin):
+    """
+    Per-tenant API rate limit; one Redis round trip per request (see
+    ``system.rate_limit``), or none with ``RATE_LIMIT["mode"] = "hybrid"``
+    (local buckets reconciled in the background). Fails open when Redis
+    is unavailable, and stops calling it once the circuit breaker opens.
+
+    Limits come from the tenant's Plan (carried in the cached tenant
+    resolution, so no query on a cache hit) and each request costs the
+    units configured for its URL name or view in ``RATE_LIMIT["costs"]``.
+    Responses carry ``X-RateLimit-Limit/Remaining/Reset``.
+
+    Placed first in MIDDLEWARE so over-limit tenants are rejected
+    before any session, auth or tenant DB work.
+    """
 
     def __init__(self, get_response=None):
         super().__init__(get_response)
@@ -86,40 +108,60 @@ class TenantRateLimitMiddleware(MiddlewareMixin):
 
         self.max_requests = int(cfg.get("requests", 100))
         self.window = int(cfg.get("window_seconds", 60))
+        self.costs = dict(cfg.get("costs", {}))
+        self.default_cost = int(cfg.get("default_cost", 1))
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(cfg.get("breaker_failures", 5)),
+            reset_timeout=float(cfg.get("breaker_reset_seconds", 5)),
+            probe=self.redis.ping if self.redis else None,
+        )
+        self.limiter = None
+        if self.redis and cfg.get("mode") == "hybrid":
+            self.limiter = HybridRateLimiter(
+                self.redis,
+                sync_interval=int(cfg.get("sync_interval_ms", 200)) / 1000,
+                error_budget=float(cfg.get("error_budget", 0.1)),
+                breaker=self.breaker,
+            )
+        elif self.redis:
+            self.limiter = get_limiter(self.redis, cfg.get("algorithm"))
 
     def process_request(self, request):
         if not request.path.startswith("/api/"):
             return None
 
-        user = getattr(request, "user", None)
-        if not user or not user.is_authenticated:
+        # Runs before authentication: the tenant comes from the verified
+        # token claim; requests without a valid token are left to auth.
+        tenant_id = tenant_id_from_token(request)
+        if not tenant_id:
             return None
 
-        tenant = getattr(user, "tenant", None)
-        if not tenant:
+        if not self.limiter:
             return None
 
-        if not self.redis:
+        # The hybrid limiter answers locally and owns its Redis calls.
+        direct = not isinstance(self.limiter, HybridRateLimiter)
+        if direct and not self.breaker.allow():
             return None
 
-        now = int(time.time())
-        window_start = now - (now % self.window)
-
-        redis_key = f"rl:tenant:{tenant.id}:{window_start}"
-
+        limit, window = self._plan_limit(tenant_id)
         try:
-            count = self.redis.incr(redis_key)
-            if count == 1:
-                self.redis.expire(redis_key, self.window + 5)
+            result = self.limiter.check(
+                f"rl:tenant:{tenant_id}",
+                limit=limit,
+                window=window,
+                cost=min(self._cost(request), limit),
+            )
         except Exception:
-            return None 
+            self.breaker.record_failure()
+            return None
 
-        if count > self.max_requests:
-            try:
-                retry_after = self.redis.ttl(redis_key)
-            except Exception:
-                retry_after = self.window
+        if direct:
+            self.breaker.record_success()
 
+        request.rate_limit = result
+        if not result.allowed:
+            retry_after = retry_after_header(result)
             response = JsonResponse(
                 {
                     "detail": "Rate limit exceeded",
@@ -128,6 +170,127 @@ class TenantRateLimitMiddleware(MiddlewareMixin):
                 status=429,
             )
             response["Retry-After"] = retry_after
+            # MiddlewareMixin runs process_response on it, which adds the
+            # X-RateLimit headers.
             return response
 
         return None
+
+    def process_response(self, request, response):
+        result = getattr(request, "rate_limit", None)
+        if result is not None:
+            for header, value in rate_limit_headers(result).items():
+                response[header] = value
+        return response
+
+    def _plan_limit(self, tenant_id):
+        """
+        (requests, window_seconds) for the tenant's plan.
+
+        Time: O(1) on a tenant cache hit
+        Space: O(1)
+        """
+        try:
+            resolved = tenant_resolver.resolve(tenant_id)
+        except Exception:
+            resolved = None
+        if resolved is not None and resolved.rate_limit:
+            return resolved.rate_limit
+        # Unknown tenants are rejected by TenantMiddleware right after.
+        return self.max_requests, self.window
+
+    def _cost(self, request) -> int:
+        if not self.costs:
+            return self.default_cost
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return self.default_cost
+
+        view = match.func
+        view_class = getattr(view, "view_class", None) or getattr(view, "cls", None) or view
+        for name in (match.url_name, view_class.__name__):
+            if name in self.costs:
+                return int(self.costs[name])
+        return self.default_cost
+
+
+class TenantConcurrencyLimitMiddleware:
+    """
+    Caps each tenant's in-flight API requests across the fleet (see
+    ``system.concurrency_limit``), so one tenant's slow analytics or
+    large lists cannot take every worker. Over the cap the request gets
+    a 503 with ``Retry-After``. Costs two Redis round trips per request
+    (acquire, release); fails open like TenantRateLimitMiddleware, with
+    its own circuit breaker (``CONCURRENCY_LIMIT["breaker_failures"]``
+    and ``["breaker_reset_seconds"]``).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        cfg = getattr(settings, "CONCURRENCY_LIMIT", {})
+        self.retry_after = int(cfg.get("retry_after_seconds", 1))
+        self.redis = None
+        self.limiter = None
+
+        if cfg.get("enabled", True):
+            try:
+                self.redis = redis.from_url(
+                    getattr(settings, "REDIS_URL", "redis://localhost:6379/1"),
+                    socket_connect_timeout=1,
+                    socket_timeout=1,
+                )
+                self.limiter = ConcurrencyLimiter(
+                    self.redis,
+                    initial=int(cfg.get("initial", 4)),
+                    minimum=int(cfg.get("minimum", 1)),
+                    maximum=int(cfg.get("maximum", 16)),
+                    target_latency=int(cfg.get("target_latency_ms", 1000)) / 1000,
+                    backoff=float(cfg.get("backoff", 0.9)),
+                    lease_seconds=float(cfg.get("lease_seconds", 60)),
+                )
+            except Exception:
+                self.redis = self.limiter = None
+
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(cfg.get("breaker_failures", 5)),
+            reset_timeout=float(cfg.get("breaker_reset_seconds", 5)),
+            probe=self.redis.ping if self.redis else None,
+        )
+
+    def __call__(self, request):
+        if not self.limiter or not request.path.startswith("/api/"):
+            return self.get_response(request)
+
+        tenant_id = tenant_id_from_token(request)
+        if not tenant_id or not self.breaker.allow():
+            return self.get_response(request)
+
+        try:
+            lease = self.limiter.acquire(f"tenant:{tenant_id}")
+        except Exception:
+            self.breaker.record_failure()
+            return self.get_response(request)
+        self.breaker.record_success()
+
+        if not lease.acquired:
+            response = JsonResponse(
+                {
+                    "detail": "Too many concurrent requests for this tenant",
+                    "retry_after": self.retry_after,
+                },
+                status=503,
+            )
+            response["Retry-After"] = self.retry_after
+            return response
+
+        started = time.monotonic()
+        try:
+            return self.get_response(request)
+        finally:
+            try:
+                self.limiter.release(lease, time.monotonic() - started)
+            except Exception:
+                # The lease expires on its own.
+                self.breaker.record_failure()
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenantdatabase',
+            name='isolation_mode',
+            field=models.CharField(choices=[('DATABASE', 'Database'), ('SCHEMA', 'Schema')], default='DATABASE', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='tenantdatabase',
+            name='schema_name',
+            field=models.CharField(blank=True, default='', max_length=63),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0002_tenantdatabase_isolation_mode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatabaseHost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('host', models.CharField(max_length=255)),
+                ('port', models.CharField(default='5432', max_length=10)),
+                ('weight', models.PositiveIntegerField(default=100)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('host', 'port')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0003_databasehost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='is_read_only',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0004_tenant_is_read_only'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenantdatabase',
+            name='replicas',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
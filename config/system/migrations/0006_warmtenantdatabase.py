@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0005_tenantdatabase_replicas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WarmTenantDatabase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('db_name', models.CharField(max_length=255, unique=True)),
+                ('db_host', models.CharField(max_length=255)),
+                ('db_port', models.CharField(default='5432', max_length=10)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['db_host', 'db_port', 'fingerprint'], name='system_warm_db_host_50bac4_idx')],
+            },
+        ),
+    ]
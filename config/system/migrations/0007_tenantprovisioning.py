@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:14
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0006_warmtenantdatabase'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantProvisioning',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('tenant_name', models.CharField(max_length=255)),
+                ('state', models.CharField(choices=[('PENDING', 'Pending'), ('DATABASE_CREATED', 'Database Created'), ('MIGRATED', 'Migrated'), ('ADMIN_SEEDED', 'Admin Seeded'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('isolation_mode', models.CharField(max_length=10)),
+                ('db_host_name', models.CharField(blank=True, default='', max_length=100)),
+                ('db_host', models.CharField(blank=True, default='', max_length=255)),
+                ('db_port', models.CharField(blank=True, default='', max_length=10)),
+                ('admin_username', models.CharField(max_length=150)),
+                ('admin_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('admin_password', models.CharField(max_length=128)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tenant', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='provisioning', to='system.tenant')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('system', '0008_plan'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['tenant', '-date_joined', '-id'], name='user_tenant_joined_idx'),
+        ),
+    ]
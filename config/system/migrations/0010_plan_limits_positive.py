@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-18 13:09
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def raise_zero_limits(apps, schema_editor):
+    # A zero made the limiter fail open, i.e. unlimited; the closest
+    # valid limit is one request per window.
+    Plan = apps.get_model('system', 'Plan')
+    Plan.objects.filter(requests=0).update(requests=1)
+    Plan.objects.filter(window_seconds=0).update(window_seconds=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system', '0009_user_user_tenant_joined_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='plan',
+            name='requests',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AlterField(
+            model_name='plan',
+            name='window_seconds',
+            field=models.PositiveIntegerField(default=60, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.RunPython(raise_zero_limits, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='plan',
+            constraint=models.CheckConstraint(condition=models.Q(('requests__gte', 1)), name='plan_requests_positive'),
+        ),
+        migrations.AddConstraint(
+            model_name='plan',
+            constraint=models.CheckConstraint(condition=models.Q(('window_seconds__gte', 1)), name='plan_window_positive'),
+        ),
+    ]
@@ -1,9 +1,34 @@
+from django.core.validators import MinValueValidator
 from django.db import models
 import uuid
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 
 
+class Plan(models.Model):
+    """
+    Subscription tier; sets the tenant's API rate limit.
+    Lives in MASTER DB.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    # Request units per window; expensive endpoints cost several units
+    # (RATE_LIMIT["costs"]).
+    requests = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    window_seconds = models.PositiveIntegerField(default=60, validators=[MinValueValidator(1)])
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # The limiter scripts divide by both; a zero would make them fail
+        # and the limiter fail open.
+        constraints = [
+            models.CheckConstraint(condition=models.Q(requests__gte=1), name="plan_requests_positive"),
+            models.CheckConstraint(condition=models.Q(window_seconds__gte=1), name="plan_window_positive"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
 class Tenant(models.Model):
     """
     Represents an organization.
@@ -12,19 +37,138 @@ class Tenant(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4)
     name = models.CharField(max_length=255, unique=True)
     is_active = models.BooleanField(default=True)
+    # None: the RATE_LIMIT defaults apply.
+    plan = models.ForeignKey(Plan, null=True, blank=True, on_delete=models.SET_NULL, related_name="tenants")
+    # Set while the tenant's data is being moved; writes get a 503.
+    is_read_only = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
 
+class DatabaseHost(models.Model):
+    """
+    Postgres server that tenant databases can be placed on.
+    Lives in MASTER DB.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    host = models.CharField(max_length=255)
+    port = models.CharField(max_length=10, default="5432")
+    # Relative capacity: a host with weight 200 takes twice the tenants
+    # of one with weight 100.
+    weight = models.PositiveIntegerField(default=100)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [("host", "port")]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.host}:{self.port})"
+
+
 class TenantDatabase(models.Model):
     """
     DB connection details per tenant.
+
+    DATABASE tenants own ``db_name``; SCHEMA tenants live in
+    ``schema_name`` inside the shared database ``db_name``.
     """
+
+    class IsolationMode(models.TextChoices):
+        DATABASE = "DATABASE"
+        SCHEMA = "SCHEMA"
+
     tenant = models.OneToOneField(Tenant, on_delete=models.CASCADE)
+    isolation_mode = models.CharField(
+        max_length=10,
+        choices=IsolationMode.choices,
+        default=IsolationMode.DATABASE,
+    )
     db_name = models.CharField(max_length=255)
+    schema_name = models.CharField(max_length=63, blank=True, default="")
     db_user = models.CharField(max_length=255)
     db_password = models.CharField(max_length=255)
     db_host = models.CharField(max_length=255, default="localhost")
     db_port = models.CharField(max_length=10, default="5432")
+    # Optional read replicas: [{"HOST": ..., "PORT": ...}, ...]; any other
+    # keys ("NAME", "USER", "PASSWORD") override the primary's settings.
+    replicas = models.JSONField(default=list, blank=True)
+
+    def connection_config(self) -> dict:
+        """
+        Settings layered over the default DB for this tenant's alias.
+        """
+        config = {
+            "NAME": self.db_name,
+            "USER": self.db_user,
+            "PASSWORD": self.db_password,
+            "HOST": self.db_host,
+            "PORT": self.db_port,
+        }
+        if self.isolation_mode == self.IsolationMode.SCHEMA:
+            config["TENANT_SCHEMA"] = self.schema_name
+        return config
+
+class WarmTenantDatabase(models.Model):
+    """
+    Migrated, unassigned tenant database waiting to be claimed by a
+    signup (see WarmPoolService).
+    Lives in MASTER DB.
+    """
+    db_name = models.CharField(max_length=255, unique=True)
+    db_host = models.CharField(max_length=255)
+    db_port = models.CharField(max_length=10, default="5432")
+    # tenant_migration_fingerprint() the database was migrated to
+    fingerprint = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["db_host", "db_port", "fingerprint"])]
+
+    def __str__(self) -> str:
+        return f"{self.db_name} ({self.db_host}:{self.db_port})"
+
+class TenantProvisioning(models.Model):
+    """
+    Progress of an asynchronous tenant signup (see
+    TenantProvisioningService). Survives the tenant being removed by
+    compensation so the signup can still be polled.
+    Lives in MASTER DB.
+    """
+
+    class State(models.TextChoices):
+        PENDING = "PENDING"
+        DATABASE_CREATED = "DATABASE_CREATED"
+        MIGRATED = "MIGRATED"
+        ADMIN_SEEDED = "ADMIN_SEEDED"
+        READY = "READY"
+        FAILED = "FAILED"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    tenant = models.OneToOneField(
+        Tenant,
+        on_delete=models.SET_NULL,
+        related_name="provisioning",
+        null=True,
+        blank=True,
+    )
+    tenant_name = models.CharField(max_length=255)
+    state = models.CharField(max_length=20, choices=State.choices, default=State.PENDING)
+    isolation_mode = models.CharField(max_length=10)
+    # Requested DatabaseHost name (optional) and the host actually chosen,
+    # recorded before any storage is created so retries reuse it.
+    db_host_name = models.CharField(max_length=100, blank=True, default="")
+    db_host = models.CharField(max_length=255, blank=True, default="")
+    db_port = models.CharField(max_length=10, blank=True, default="")
+    admin_username = models.CharField(max_length=150)
+    admin_email = models.EmailField(blank=True, default="")
+    # Already hashed (make_password); the plain password is never stored.
+    admin_password = models.CharField(max_length=128)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.tenant_name} ({self.state})"
 
 # class UserManager(BaseUserManager):
 #     def create_user(self, username, password=None):
@@ -71,6 +215,9 @@ class User(AbstractUser):
 
     class Meta:
         db_table = "system_user"
+        indexes = [
+            models.Index(fields=["tenant", "-date_joined", "-id"], name="user_tenant_joined_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.username} ({self.role})"
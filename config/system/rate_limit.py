@@ -0,0 +1,444 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Type
+
+from django.utils.module_loading import import_string
+
+from system.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+# Every script does the whole check-and-consume on the Redis server in
+# one EVALSHA, reading the clock with TIME so that app servers with
+# skewed clocks agree. ARGV: limit, window (ms), cost.
+# Returns {allowed (0/1), remaining, retry_after_ms, reset_after_ms}.
+
+SLIDING_WINDOW_LOG = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local used = redis.call('ZCARD', key)
+
+if used + cost > limit then
+    local retry = window
+    if cost <= limit then
+        -- wait until enough of the oldest entries have left the window
+        local entry = redis.call('ZRANGE', key, used + cost - limit - 1, used + cost - limit - 1, 'WITHSCORES')
+        if entry[2] then
+            retry = tonumber(entry[2]) + window - now
+        end
+    end
+    return {0, limit - used, retry, window}
+end
+
+for i = 1, cost do
+    redis.call('ZADD', key, now, now .. ':' .. (used + i))
+end
+redis.call('PEXPIRE', key, window)
+return {1, limit - used - cost, 0, window}
+"""
+
+SLIDING_WINDOW_COUNTER = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+local current = math.floor(now / window)
+local elapsed = now - current * window
+local count = tonumber(redis.call('HGET', key, current) or '0')
+local previous = tonumber(redis.call('HGET', key, current - 1) or '0')
+-- the previous window counts in proportion to how much of it still
+-- overlaps the sliding window
+local estimated = previous * (window - elapsed) / window + count
+
+if estimated + cost > limit then
+    local retry
+    if cost > limit then
+        retry = window
+    elseif count + cost > limit then
+        -- next window, once this window's share has decayed enough
+        retry = (window - elapsed) + math.ceil(window * (1 - (limit - cost) / count))
+    else
+        retry = math.ceil(window - (limit - cost - count) * window / previous) - elapsed
+    end
+    local reset = window - elapsed
+    if count > 0 then
+        reset = reset + window
+    end
+    return {0, math.max(0, math.floor(limit - estimated)), math.max(retry, 1), reset}
+end
+
+redis.call('HINCRBY', key, current, cost)
+redis.call('HDEL', key, current - 2)
+redis.call('PEXPIRE', key, window * 2)
+return {1, math.floor(limit - estimated - cost), 0, window * 2 - elapsed}
+"""
+
+# Generic cell rate algorithm: one "theoretical arrival time" per key.
+# Requests are spaced window / limit apart and up to ``limit`` may
+# arrive back to back.
+GCRA = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + clock[2] / 1000
+
+local emission = window / limit
+local tat = tonumber(redis.call('GET', key) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + emission * cost
+local allow_at = new_tat - window
+
+if now < allow_at then
+    return {0, math.max(0, math.floor((now + window - tat) / emission)), math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+
+redis.call('SET', key, string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((now - allow_at) / emission), 0, math.ceil(new_tat - now)}
+"""
+
+# Batch reconciliation for HybridRateLimiter: adds each key's locally
+# consumed units to the same hash layout as SLIDING_WINDOW_COUNTER
+# (without checking) and reports what is left globally.
+# ARGV: limit, window (ms), consumed per key.
+# Returns {remaining, retry_after_ms} per key, flattened.
+RECONCILE = """
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local results = {}
+
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 3 - 2])
+    local window = tonumber(ARGV[i * 3 - 1])
+    local consumed = tonumber(ARGV[i * 3])
+    local current = math.floor(now / window)
+    local elapsed = now - current * window
+
+    if consumed > 0 then
+        redis.call('HINCRBY', key, current, consumed)
+        redis.call('HDEL', key, current - 2)
+        redis.call('PEXPIRE', key, window * 2)
+    end
+
+    local count = tonumber(redis.call('HGET', key, current) or '0')
+    local previous = tonumber(redis.call('HGET', key, current - 1) or '0')
+    local estimated = previous * (window - elapsed) / window + count
+    local retry = 0
+    if estimated + 1 > limit then
+        if count + 1 > limit then
+            retry = (window - elapsed) + math.ceil(window * (1 - (limit - 1) / count))
+        else
+            retry = math.ceil(window - (limit - 1 - count) * window / previous) - elapsed
+        end
+    end
+
+    results[#results + 1] = math.floor(limit - estimated)
+    results[#results + 1] = math.max(retry, 0)
+end
+return results
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    # seconds until the request would be allowed (0 when allowed)
+    retry_after: float
+    # seconds until the limiter is back to full capacity
+    reset_after: float
+
+
+class RateLimiter:
+    """
+    Check-and-consume against Redis in a single round trip.
+
+    The script is loaded once per client and then run with EVALSHA
+    (redis-py reloads it transparently after a Redis restart).
+    Subclasses (or any class given by dotted path in
+    ``RATE_LIMIT["algorithm"]``) provide ``script``.
+    """
+
+    script: str = ""
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self._script = redis_client.register_script(self.script)
+
+    def check(self, key: str, *, limit: int, window: float, cost: int = 1) -> RateLimitResult:
+        """
+        Consumes ``cost`` units of ``limit`` per ``window`` seconds for
+        ``key`` if available. Raises redis errors to the caller.
+
+        Time: O(1) round trips (O(log N) in Redis for the window log)
+        Space: O(1)
+        """
+        allowed, remaining, retry_ms, reset_ms = self._script(
+            keys=[key],
+            args=[int(limit), int(window * 1000), int(cost)],
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=int(limit),
+            remaining=max(int(remaining), 0),
+            retry_after=int(retry_ms) / 1000,
+            reset_after=int(reset_ms) / 1000,
+        )
+
+
+class SlidingWindowLogLimiter(RateLimiter):
+    """
+    Exact: one sorted-set entry per consumed unit.
+
+    Space: O(limit) per key
+    """
+    script = SLIDING_WINDOW_LOG
+
+
+class SlidingWindowCounterLimiter(RateLimiter):
+    """
+    Approximate sliding window from the current and previous fixed
+    window counts; no boundary bursts.
+
+    Space: O(1) per key
+    """
+    script = SLIDING_WINDOW_COUNTER
+
+
+class GCRALimiter(RateLimiter):
+    """
+    Generic cell rate algorithm: smooth spacing with a burst of up to
+    ``limit``, one timestamp per key.
+
+    Space: O(1) per key
+    """
+    script = GCRA
+
+
+class _LocalBucket:
+    """
+    Per-key state of a HybridRateLimiter worker.
+    """
+
+    __slots__ = ("limit", "window", "tokens", "refilled_at", "remaining", "pending", "retry_after", "dirty")
+
+    def __init__(self, limit: int, window: float, now: float):
+        self.limit = limit
+        self.window = window
+        self.tokens = float(limit)
+        self.refilled_at = now
+        # Global units left as of the last reconciliation (optimistic
+        # until the first one) and units consumed here since.
+        self.remaining = limit
+        self.pending = 0
+        self.retry_after = 0.0
+        self.dirty = True
+
+    def refill(self, limit: int, window: float, now: float) -> None:
+        self.limit, self.window = limit, window
+        rate = limit / window
+        self.tokens = min(float(limit), self.tokens + (now - self.refilled_at) * rate)
+        self.refilled_at = now
+
+
+class HybridRateLimiter:
+    """
+    Rate limits from in-process token buckets and reconciles with Redis
+    in the background, so a request never waits on Redis.
+
+    Every ``sync_interval`` seconds one EVALSHA (RECONCILE) adds the units
+    each key consumed in this worker to the shared sliding window counter
+    and brings back how many are left globally. Between reconciliations a
+    worker admits at most ``error_budget * limit`` units per key (and
+    never more than the global remainder it last saw), so with W workers
+    a tenant can overshoot its limit by at most W * error_budget * limit
+    per interval.
+
+    Redis calls go through ``breaker``: once it opens, reconciliation
+    stops, unsynced counts are dropped and each worker enforces the limit
+    on its own bucket until a background probe finds Redis again.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        *,
+        sync_interval: float = 0.2,
+        error_budget: float = 0.1,
+        breaker: Optional[CircuitBreaker] = None,
+        max_keys: int = 10000,
+    ):
+        self.redis = redis_client
+        self.sync_interval = sync_interval
+        self.error_budget = error_budget
+        self.breaker = breaker or CircuitBreaker(probe=redis_client.ping)
+        self.max_keys = max_keys
+        self._reconcile = redis_client.register_script(RECONCILE)
+        self._buckets: "OrderedDict[str, _LocalBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def check(self, key: str, *, limit: int, window: float, cost: int = 1) -> RateLimitResult:
+        """
+        Consumes ``cost`` units locally; never touches Redis.
+
+        Time: O(1)
+        Space: O(K) where K = keys seen by this worker (at most max_keys)
+        """
+        self._ensure_syncing()
+        now = time.monotonic()
+        online = self.breaker.state == CircuitBreaker.CLOSED
+
+        with self._lock:
+            bucket = self._bucket(key, int(limit), window, now)
+            bucket.refill(int(limit), window, now)
+            bucket.dirty = True
+
+            budget = max(cost, math.ceil(limit * self.error_budget))
+            retry_after = 0.0
+            out_of_budget = False
+            if bucket.tokens < cost:
+                retry_after = (cost - bucket.tokens) * window / limit
+            elif online and bucket.pending + cost > bucket.remaining:
+                retry_after = bucket.retry_after or window * cost / limit
+            elif online and bucket.pending + cost > budget:
+                retry_after = self.sync_interval
+                out_of_budget = True
+            else:
+                bucket.tokens -= cost
+                if online:
+                    bucket.pending += cost
+
+            remaining = bucket.tokens
+            if online:
+                remaining = min(remaining, bucket.remaining - bucket.pending)
+
+        if out_of_budget:
+            # Nothing more to admit until the next reconciliation: run it now.
+            self._wake.set()
+
+        return RateLimitResult(
+            allowed=not retry_after,
+            limit=int(limit),
+            remaining=max(int(remaining), 0),
+            retry_after=retry_after,
+            reset_after=float(window),
+        )
+
+    def sync(self) -> int:
+        """
+        Reconciles every key used since the last sync in one round trip.
+        Returns the number of keys reconciled.
+
+        Time: O(K) where K = keys used since the last sync
+        Space: O(K)
+        """
+        with self._lock:
+            batch = [(key, bucket, bucket.pending) for key, bucket in self._buckets.items() if bucket.dirty]
+        if not batch:
+            return 0
+
+        if not self.breaker.allow():
+            # Redis is down: these counts will never be reconciled.
+            with self._lock:
+                for _, bucket, sent in batch:
+                    bucket.pending -= sent
+            return 0
+
+        args: List[int] = []
+        for _, bucket, sent in batch:
+            args += [bucket.limit, int(bucket.window * 1000), sent]
+
+        try:
+            results = self._reconcile(keys=[key for key, _, _ in batch], args=args)
+        except Exception:
+            logger.debug("Rate limit reconciliation failed", exc_info=True)
+            self.breaker.record_failure()
+            return 0
+        self.breaker.record_success()
+
+        with self._lock:
+            for index, (_, bucket, sent) in enumerate(batch):
+                bucket.pending -= sent
+                bucket.remaining = int(results[index * 2])
+                bucket.retry_after = int(results[index * 2 + 1]) / 1000
+                # Exhausted keys keep syncing to learn when they recover.
+                bucket.dirty = bucket.pending > 0 or bucket.remaining <= 0
+
+        return len(batch)
+
+    def _bucket(self, key: str, limit: int, window: float, now: float) -> _LocalBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _LocalBucket(limit, window, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def _ensure_syncing(self) -> None:
+        # Started lazily (and again after a fork) so each worker process
+        # has its own reconciliation thread.
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._sync_forever, name="rate-limit-sync", daemon=True)
+            self._thread.start()
+
+    def _sync_forever(self) -> None:
+        while True:
+            self._wake.wait(self.sync_interval)
+            self._wake.clear()
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Rate limit reconciliation crashed")
+
+
+LIMITERS: Dict[str, Type[RateLimiter]] = {
+    "sliding_window_log": SlidingWindowLogLimiter,
+    "sliding_window_counter": SlidingWindowCounterLimiter,
+    "gcra": GCRALimiter,
+}
+
+
+def get_limiter(redis_client, algorithm: Optional[str] = None) -> RateLimiter:
+    limiter_class = LIMITERS.get(algorithm or "gcra") or import_string(algorithm)
+    return limiter_class(redis_client)
+
+
+def retry_after_header(result: RateLimitResult) -> int:
+    return max(math.ceil(result.retry_after), 1)
+
+
+def rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(math.ceil(result.reset_after)),
+    }
@@ -0,0 +1,128 @@
+import logging
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from system.db_registry import get_tenant_db, tenant_connections
+from system.lru_cache import LRUCache
+from system.tenant_cache import tenant_resolver
+
+logger = logging.getLogger(__name__)
+
+STICKY_KEY_PREFIX = "tenant:replica:sticky"
+
+# Replica lag probe SQL: 0 when everything received has been replayed
+# (an idle primary must not look like lag), else age of the last replay.
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def _config() -> Dict:
+    return getattr(settings, "TENANT_READ_REPLICAS", {})
+
+
+_lag_cache = LRUCache(
+    max_size=1000,
+    ttl_seconds=float(_config().get("lag_check_seconds", 5)),
+)
+
+
+def replica_alias(primary_alias: str, index: int) -> str:
+    return f"{primary_alias}_replica_{index}"
+
+
+def get_tenant_read_db(user) -> str:
+    """
+    Returns an alias for read-only queries for ``user``'s tenant.
+
+    Uses the first replica whose lag is within ``max_lag_seconds``, and
+    the primary when the tenant has no replicas, when the user wrote in
+    the last ``sticky_seconds`` (read-your-writes), or when every
+    replica is lagging or unreachable.
+
+    Time: O(K) where K = replicas; lag probes are cached per process
+    Space: O(1)
+    """
+    primary = get_tenant_db(user)
+    if not _config().get("enabled", True):
+        return primary
+
+    resolved = tenant_resolver.resolve(user.tenant_id)
+    if resolved is None or not resolved.replicas or recently_wrote(user):
+        return primary
+
+    max_lag = float(_config().get("max_lag_seconds", 10))
+    for index, replica in enumerate(resolved.replicas):
+        alias = tenant_connections.get_or_register(
+            replica_alias(primary, index),
+            lambda replica=replica: _replica_config(resolved.db_config, replica),
+        )
+        lag = replica_lag(alias)
+        if lag is not None and lag <= max_lag:
+            return alias
+
+    return primary
+
+
+def _replica_config(db_config: Dict, replica: Dict) -> Dict:
+    """
+    The primary's config with ``replica``'s overrides. Connections get a
+    short ``connect_timeout`` so an unreachable replica fails the lag
+    probe quickly instead of stalling the read; a replica's own
+    ``OPTIONS`` win.
+    """
+    options = {
+        **db_config.get("OPTIONS", {}),
+        "connect_timeout": int(_config().get("connect_timeout_seconds", 2)),
+        **replica.get("OPTIONS", {}),
+    }
+    return {**db_config, **replica, "OPTIONS": options}
+
+
+def replica_lag(alias: str) -> Optional[float]:
+    """
+    Seconds ``alias`` is behind its primary, or None if unreachable.
+    """
+    cached = _lag_cache.get(alias)
+    if cached is not None:
+        return cached[0]
+
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            lag = float(cursor.fetchone()[0])
+    except Exception:
+        logger.warning("Replica %s unreachable, reading from primary", alias)
+        lag = None
+
+    _lag_cache.set(alias, (lag,))
+    return lag
+
+
+def _sticky_key(user) -> str:
+    return f"{STICKY_KEY_PREFIX}:{user.tenant_id}:{user.pk}"
+
+
+def mark_write(user) -> None:
+    """
+    Pins ``user``'s reads to the primary for ``sticky_seconds``.
+    """
+    try:
+        cache.set(_sticky_key(user), 1, int(_config().get("sticky_seconds", 5)))
+    except Exception:
+        pass
+
+
+def recently_wrote(user) -> bool:
+    try:
+        return cache.get(_sticky_key(user)) is not None
+    except Exception:
+        # Without the marker we cannot promise read-your-writes.
+        return True
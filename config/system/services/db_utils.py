@@ -1,4 +1,5 @@
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
 
@@ -28,23 +29,101 @@ def create_postgres_database(
     cursor.close()
     conn.close()
 
-from django.conf import settings
-from django.db import connections
-import copy
+from system.db_registry import tenant_connections
 
 
 def register_tenant_db(alias: str, db_config: dict) -> None:
     """
     Safely registers a tenant DB with all required Django keys.
+
+    Goes through the bounded alias registry so the alias is evicted
+    (and its connection closed) like any other tenant alias.
     """
+    tenant_connections.register(alias, db_config)
 
-    base = copy.deepcopy(settings.DATABASES["default"])
-    base.update(db_config)
 
-    base.setdefault("ATOMIC_REQUESTS", False)
-    base.setdefault("AUTOCOMMIT", True)
-    base.setdefault("CONN_HEALTH_CHECKS", False)
-    base.setdefault("OPTIONS", {})
-    base.setdefault("TIME_ZONE", "UTC")
+def postgres_admin_connection(*, dbname: str, user: str, password: str, host: str, port: str):
+    conn = psycopg2.connect(
+        dbname=dbname,
+        user=user,
+        password=password,
+        host=host,
+        port=port,
+    )
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    return conn
+
+
+def ensure_postgres_database(
+    *,
+    db_name: str,
+    user: str,
+    password: str,
+    host: str,
+    port: str,
+) -> None:
+    """
+    Creates ``db_name`` unless it already exists (shared schema DB).
+
+    Time: O(1)
+    Space: O(1)
+    """
+    conn = postgres_admin_connection(dbname="postgres", user=user, password=password, host=host, port=port)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [db_name])
+            if cursor.fetchone() is None:
+                cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_name)))
+    finally:
+        conn.close()
+
+
+def create_postgres_schema(
+    *,
+    db_name: str,
+    schema_name: str,
+    user: str,
+    password: str,
+    host: str,
+    port: str,
+) -> None:
+    """
+    Time: O(1)
+    Space: O(1)
+    """
+    conn = postgres_admin_connection(dbname=db_name, user=user, password=password, host=host, port=port)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(schema_name)))
+    finally:
+        conn.close()
+
+
+def drop_postgres_storage(
+    *,
+    db_name: str,
+    schema_name: str,
+    user: str,
+    password: str,
+    host: str,
+    port: str,
+) -> None:
+    """
+    Drops a tenant's schema (schema mode) or whole database.
+
+    Time: O(1)
+    Space: O(1)
+    """
+    if schema_name:
+        conn = postgres_admin_connection(dbname=db_name, user=user, password=password, host=host, port=port)
+        statement = sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(schema_name))
+    else:
+        conn = postgres_admin_connection(dbname="postgres", user=user, password=password, host=host, port=port)
+        # FORCE (Postgres 13+) ends sessions other workers may still hold
+        statement = sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(db_name))
 
-    connections.databases[alias] = base
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(statement)
+    finally:
+        conn.close()
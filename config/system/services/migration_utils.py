@@ -1,12 +1,26 @@
+import functools
+import hashlib
+import inspect
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Set, Tuple
+
 from django.core.management import call_command
-from django.db import connections
+from django.db import ProgrammingError, connections
+from django.db.migrations.loader import MigrationLoader
 from django.conf import settings
 
 
-def migrate_tenant_database(db_alias: str) -> None:
+def migrate_tenant_database(db_alias: str, *, force: bool = False) -> bool:
     """
     Applies all migrations to tenant DB.
+
+    Tenants already at the head migration set (one query against
+    ``django_migrations``) are skipped without building Django's
+    migration executor; returns whether migrations were run.
     """
+    if not force and not tenant_migration_state(db_alias)["behind"]:
+        return False
+
     # call_command(
     #     "migrate",
     #     database=db_alias,
@@ -20,3 +34,76 @@ def migrate_tenant_database(db_alias: str) -> None:
             interactive=False,
             verbosity=0,
         )
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def tenant_migration_heads() -> FrozenSet[Tuple[str, str]]:
+    """
+    (app, name) of every tenant-app migration on disk: what a current
+    tenant has recorded in ``django_migrations``.
+
+    Time: O(M) once per process
+    Space: O(M)
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return frozenset(key for key in loader.disk_migrations if key[0] in settings.TENANT_APPS)
+
+
+def applied_tenant_migrations(db_alias: str) -> Set[Tuple[str, str]]:
+    """
+    (app, name) recorded in ``db_alias``'s ``django_migrations`` for
+    tenant apps; empty for a database that was never migrated.
+
+    Call outside a transaction: a missing table aborts it.
+
+    Time: one query, O(M) rows
+    Space: O(M)
+    """
+    try:
+        with connections[db_alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT app, name FROM django_migrations WHERE app = ANY(%s)",
+                [list(settings.TENANT_APPS)],
+            )
+            return set(cursor.fetchall())
+    except ProgrammingError:
+        return set()
+
+
+def tenant_migration_state(db_alias: str) -> Dict[str, List[str]]:
+    """
+    Migrations ``db_alias`` still needs ("behind") and has applied but
+    the code does not know ("ahead", e.g. after a rolled back deploy).
+    """
+    heads = tenant_migration_heads()
+    applied = applied_tenant_migrations(db_alias)
+    return {
+        "behind": sorted(f"{app}.{name}" for app, name in heads - applied),
+        "ahead": sorted(f"{app}.{name}" for app, name in applied - heads),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def tenant_migration_fingerprint() -> str:
+    """
+    Hash of every tenant-app migration (name and file contents).
+
+    Changes whenever a tenant migration is added, removed or edited, so
+    a database stamped with it is known to have the current schema.
+    Computed once per process: migrations only change with a deploy.
+
+    Time: O(M) where M = number of migrations
+    Space: O(M)
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    digest = hashlib.sha256()
+
+    for app_label, name in sorted(loader.disk_migrations):
+        if app_label not in settings.TENANT_APPS:
+            continue
+        migration = loader.disk_migrations[(app_label, name)]
+        digest.update(f"{app_label}.{name}\n".encode())
+        digest.update(Path(inspect.getfile(type(migration))).read_bytes())
+
+    return digest.hexdigest()
@@ -0,0 +1,155 @@
+import functools
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import ValidationError
+
+from system.models import DatabaseHost, Tenant, TenantDatabase
+
+
+@dataclass(frozen=True)
+class Placement:
+    """
+    Where a new tenant database goes.
+    """
+    name: str
+    host: str
+    port: str
+
+
+class PlacementPolicy:
+    """
+    Picks one of the active hosts for a new tenant.
+
+    Subclasses (or any class given by dotted path in
+    ``TENANT_PLACEMENT["policy"]``) implement ``choose``.
+    """
+
+    def choose(self, hosts: List[DatabaseHost], tenant: Tenant) -> DatabaseHost:
+        raise NotImplementedError
+
+
+class LeastLoadedPolicy(PlacementPolicy):
+    """
+    Host with the fewest tenants per unit of weight.
+
+    Time: O(H) plus one grouped count query
+    Space: O(H)
+    """
+
+    def choose(self, hosts: List[DatabaseHost], tenant: Tenant) -> DatabaseHost:
+        loads = tenant_counts_by_host()
+        return min(
+            hosts,
+            key=lambda host: (loads.get((host.host, host.port), 0) / max(host.weight, 1), host.name),
+        )
+
+
+class RoundRobinPolicy(PlacementPolicy):
+    """
+    Weighted round robin; the position is shared across workers through
+    the cache (falls back to a per-process counter without Redis).
+
+    Time: O(H)
+    Space: O(1)
+    """
+
+    COUNTER_KEY = "tenant:placement:rr"
+    _local_counter = itertools.count()
+
+    def choose(self, hosts: List[DatabaseHost], tenant: Tenant) -> DatabaseHost:
+        try:
+            cache.add(self.COUNTER_KEY, 0, None)
+            position = cache.incr(self.COUNTER_KEY) - 1
+        except Exception:
+            position = next(self._local_counter)
+
+        # Reduce weights by their GCD so 100/200 cycles as 1/2, not 100/200.
+        weights = [max(host.weight, 1) for host in hosts]
+        divisor = functools.reduce(math.gcd, weights)
+        weights = [weight // divisor for weight in weights]
+
+        slot = position % sum(weights)
+        for host, weight in zip(hosts, weights):
+            slot -= weight
+            if slot < 0:
+                return host
+        return hosts[-1]
+
+
+class PinnedPolicy(PlacementPolicy):
+    """
+    Always the named host (``TENANT_PLACEMENT["pinned_host"]`` by default).
+    """
+
+    def __init__(self, host_name: Optional[str] = None):
+        self.host_name = host_name or getattr(settings, "TENANT_PLACEMENT", {}).get("pinned_host")
+
+    def choose(self, hosts: List[DatabaseHost], tenant: Tenant) -> DatabaseHost:
+        for host in hosts:
+            if host.name == self.host_name:
+                return host
+        raise ValidationError({"db_host": f"Database host {self.host_name!r} is not active"})
+
+
+POLICIES = {
+    "least_loaded": LeastLoadedPolicy,
+    "round_robin": RoundRobinPolicy,
+    "pinned": PinnedPolicy,
+}
+
+
+def tenant_counts_by_host() -> Dict[Tuple[str, str], int]:
+    rows = TenantDatabase.objects.values("db_host", "db_port").annotate(tenants=Count("id"))
+    return {(row["db_host"], row["db_port"]): row["tenants"] for row in rows}
+
+
+class PlacementService:
+    @staticmethod
+    def servers() -> List[Tuple[str, str]]:
+        """
+        (host, port) of the default host and every active DatabaseHost.
+        """
+        cfg = getattr(settings, "TENANT_PLACEMENT", {})
+        servers = {(cfg.get("default_host", "localhost"), cfg.get("default_port", "5432"))}
+        servers.update(DatabaseHost.objects.filter(is_active=True).values_list("host", "port"))
+        return sorted(servers)
+
+    @staticmethod
+    def get_policy(name: Optional[str] = None) -> PlacementPolicy:
+        name = name or getattr(settings, "TENANT_PLACEMENT", {}).get("policy", "least_loaded")
+        policy_class = POLICIES.get(name) or import_string(name)
+        return policy_class()
+
+    @staticmethod
+    def choose_host(tenant: Tenant, *, pinned_host: Optional[str] = None) -> Placement:
+        """
+        Chooses the server for ``tenant``'s database.
+
+        Without any registered DatabaseHost the configured default host
+        is used, so single-server setups need no extra configuration.
+
+        Time: O(H) where H = number of active hosts
+        Space: O(H)
+        """
+        hosts = list(DatabaseHost.objects.filter(is_active=True).order_by("name"))
+
+        if not hosts:
+            if pinned_host:
+                raise ValidationError({"db_host": f"Database host {pinned_host!r} is not active"})
+            cfg = getattr(settings, "TENANT_PLACEMENT", {})
+            return Placement(
+                name="default",
+                host=cfg.get("default_host", "localhost"),
+                port=cfg.get("default_port", "5432"),
+            )
+
+        policy = PinnedPolicy(pinned_host) if pinned_host else PlacementService.get_policy()
+        host = policy.choose(hosts, tenant)
+        return Placement(name=host.name, host=host.host, port=host.port)
@@ -0,0 +1,197 @@
+import json
+import math
+import multiprocessing
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from django.db import connections
+
+from system.db_pool import tenant_pools
+from system.db_registry import tenant_connections, tenant_db_alias
+from system.models import TenantDatabase
+from system.services.migration_utils import (
+    migrate_tenant_database,
+    tenant_migration_heads,
+    tenant_migration_state,
+)
+
+@dataclass
+class TenantMigrationResult:
+    tenant_id: str
+    status: str  # "ok", "current" (nothing to apply), "failed" or "timeout"
+    seconds: float
+    error: str = ""
+
+
+class MigrationTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise MigrationTimeout()
+
+
+def migrate_tenant_worker(tenant_id: str, db_config: Dict, timeout: float) -> TenantMigrationResult:
+    """
+    Migrates one tenant in a pool worker process.
+
+    The timeout is enforced twice: Postgres aborts any single statement
+    (including lock waits) that runs longer, and SIGALRM stops the
+    migration between statements once the whole tenant overran.
+    """
+    alias = tenant_db_alias(UUID(tenant_id))
+    timeout_ms = int(timeout * 1000)
+    tenant_connections.register(
+        alias,
+        {
+            **db_config,
+            # One short-lived connection per tenant; nothing to pool.
+            "POOL": False,
+            "OPTIONS": {"options": f"-c statement_timeout={timeout_ms}"},
+        },
+    )
+
+    started = time.monotonic()
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.alarm(max(math.ceil(timeout), 1))
+    try:
+        status = "ok" if migrate_tenant_database(alias) else "current"
+        error = ""
+    except MigrationTimeout:
+        status, error = "timeout", f"exceeded {timeout:g}s"
+    except Exception as exc:
+        status, error = ("timeout", str(exc)) if "statement timeout" in str(exc) else ("failed", str(exc))
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+        tenant_connections.evict(alias)
+
+    return TenantMigrationResult(tenant_id, status, round(time.monotonic() - started, 3), error)
+
+
+class TenantMigrationService:
+    """
+    Rolls tenant migrations out across every tenant database.
+    """
+
+    @staticmethod
+    def plan(
+        *,
+        tenant_ids: Optional[Iterable[str]] = None,
+        canary: int = 0,
+        done: Optional[Set[str]] = None,
+    ) -> Dict[str, List[TenantDatabase]]:
+        """
+        Tenants to migrate, split into ``canary`` (oldest tenants first)
+        and ``rest``; tenants listed in ``done`` are left out.
+        """
+        queryset = TenantDatabase.objects.select_related("tenant").order_by("tenant__created_at", "tenant_id")
+        if tenant_ids:
+            queryset = queryset.filter(tenant_id__in=list(tenant_ids))
+
+        pending = [tenant_db for tenant_db in queryset if tenant_db.tenant_id.hex not in (done or set())]
+        return {"canary": pending[:canary], "rest": pending[canary:]}
+
+    @staticmethod
+    def migrate_all(
+        tenant_dbs: List[TenantDatabase],
+        *,
+        concurrency: int,
+        timeout: float,
+        on_result: Optional[Callable[[TenantMigrationResult], None]] = None,
+    ) -> List[TenantMigrationResult]:
+        """
+        Migrates ``tenant_dbs`` through a pool of ``concurrency`` worker
+        processes, reporting each result as it completes.
+
+        Workers are forked, so every connection of this process is
+        closed first; the parent does not touch the database again
+        until the pool is done.
+
+        Time: O(T * M / concurrency) where T = tenants, M = migrations
+        Space: O(T)
+        """
+        jobs = [(tenant_db.tenant_id.hex, tenant_db.connection_config()) for tenant_db in tenant_dbs]
+        if not jobs:
+            return []
+
+        # Built once here and inherited by every forked worker.
+        tenant_migration_heads()
+        connections.close_all()
+        tenant_pools.close_all()
+
+        results = []
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=max(concurrency, 1), mp_context=context) as executor:
+            pending = {
+                executor.submit(migrate_tenant_worker, tenant_id, config, timeout): tenant_id
+                for tenant_id, config in jobs
+            }
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    tenant_id = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        # Worker raised or died (OOM, killed): count it as a failure.
+                        result = TenantMigrationResult(tenant_id, "failed", 0.0, repr(exc))
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+
+        return results
+
+    @staticmethod
+    def drift(tenant_dbs: List[TenantDatabase], *, concurrency: int) -> List[Dict]:
+        """
+        Migration state of every tenant, one ``django_migrations`` query
+        each, run ``concurrency`` at a time on threads.
+
+        Returns ``{"tenant_id", "behind", "ahead", "error"}`` per tenant.
+
+        Time: O(T / concurrency) round trips where T = tenants
+        Space: O(T * M)
+        """
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            return list(executor.map(TenantMigrationService._tenant_state, tenant_dbs))
+
+    @staticmethod
+    def _tenant_state(tenant_db: TenantDatabase) -> Dict:
+        alias = f"{tenant_db_alias(tenant_db.tenant_id)}_drift"
+        tenant_connections.register(alias, {**tenant_db.connection_config(), "POOL": False})
+        try:
+            return {"tenant_id": tenant_db.tenant_id.hex, **tenant_migration_state(alias), "error": ""}
+        except Exception as exc:
+            return {"tenant_id": tenant_db.tenant_id.hex, "behind": [], "ahead": [], "error": str(exc)}
+        finally:
+            tenant_connections.evict(alias)
+
+    @staticmethod
+    def read_checkpoint(path: Optional[str]) -> Set[str]:
+        """
+        Tenant ids (hex) already migrated successfully per ``path``.
+        """
+        if not path or not Path(path).exists():
+            return set()
+
+        done = set()
+        with open(path) as checkpoint:
+            for line in checkpoint:
+                if line.strip():
+                    entry = json.loads(line)
+                    if entry["status"] in ("ok", "current"):
+                        done.add(entry["tenant_id"])
+        return done
+
+    @staticmethod
+    def write_checkpoint(path: Optional[str], result: TenantMigrationResult) -> None:
+        if not path:
+            return
+        with open(path, "a") as checkpoint:
+            checkpoint.write(json.dumps(asdict(result)) + "\n")
@@ -0,0 +1,272 @@
+import logging
+from typing import Optional
+
+import psycopg2
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from system.db_registry import tenant_connections, tenant_db_alias
+from system.models import Tenant, TenantDatabase, TenantProvisioning, User
+from system.services.db_utils import drop_postgres_storage, register_tenant_db
+from system.services.migration_utils import migrate_tenant_database
+from system.services.placement import Placement, PlacementService
+from system.services.tenant_storage import TenantStorageService
+from system.tenant_context import tenant_db_context
+from users.models import TenantUser
+
+logger = logging.getLogger(__name__)
+
+State = TenantProvisioning.State
+
+
+class TenantProvisioningService:
+    """
+    Tenant signup as a persisted state machine:
+
+        PENDING -> DATABASE_CREATED -> MIGRATED -> ADMIN_SEEDED -> READY
+                   (skipped when the storage comes pre-migrated)
+
+    Each stage commits its own work and advances the state with a
+    compare-and-set, so a stage that is retried or delivered twice is a
+    no-op once its state has moved on. ``fail`` undoes a signup that
+    cannot finish: the storage is dropped and the Tenant (with its
+    TenantDatabase and admin User) deleted, freeing the name.
+    """
+
+    STAGES = {
+        State.PENDING: "create_database",
+        State.DATABASE_CREATED: "migrate",
+        State.MIGRATED: "seed_admin",
+        State.ADMIN_SEEDED: "mirror_user",
+    }
+
+    @staticmethod
+    def start(
+        *,
+        tenant_name: str,
+        admin_username: str,
+        admin_password: str,
+        admin_email: str = "",
+        isolation_mode: Optional[str] = None,
+        db_host_name: Optional[str] = None,
+        dispatch: bool = True,
+    ) -> TenantProvisioning:
+        """
+        Validates a signup, reserves the (inactive) Tenant and queues the
+        first stage. Only master-DB rows are written, so this is cheap
+        enough to run inside a request.
+
+        Time: O(1)
+        Space: O(1)
+        """
+        isolation_mode = isolation_mode or settings.TENANT_DEFAULT_ISOLATION_MODE
+        if isolation_mode not in TenantDatabase.IsolationMode.values:
+            raise ValidationError({"isolation_mode": f"Unknown isolation mode {isolation_mode}"})
+        if Tenant.objects.filter(name=tenant_name).exists():
+            raise ValidationError({"tenant_name": "Tenant with this name already exists"})
+        if User.objects.filter(username=admin_username).exists():
+            raise ValidationError({"username": "User with this username already exists"})
+
+        try:
+            with transaction.atomic():
+                tenant = Tenant.objects.create(name=tenant_name, is_active=False)
+                provisioning = TenantProvisioning.objects.create(
+                    tenant=tenant,
+                    tenant_name=tenant_name,
+                    isolation_mode=isolation_mode,
+                    db_host_name=db_host_name or "",
+                    admin_username=admin_username,
+                    admin_email=admin_email,
+                    admin_password=make_password(admin_password),
+                )
+                if dispatch:
+                    transaction.on_commit(lambda: TenantProvisioningService.dispatch(provisioning))
+        except IntegrityError:
+            raise ValidationError({"tenant_name": "Tenant with this name already exists"})
+
+        return provisioning
+
+    @staticmethod
+    def dispatch(provisioning: TenantProvisioning) -> None:
+        """
+        Queues the Celery task for the provisioning's current stage.
+        """
+        from system.tasks import PROVISIONING_STAGE_TASKS
+
+        task = PROVISIONING_STAGE_TASKS.get(provisioning.state)
+        if task is not None:
+            task.delay(provisioning_id=str(provisioning.id))
+
+    @staticmethod
+    def run(provisioning: TenantProvisioning) -> TenantProvisioning:
+        """
+        Runs every remaining stage in-process (scripts, tests); undoes
+        the signup and re-raises if a stage fails.
+
+        Time: O(M) where M = migrations (O(1) from a template or warm pool)
+        Space: O(1)
+        """
+        try:
+            while provisioning.state in TenantProvisioningService.STAGES:
+                TenantProvisioningService.run_stage(provisioning)
+        except Exception as exc:
+            TenantProvisioningService.fail(provisioning.id, exc)
+            raise
+        return provisioning
+
+    @staticmethod
+    def run_stage(provisioning: TenantProvisioning) -> None:
+        provisioning.refresh_from_db()
+        stage = TenantProvisioningService.STAGES.get(provisioning.state)
+        if stage is not None:
+            getattr(TenantProvisioningService, stage)(provisioning)
+            provisioning.refresh_from_db()
+
+    @staticmethod
+    def create_database(provisioning: TenantProvisioning) -> None:
+        """
+        Places the tenant and creates (or claims) its storage.
+        """
+        tenant = provisioning.tenant
+        if not provisioning.db_host:
+            placement = PlacementService.choose_host(tenant, pinned_host=provisioning.db_host_name or None)
+            provisioning.db_host, provisioning.db_port = placement.host, placement.port
+            provisioning.save(update_fields=["db_host", "db_port", "updated_at"])
+
+        # An earlier attempt may have died between CREATE and commit.
+        TenantProvisioningService._drop_unrecorded_storage(provisioning)
+
+        placement = Placement(name=provisioning.db_host_name, host=provisioning.db_host, port=provisioning.db_port)
+        with transaction.atomic():
+            fields, migrated = TenantStorageService.provision(tenant, provisioning.isolation_mode, placement)
+            TenantDatabase.objects.create(tenant=tenant, **fields)
+            TenantProvisioningService._advance(
+                provisioning, State.PENDING, State.MIGRATED if migrated else State.DATABASE_CREATED
+            )
+
+    @staticmethod
+    def migrate(provisioning: TenantProvisioning) -> None:
+        migrate_tenant_database(TenantProvisioningService._register(provisioning.tenant))
+        TenantProvisioningService._advance(provisioning, State.DATABASE_CREATED, State.MIGRATED)
+
+    @staticmethod
+    def seed_admin(provisioning: TenantProvisioning) -> None:
+        tenant = provisioning.tenant
+        with transaction.atomic():
+            admin, _ = User.objects.get_or_create(
+                username=provisioning.admin_username,
+                defaults={
+                    "first_name": "Admin",
+                    "last_name": "User",
+                    "email": provisioning.admin_email,
+                    "password": provisioning.admin_password,
+                    "role": User.Role.ADMIN,
+                    "tenant": tenant,
+                    "is_staff": True,
+                    "is_superuser": True,
+                },
+            )
+            if admin.tenant_id != tenant.id:
+                raise ValidationError({"username": "User with this username already exists"})
+            TenantProvisioningService._advance(provisioning, State.MIGRATED, State.ADMIN_SEEDED)
+
+    @staticmethod
+    def mirror_user(provisioning: TenantProvisioning) -> None:
+        """
+        Mirrors the admin into the tenant database and activates the tenant.
+        """
+        tenant = provisioning.tenant
+        admin = User.objects.get(username=provisioning.admin_username, tenant=tenant)
+        alias = TenantProvisioningService._register(tenant)
+
+        with tenant_db_context(alias):
+            TenantUser.objects.using(alias).get_or_create(
+                auth_user=admin.id,
+                defaults={"tenant": tenant.id.hex, "role": User.Role.ADMIN},
+            )
+
+        with transaction.atomic():
+            tenant.is_active = True
+            tenant.save(update_fields=["is_active"])
+            TenantProvisioningService._advance(provisioning, State.ADMIN_SEEDED, State.READY, admin_password="")
+
+    @staticmethod
+    def fail(provisioning_id, error: Exception) -> None:
+        """
+        Compensates a signup that cannot finish and records why.
+
+        Time: O(1)
+        Space: O(1)
+        """
+        provisioning = TenantProvisioning.objects.select_related("tenant").get(pk=provisioning_id)
+        if provisioning.state in (State.READY, State.FAILED):
+            return
+
+        tenant = provisioning.tenant
+        if tenant is not None:
+            tenant_db = TenantDatabase.objects.filter(tenant=tenant).first()
+            tenant_connections.evict(tenant_db_alias(tenant.id))
+            try:
+                if tenant_db is not None:
+                    TenantStorageService.drop_storage(tenant_db.connection_config())
+                else:
+                    TenantProvisioningService._drop_unrecorded_storage(provisioning)
+            except Exception:
+                logger.exception("Could not drop storage of failed signup %s", provisioning.tenant_name)
+            tenant.delete()
+
+        provisioning.tenant = None
+        provisioning.state = State.FAILED
+        provisioning.error = TenantProvisioningService._describe(error)
+        provisioning.admin_password = ""
+        provisioning.save(update_fields=["tenant", "state", "error", "admin_password", "updated_at"])
+
+    @staticmethod
+    def _describe(error: Exception) -> str:
+        if isinstance(error, ValidationError) and isinstance(error.detail, dict):
+            return "; ".join(
+                f"{field}: {' '.join(str(message) for message in messages) if isinstance(messages, list) else messages}"
+                for field, messages in error.detail.items()
+            )
+        return str(error)
+
+    @staticmethod
+    def _advance(provisioning: TenantProvisioning, current: str, new: str, **fields) -> bool:
+        advanced = TenantProvisioning.objects.filter(pk=provisioning.pk, state=current).update(
+            state=new, updated_at=timezone.now(), **fields
+        )
+        if advanced:
+            provisioning.state = new
+        return bool(advanced)
+
+    @staticmethod
+    def _register(tenant: Tenant) -> str:
+        alias = tenant_db_alias(tenant.id)
+        register_tenant_db(alias=alias, db_config=TenantDatabase.objects.get(tenant=tenant).connection_config())
+        return alias
+
+    @staticmethod
+    def _drop_unrecorded_storage(provisioning: TenantProvisioning) -> None:
+        # Storage named after the tenant that no TenantDatabase points at
+        # yet; warm-pool databases have their own names and are returned
+        # to the pool by the rolled back claim instead.
+        if not provisioning.db_host or TenantDatabase.objects.filter(tenant_id=provisioning.tenant_id).exists():
+            return
+
+        name = tenant_db_alias(provisioning.tenant_id)
+        schema_mode = provisioning.isolation_mode == TenantDatabase.IsolationMode.SCHEMA
+        try:
+            drop_postgres_storage(
+                db_name=settings.TENANT_SCHEMA_DATABASE["NAME"] if schema_mode else name,
+                schema_name=name if schema_mode else "",
+                user=settings.DB_SUPERUSER,
+                password=settings.DB_SUPERUSER_PASSWORD,
+                host=provisioning.db_host,
+                port=provisioning.db_port,
+            )
+        except psycopg2.OperationalError:
+            # Shared schema database not created yet: nothing to drop.
+            pass
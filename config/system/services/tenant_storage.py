@@ -0,0 +1,204 @@
+import time
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from system.db_registry import tenant_connections, tenant_db_alias
+from system.models import Tenant, TenantDatabase
+from system.services.db_utils import (
+    create_postgres_database,
+    create_postgres_schema,
+    drop_postgres_storage,
+    ensure_postgres_database,
+)
+from system.services.migration_utils import migrate_tenant_database
+from system.services.placement import Placement
+from system.services.tenant_copy import copy_tenant_data, sync_tenant_data
+from system.services.tenant_template import TenantTemplateService
+from system.services.warm_pool import WarmPoolService
+
+
+class TenantStorageService:
+    @staticmethod
+    def provision(tenant: Tenant, isolation_mode: str, placement: Placement) -> Tuple[Dict[str, str], bool]:
+        """
+        Creates a database or schema for ``tenant`` on the placed host.
+
+        Databases come from the host's warm pool when it has one ready,
+        else are cloned from the host's template, else created empty.
+        Returns the TenantDatabase fields pointing at the storage and
+        whether it is already migrated; if not the caller migrates it.
+
+        Time: O(1)
+        Space: O(1)
+        """
+        if isolation_mode not in TenantDatabase.IsolationMode.values:
+            raise ValidationError({"isolation_mode": f"Unknown isolation mode {isolation_mode}"})
+
+        name = f"tenant_{tenant.id.hex}"
+        server = {
+            "user": settings.DB_SUPERUSER,
+            "password": settings.DB_SUPERUSER_PASSWORD,
+            "host": placement.host,
+            "port": placement.port,
+        }
+
+        if isolation_mode == TenantDatabase.IsolationMode.SCHEMA:
+            db_name = settings.TENANT_SCHEMA_DATABASE["NAME"]
+            schema_name = name
+            ensure_postgres_database(db_name=db_name, **server)
+            create_postgres_schema(db_name=db_name, schema_name=schema_name, **server)
+            migrated = False
+        else:
+            schema_name = ""
+            db_name = WarmPoolService.claim(placement)
+            migrated = db_name is not None
+            if not migrated:
+                db_name = name
+                migrated = TenantTemplateService.clone(db_name, host=placement.host, port=placement.port)
+            if not migrated:
+                create_postgres_database(db_name=db_name, **server)
+
+        fields = {
+            "isolation_mode": isolation_mode,
+            "db_name": db_name,
+            "schema_name": schema_name,
+            "db_user": server["user"],
+            "db_password": server["password"],
+            "db_host": server["host"],
+            "db_port": server["port"],
+        }
+        return fields, migrated
+
+    @staticmethod
+    def move_tenant(tenant_db: TenantDatabase, isolation_mode: str, *, drop_source: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        Moves a tenant between database and schema isolation on its
+        current host (see ``_switch_storage``).
+        """
+        if tenant_db.isolation_mode == isolation_mode:
+            raise ValidationError({"isolation_mode": f"Tenant already uses {isolation_mode}"})
+
+        return TenantStorageService._switch_storage(
+            tenant_db,
+            isolation_mode,
+            Placement(name="current", host=tenant_db.db_host, port=tenant_db.db_port),
+            drop_source=drop_source,
+        )
+
+    @staticmethod
+    def relocate_tenant(tenant_db: TenantDatabase, placement: Placement, *, drop_source: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        Moves a tenant's storage to another Postgres host, keeping its
+        isolation mode (see ``_switch_storage``).
+        """
+        if (placement.host, placement.port) == (tenant_db.db_host, tenant_db.db_port):
+            raise ValidationError({"db_host": f"Tenant is already on {placement.host}:{placement.port}"})
+
+        return TenantStorageService._switch_storage(
+            tenant_db,
+            tenant_db.isolation_mode,
+            placement,
+            drop_source=drop_source,
+        )
+
+    @staticmethod
+    def _switch_storage(
+        tenant_db: TenantDatabase,
+        isolation_mode: str,
+        placement: Placement,
+        *,
+        drop_source: bool,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Copies a tenant onto new storage while it stays online.
+
+        1. Provision and migrate the target under a temporary alias.
+        2. Stream every table across while the tenant keeps serving.
+        3. Mark the tenant read-only: requests get a 503 and tenant DB
+           sessions checked out from then on reject writes. Wait for
+           every worker's resolver cache (TENANT_CACHE local TTL) to
+           see it, even one that missed the invalidation, plus
+           ``drain_seconds`` for writes already in flight.
+        4. Catch up: re-copy rows changed or deleted since step 2.
+        5. Flip TenantDatabase and clear read-only in one transaction;
+           the post_save signals invalidate resolutions and registry
+           aliases in every worker.
+
+        On failure the target storage is dropped and the tenant is made
+        writable again on its old storage.
+
+        Time: O(R + M) where R = rows, M = migrations
+        Space: O(R) primary keys during catch-up
+        """
+        cfg = getattr(settings, "TENANT_RELOCATION", {})
+        batch_size = int(cfg.get("batch_size", 1000))
+        tenant = tenant_db.tenant
+
+        # Private aliases: the tenant's own alias is evicted by the
+        # invalidations this move triggers.
+        alias = tenant_db_alias(tenant.id)
+        source_alias, target_alias = f"{alias}_move_source", f"{alias}_move_target"
+        source = tenant_db.connection_config()
+        fields, migrated = TenantStorageService.provision(tenant, isolation_mode, placement)
+        target = TenantDatabase(tenant=tenant, **fields).connection_config()
+
+        tenant_connections.register(source_alias, source)
+        tenant_connections.register(target_alias, target)
+        try:
+            if not migrated:
+                migrate_tenant_database(target_alias)
+            copied = copy_tenant_data(source_alias, target_alias, batch_size=batch_size)
+
+            TenantStorageService._set_read_only(tenant, True)
+            time.sleep(TenantStorageService.drain_seconds())
+            caught_up = sync_tenant_data(source_alias, target_alias, batch_size=batch_size)
+
+            with transaction.atomic():
+                for field, value in fields.items():
+                    setattr(tenant_db, field, value)
+                tenant_db.save(update_fields=list(fields))
+                TenantStorageService._set_read_only(tenant, False)
+        except Exception:
+            tenant_connections.evict(target_alias)
+            TenantStorageService._set_read_only(tenant, False)
+            TenantStorageService.drop_storage(target)
+            raise
+        finally:
+            tenant_connections.evict(source_alias)
+            tenant_connections.evict(target_alias)
+
+        if drop_source:
+            TenantStorageService.drop_storage(source)
+
+        return {"copied": copied, "caught_up": caught_up}
+
+    @staticmethod
+    def drain_seconds() -> float:
+        """
+        How long a tenant stays read-only before the final catch-up.
+        """
+        local_ttl = float(getattr(settings, "TENANT_CACHE", {}).get("local_ttl_seconds", 30))
+        return local_ttl + float(getattr(settings, "TENANT_RELOCATION", {}).get("drain_seconds", 2))
+
+    @staticmethod
+    def _set_read_only(tenant: Tenant, read_only: bool) -> None:
+        if tenant.is_read_only != read_only:
+            tenant.is_read_only = read_only
+            tenant.save(update_fields=["is_read_only"])
+
+    @staticmethod
+    def drop_storage(config: Dict[str, str]) -> None:
+        """
+        Drops the database or schema a connection config points at.
+        """
+        drop_postgres_storage(
+            db_name=config["NAME"],
+            schema_name=config.get("TENANT_SCHEMA", ""),
+            user=settings.DB_SUPERUSER,
+            password=settings.DB_SUPERUSER_PASSWORD,
+            host=config["HOST"],
+            port=config["PORT"],
+        )
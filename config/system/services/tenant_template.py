@@ -0,0 +1,179 @@
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from psycopg2 import errors, sql
+
+from system.db_registry import tenant_connections
+from system.services.db_utils import postgres_admin_connection
+from system.services.migration_utils import migrate_tenant_database, tenant_migration_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class TenantTemplateService:
+    """
+    Fully migrated template database, one per Postgres host.
+
+    New tenant databases are cloned from it with ``CREATE DATABASE ...
+    TEMPLATE`` instead of being migrated from scratch. The template's
+    COMMENT holds the tenant migration fingerprint it was built with;
+    a template whose fingerprint differs from the code's is never
+    cloned, and a rebuild is queued instead.
+    """
+
+    REBUILD_LOCK_PREFIX = "tenant:template:rebuild"
+
+    @staticmethod
+    def template_name() -> str:
+        return getattr(settings, "TENANT_TEMPLATE_DATABASE", {}).get("NAME", "tenant_template")
+
+    @staticmethod
+    def enabled() -> bool:
+        return getattr(settings, "TENANT_TEMPLATE_DATABASE", {}).get("enabled", True)
+
+    @staticmethod
+    def _connect(host: str, port: str):
+        return postgres_admin_connection(
+            dbname="postgres",
+            user=settings.DB_SUPERUSER,
+            password=settings.DB_SUPERUSER_PASSWORD,
+            host=host,
+            port=port,
+        )
+
+    @staticmethod
+    def template_fingerprint(host: str, port: str) -> Optional[str]:
+        """
+        Fingerprint stamped on the host's template, None if it has none.
+        """
+        conn = TenantTemplateService._connect(host, port)
+        try:
+            with conn.cursor() as cursor:
+                return TenantTemplateService._read_fingerprint(cursor)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _read_fingerprint(cursor) -> Optional[str]:
+        cursor.execute(
+            "SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = %s",
+            [TenantTemplateService.template_name()],
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def clone(db_name: str, *, host: str, port: str) -> bool:
+        """
+        Creates ``db_name`` from the host's template if it is current.
+
+        Returns False (and queues a rebuild) when the template is
+        missing, stale or busy; the caller then migrates from scratch.
+
+        Time: O(1) round trips, the copy itself is server-side
+        Space: O(1)
+        """
+        if not TenantTemplateService.enabled():
+            return False
+
+        conn = TenantTemplateService._connect(host, port)
+        try:
+            with conn.cursor() as cursor:
+                if TenantTemplateService._read_fingerprint(cursor) != tenant_migration_fingerprint():
+                    TenantTemplateService.request_rebuild(host, port)
+                    return False
+
+                cursor.execute(
+                    sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                        sql.Identifier(db_name),
+                        sql.Identifier(TenantTemplateService.template_name()),
+                    )
+                )
+                return True
+        except (errors.ObjectInUse, errors.InvalidCatalogName):
+            # Template being rebuilt/renamed right now.
+            logger.info("Tenant template on %s:%s unavailable, migrating instead", host, port)
+            return False
+        finally:
+            conn.close()
+
+    @staticmethod
+    def request_rebuild(host: str, port: str) -> None:
+        """
+        Queues one rebuild per host (deduplicated through the cache).
+        """
+        from system.tasks import rebuild_tenant_template
+
+        try:
+            if cache.add(f"{TenantTemplateService.REBUILD_LOCK_PREFIX}:{host}:{port}", 1, 600):
+                rebuild_tenant_template.delay(host=host, port=port)
+        except Exception:
+            logger.warning("Could not queue tenant template rebuild for %s:%s", host, port)
+
+    @staticmethod
+    def rebuild(host: str, port: str) -> str:
+        """
+        Builds a fresh template next to the old one, then swaps it in.
+
+        Signups during the build keep cloning the old template if it is
+        still current, or fall back to migrating.
+
+        Time: O(M) where M = number of migrations
+        Space: O(1)
+        """
+        name = TenantTemplateService.template_name()
+        building = f"{name}_building"
+        fingerprint = tenant_migration_fingerprint()
+
+        conn = TenantTemplateService._connect(host, port)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(building)))
+                cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(building)))
+
+            alias = f"{building}_{host}_{port}"
+            tenant_connections.register(
+                alias,
+                {
+                    "NAME": building,
+                    "USER": settings.DB_SUPERUSER,
+                    "PASSWORD": settings.DB_SUPERUSER_PASSWORD,
+                    "HOST": host,
+                    "PORT": port,
+                    # A pooled session would block CREATE DATABASE ... TEMPLATE.
+                    "POOL": False,
+                },
+            )
+            try:
+                migrate_tenant_database(alias)
+            finally:
+                tenant_connections.evict(alias)
+
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    sql.SQL("COMMENT ON DATABASE {} IS %s").format(sql.Identifier(building)),
+                    [fingerprint],
+                )
+                cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [name])
+                if cursor.fetchone():
+                    cursor.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false").format(sql.Identifier(name)))
+                    cursor.execute(sql.SQL("DROP DATABASE {} WITH (FORCE)").format(sql.Identifier(name)))
+                cursor.execute(
+                    sql.SQL("ALTER DATABASE {} RENAME TO {}").format(sql.Identifier(building), sql.Identifier(name))
+                )
+                cursor.execute(
+                    sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false").format(
+                        sql.Identifier(name)
+                    )
+                )
+        finally:
+            conn.close()
+
+        try:
+            cache.delete(f"{TenantTemplateService.REBUILD_LOCK_PREFIX}:{host}:{port}")
+        except Exception:
+            pass
+
+        return fingerprint
@@ -0,0 +1,182 @@
+import logging
+import uuid
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from system.db_registry import tenant_connections
+from system.models import WarmTenantDatabase
+from system.services.db_utils import create_postgres_database, drop_postgres_storage
+from system.services.migration_utils import migrate_tenant_database, tenant_migration_fingerprint
+from system.services.placement import Placement, PlacementService
+from system.services.tenant_template import TenantTemplateService
+
+logger = logging.getLogger(__name__)
+
+
+def _config() -> Dict:
+    return getattr(settings, "TENANT_WARM_POOL", {})
+
+
+class WarmPoolService:
+    """
+    Keeps ``size`` migrated, unassigned tenant databases ready on every
+    host, so a signup only claims a row instead of waiting on DDL.
+
+    Claims are rows locked with ``SKIP LOCKED`` inside the caller's
+    transaction: concurrent signups take different databases, and a
+    signup that rolls back puts its database back in the pool.
+    """
+
+    LOCK_KEY = "tenant:warm_pool:replenish"
+
+    @staticmethod
+    def enabled() -> bool:
+        return _config().get("enabled", True)
+
+    @staticmethod
+    def claim(placement: Placement) -> Optional[str]:
+        """
+        Takes the oldest current warm database on ``placement``'s host
+        and returns its name, or None if the pool there is empty.
+
+        Time: O(log P) where P = pooled databases (indexed lookup)
+        Space: O(1)
+        """
+        if not WarmPoolService.enabled():
+            return None
+
+        with transaction.atomic():
+            warm = (
+                WarmTenantDatabase.objects.select_for_update(skip_locked=True)
+                .filter(
+                    db_host=placement.host,
+                    db_port=placement.port,
+                    fingerprint=tenant_migration_fingerprint(),
+                )
+                .order_by("created_at", "pk")
+                .first()
+            )
+            if warm is None:
+                return None
+            warm.delete()
+
+        return warm.db_name
+
+    @staticmethod
+    def depth() -> Dict[tuple, Dict[str, int]]:
+        """
+        Ready and stale pooled databases per (host, port).
+        """
+        fingerprint = tenant_migration_fingerprint()
+        report = {server: {"ready": 0, "stale": 0} for server in PlacementService.servers()}
+        for warm in WarmTenantDatabase.objects.only("db_host", "db_port", "fingerprint"):
+            counts = report.setdefault((warm.db_host, warm.db_port), {"ready": 0, "stale": 0})
+            counts["ready" if warm.fingerprint == fingerprint else "stale"] += 1
+        return report
+
+    @staticmethod
+    def replenish() -> Dict[str, int]:
+        """
+        Drops pooled databases built for older migrations and tops each
+        host back up to ``size``. Runs once at a time across workers.
+
+        Returns databases created per "host:port".
+
+        Time: O(H * N) database creations where H = hosts, N = size
+        Space: O(H)
+        """
+        if not WarmPoolService.enabled():
+            return {}
+
+        try:
+            acquired = cache.add(WarmPoolService.LOCK_KEY, 1, int(_config().get("lock_seconds", 600)))
+        except Exception:
+            acquired = True
+        if not acquired:
+            return {}
+
+        size = int(_config().get("size", 5))
+        fingerprint = tenant_migration_fingerprint()
+        created = {}
+        try:
+            for host, port in PlacementService.servers():
+                WarmPoolService._drop_stale(host, port, fingerprint)
+                ready = WarmTenantDatabase.objects.filter(
+                    db_host=host, db_port=port, fingerprint=fingerprint
+                ).count()
+                for _ in range(max(size - ready, 0)):
+                    WarmPoolService._create(host, port, fingerprint)
+                created[f"{host}:{port}"] = max(size - ready, 0)
+        finally:
+            try:
+                cache.delete(WarmPoolService.LOCK_KEY)
+            except Exception:
+                pass
+
+        return created
+
+    @staticmethod
+    def _create(host: str, port: str, fingerprint: str) -> WarmTenantDatabase:
+        db_name = f"tenant_warm_{uuid.uuid4().hex}"
+
+        if not TenantTemplateService.clone(db_name, host=host, port=port):
+            create_postgres_database(
+                db_name=db_name,
+                user=settings.DB_SUPERUSER,
+                password=settings.DB_SUPERUSER_PASSWORD,
+                host=host,
+                port=port,
+            )
+            alias = f"{db_name}_warm"
+            tenant_connections.register(
+                alias,
+                {
+                    "NAME": db_name,
+                    "USER": settings.DB_SUPERUSER,
+                    "PASSWORD": settings.DB_SUPERUSER_PASSWORD,
+                    "HOST": host,
+                    "PORT": port,
+                    "POOL": False,
+                },
+            )
+            try:
+                migrate_tenant_database(alias)
+            except Exception:
+                tenant_connections.evict(alias)
+                WarmPoolService._drop(db_name, host, port)
+                raise
+            tenant_connections.evict(alias)
+
+        return WarmTenantDatabase.objects.create(
+            db_name=db_name,
+            db_host=host,
+            db_port=port,
+            fingerprint=fingerprint,
+        )
+
+    @staticmethod
+    def _drop_stale(host: str, port: str, fingerprint: str) -> None:
+        stale = WarmTenantDatabase.objects.filter(db_host=host, db_port=port).exclude(fingerprint=fingerprint)
+        for pk in stale.values_list("pk", flat=True):
+            with transaction.atomic():
+                # Skip rows a signup is claiming right now.
+                warm = WarmTenantDatabase.objects.select_for_update(skip_locked=True).filter(pk=pk).first()
+                if warm is None:
+                    continue
+                WarmPoolService._drop(warm.db_name, host, port)
+                warm.delete()
+                logger.info("Dropped stale warm tenant database %s on %s:%s", warm.db_name, host, port)
+
+    @staticmethod
+    def _drop(db_name: str, host: str, port: str) -> None:
+        drop_postgres_storage(
+            db_name=db_name,
+            schema_name="",
+            user=settings.DB_SUPERUSER,
+            password=settings.DB_SUPERUSER_PASSWORD,
+            host=host,
+            port=port,
+        )
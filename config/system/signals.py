@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from system.models import Plan, Tenant, TenantDatabase
+from system.tenant_cache import tenant_resolver
+
+
+def _invalidate_on_commit(tenant_id, using) -> None:
+    # Invalidate after commit so a concurrent request cannot re-cache
+    # the pre-change row between our invalidation and the commit.
+    transaction.on_commit(lambda: tenant_resolver.invalidate(tenant_id), using=using)
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_tenant(sender, instance, using, **kwargs):
+    if kwargs.get("created"):
+        # Only after commit: a worker rebuilding its Bloom filter before
+        # then would not see the row and would reject the new tenant.
+        transaction.on_commit(
+            lambda: tenant_resolver.note_tenant_created(instance.id),
+            using=using,
+        )
+    _invalidate_on_commit(instance.id, using)
+
+
+@receiver(post_save, sender=TenantDatabase)
+@receiver(post_delete, sender=TenantDatabase)
+def invalidate_tenant_database(sender, instance, using, **kwargs):
+    _invalidate_on_commit(instance.tenant_id, using)
+
+
+@receiver(post_save, sender=Plan)
+@receiver(pre_delete, sender=Plan)
+def invalidate_plan_tenants(sender, instance, using, **kwargs):
+    # Resolutions carry the plan's limits. Before delete, because the
+    # SET NULL on Tenant.plan is a queryset update that sends no signals.
+    for tenant_id in Tenant.objects.using(using).filter(plan=instance).values_list("id", flat=True):
+        _invalidate_on_commit(tenant_id, using)
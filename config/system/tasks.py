@@ -0,0 +1,73 @@
+from celery import Task, shared_task
+from rest_framework.exceptions import ValidationError
+
+from system.models import TenantProvisioning
+from system.services.tenant_provisioning import TenantProvisioningService
+from system.services.tenant_template import TenantTemplateService
+from system.services.warm_pool import WarmPoolService
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_kwargs={"max_retries": 3})
+def rebuild_tenant_template(self, *, host: str, port: str) -> str:
+    return TenantTemplateService.rebuild(host, port)
+
+
+@shared_task(bind=True)
+def replenish_warm_pool(self) -> dict:
+    return WarmPoolService.replenish()
+
+
+class TenantProvisioningTask(Task):
+    """
+    Signup stage: retried with backoff, and compensated
+    (TenantProvisioningService.fail) once retries are exhausted.
+    """
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        TenantProvisioningService.fail(kwargs["provisioning_id"], exc)
+
+
+PROVISIONING_TASK_OPTIONS = {
+    "bind": True,
+    "base": TenantProvisioningTask,
+    "autoretry_for": (Exception,),
+    # Bad input (e.g. the admin username got taken) will not fix itself.
+    "dont_autoretry_for": (ValidationError,),
+    "retry_backoff": True,
+    "retry_kwargs": {"max_retries": 3},
+}
+
+
+def _run_stage(provisioning_id: str) -> str:
+    provisioning = TenantProvisioning.objects.select_related("tenant").get(pk=provisioning_id)
+    TenantProvisioningService.run_stage(provisioning)
+    TenantProvisioningService.dispatch(provisioning)
+    return provisioning.state
+
+
+@shared_task(**PROVISIONING_TASK_OPTIONS)
+def provision_tenant_database(self, *, provisioning_id: str) -> str:
+    return _run_stage(provisioning_id)
+
+
+@shared_task(**PROVISIONING_TASK_OPTIONS)
+def migrate_tenant(self, *, provisioning_id: str) -> str:
+    return _run_stage(provisioning_id)
+
+
+@shared_task(**PROVISIONING_TASK_OPTIONS)
+def seed_tenant_admin(self, *, provisioning_id: str) -> str:
+    return _run_stage(provisioning_id)
+
+
+@shared_task(**PROVISIONING_TASK_OPTIONS)
+def mirror_tenant_admin(self, *, provisioning_id: str) -> str:
+    return _run_stage(provisioning_id)
+
+
+PROVISIONING_STAGE_TASKS = {
+    TenantProvisioning.State.PENDING: provision_tenant_database,
+    TenantProvisioning.State.DATABASE_CREATED: migrate_tenant,
+    TenantProvisioning.State.MIGRATED: seed_tenant_admin,
+    TenantProvisioning.State.ADMIN_SEEDED: mirror_tenant_admin,
+}
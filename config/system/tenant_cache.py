@@ -0,0 +1,351 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+
+from system.db_registry import tenant_connections, tenant_db_alias
+from system.bloom_filter import BloomFilter
+from system.lru_cache import LRUCache
+from system.models import Tenant, TenantDatabase
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ResolvedTenant:
+    """
+    Tenant id, active flag, DB settings and plan rate limit as resolved
+    from the master DB.
+    """
+    tenant_id: UUID
+    is_active: bool
+    db_alias: str
+    db_config: Dict[str, str]
+    is_read_only: bool = False
+    replicas: Tuple[Dict[str, str], ...] = ()
+    # (requests, window_seconds) of the tenant's plan; None for the defaults
+    rate_limit: Optional[Tuple[int, int]] = None
+
+    def to_cache(self) -> Dict:
+        return {
+            "tenant_id": str(self.tenant_id),
+            "is_active": self.is_active,
+            "is_read_only": self.is_read_only,
+            "db_config": self.db_config,
+            "replicas": list(self.replicas),
+            "rate_limit": list(self.rate_limit) if self.rate_limit else None,
+        }
+
+    @classmethod
+    def from_cache(cls, data: Dict) -> "ResolvedTenant":
+        tenant_id = UUID(data["tenant_id"])
+        return cls(
+            tenant_id=tenant_id,
+            is_active=data["is_active"],
+            db_alias=tenant_db_alias(tenant_id),
+            db_config={**data["db_config"], "TENANT_ID": str(tenant_id)},
+            is_read_only=data.get("is_read_only", False),
+            replicas=tuple(data.get("replicas", ())),
+            rate_limit=tuple(data["rate_limit"]) if data.get("rate_limit") else None,
+        )
+
+    @classmethod
+    def from_tenant_db(cls, tenant_db: TenantDatabase) -> "ResolvedTenant":
+        plan = tenant_db.tenant.plan
+        return cls(
+            tenant_id=tenant_db.tenant_id,
+            is_active=tenant_db.tenant.is_active,
+            db_alias=tenant_db_alias(tenant_db.tenant_id),
+            # TENANT_ID makes the tenant backend enforce is_read_only.
+            db_config={**tenant_db.connection_config(), "TENANT_ID": str(tenant_db.tenant_id)},
+            is_read_only=tenant_db.tenant.is_read_only,
+            replicas=tuple(tenant_db.replicas or ()),
+            rate_limit=(plan.requests, plan.window_seconds) if plan else None,
+        )
+
+
+class TenantResolver:
+    """
+    Two-level cache of tenant UUID -> ResolvedTenant.
+
+    L1 is a per-process LRU, L2 is the shared Django cache (Redis), and
+    the master DB is only queried when both miss. Invalidations are
+    broadcast over Redis pub/sub so every worker drops its L1 entry.
+
+    Unknown IDs are rejected without touching Postgres: a per-process
+    Bloom filter of valid tenant IDs filters out IDs that were never
+    issued, and IDs that slip through are remembered in a short-TTL
+    negative cache (local and shared).
+    """
+
+    KEY_PREFIX = "tenant:resolved"
+    GENERATION_KEY = "tenant:bloom:generation"
+    MISSING = {"missing": True}
+
+    def __init__(
+        self,
+        *,
+        local_max_size: int,
+        local_ttl_seconds: float,
+        shared_ttl_seconds: int,
+        channel: Optional[str],
+        negative_ttl_seconds: int = 60,
+        bloom_error_rate: float = 0.001,
+        bloom_rebuild_seconds: float = 600,
+    ):
+        self._local = LRUCache(max_size=local_max_size, ttl_seconds=local_ttl_seconds)
+        self._missing = LRUCache(max_size=local_max_size, ttl_seconds=negative_ttl_seconds)
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.channel = channel
+
+        self.bloom_error_rate = bloom_error_rate
+        self.bloom_rebuild_seconds = bloom_rebuild_seconds
+        self._bloom = None
+        self._bloom_generation = None
+        self._bloom_built_at = 0.0
+        self._bloom_lock = threading.Lock()
+
+        self.shared_hits = 0
+        self.db_lookups = 0
+        self.negative_hits = 0
+        self.bloom_rejections = 0
+        self.bloom_rebuilds = 0
+
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "TenantResolver":
+        cfg = getattr(settings, "TENANT_CACHE", {})
+        return cls(
+            local_max_size=int(cfg.get("local_max_size", 1000)),
+            local_ttl_seconds=float(cfg.get("local_ttl_seconds", 30)),
+            shared_ttl_seconds=int(cfg.get("shared_ttl_seconds", 300)),
+            channel=cfg.get("invalidation_channel", "tenant:invalidate"),
+            negative_ttl_seconds=int(cfg.get("negative_ttl_seconds", 60)),
+            bloom_error_rate=float(cfg.get("bloom_error_rate", 0.001)),
+            bloom_rebuild_seconds=float(cfg.get("bloom_rebuild_seconds", 600)),
+        )
+
+    def _key(self, tenant_id: UUID) -> str:
+        return f"{self.KEY_PREFIX}:{tenant_id}"
+
+    def resolve(self, tenant_id: UUID) -> Optional[ResolvedTenant]:
+        """
+        Returns the tenant's resolution, or None if it does not exist.
+
+        Time: O(1) on cache hit or rejection, one master-DB query on miss
+        Space: O(1)
+        """
+        self._ensure_listener()
+
+        resolved = self._local.get(tenant_id)
+        if resolved is not None:
+            return resolved
+
+        if tenant_id in self._missing:
+            self.negative_hits += 1
+            return None
+
+        if not self._might_exist(tenant_id):
+            self.bloom_rejections += 1
+            self._missing.set(tenant_id, True)
+            return None
+
+        try:
+            data = cache.get(self._key(tenant_id))
+        except Exception:
+            data = None
+
+        if data == self.MISSING:
+            self.negative_hits += 1
+            self._missing.set(tenant_id, True)
+            return None
+
+        if data is not None:
+            self.shared_hits += 1
+            resolved = ResolvedTenant.from_cache(data)
+            self._local.set(tenant_id, resolved)
+            return resolved
+
+        self.db_lookups += 1
+        try:
+            tenant_db = TenantDatabase.objects.select_related("tenant__plan").get(
+                tenant_id=tenant_id,
+            )
+        except TenantDatabase.DoesNotExist:
+            self._missing.set(tenant_id, True)
+            try:
+                cache.set(self._key(tenant_id), self.MISSING, self.negative_ttl_seconds)
+            except Exception:
+                pass
+            return None
+
+        resolved = ResolvedTenant.from_tenant_db(tenant_db)
+        self._local.set(tenant_id, resolved)
+
+        try:
+            cache.set(self._key(tenant_id), resolved.to_cache(), self.shared_ttl_seconds)
+        except Exception:
+            pass
+
+        return resolved
+
+    def _might_exist(self, tenant_id: UUID) -> bool:
+        """
+        False only if the Bloom filter is current and has never seen the ID.
+
+        The filter cannot see tenants created by other processes, so a
+        negative answer is re-checked against the shared generation
+        counter (bumped on every tenant creation) and the filter is
+        rebuilt when it is behind. If Redis is unreachable we cannot
+        tell, and fall through to the normal lookup path.
+        """
+        if self._bloom is None or time.monotonic() - self._bloom_built_at > self.bloom_rebuild_seconds:
+            self._rebuild_bloom(self._shared_generation())
+
+        if self._bloom.might_contain(tenant_id.bytes):
+            return True
+
+        generation = self._shared_generation()
+        if generation is None:
+            return True
+
+        if generation != self._bloom_generation:
+            self._rebuild_bloom(generation)
+            return self._bloom.might_contain(tenant_id.bytes)
+
+        return False
+
+    def _shared_generation(self) -> Optional[int]:
+        try:
+            return cache.get_or_set(self.GENERATION_KEY, 0, None)
+        except Exception:
+            return None
+
+    def _rebuild_bloom(self, generation: Optional[int]) -> None:
+        """
+        Time: O(T) where T = number of tenants
+        Space: O(T)
+        """
+        with self._bloom_lock:
+            ids = list(Tenant.objects.values_list("id", flat=True))
+            self._bloom = BloomFilter.from_items(
+                (tenant_id.bytes for tenant_id in ids),
+                capacity=max(len(ids) * 2, 1024),
+                error_rate=self.bloom_error_rate,
+            )
+            self._bloom_generation = generation
+            self._bloom_built_at = time.monotonic()
+            self.bloom_rebuilds += 1
+
+    def note_tenant_created(self, tenant_id: UUID) -> None:
+        """
+        Adds a new tenant to the local filter and tells other workers
+        their filters are stale.
+        """
+        if self._bloom is not None:
+            self._bloom.add(tenant_id.bytes)
+
+        try:
+            cache.add(self.GENERATION_KEY, 0, None)
+            cache.incr(self.GENERATION_KEY)
+        except Exception:
+            pass
+
+    def invalidate(self, tenant_id: UUID) -> None:
+        """
+        Drops ``tenant_id`` from L2 and from L1 in every worker.
+        """
+        try:
+            cache.delete(self._key(tenant_id))
+        except Exception:
+            pass
+
+        self.invalidate_local(tenant_id)
+        self._publish(tenant_id)
+
+    def invalidate_local(self, tenant_id: UUID) -> None:
+        self._local.pop(tenant_id)
+        self._missing.pop(tenant_id)
+        tenant_connections.evict_tenant(tenant_db_alias(tenant_id))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self._local.stats(),
+            "shared_hits": self.shared_hits,
+            "db_lookups": self.db_lookups,
+            "negative_hits": self.negative_hits,
+            "bloom_rejections": self.bloom_rejections,
+            "bloom_rebuilds": self.bloom_rebuilds,
+            "short_circuited": self.negative_hits + self.bloom_rejections,
+        }
+
+    def _publish(self, tenant_id: UUID) -> None:
+        if not self.channel:
+            return
+        try:
+            _redis_client().publish(self.channel, str(tenant_id))
+        except Exception:
+            logger.warning("Could not broadcast invalidation for tenant %s", tenant_id)
+
+    def _ensure_listener(self) -> None:
+        """
+        Starts the pub/sub listener once per process (re-checked after fork).
+        """
+        if not self.channel or self._listener_pid == os.getpid():
+            return
+
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            threading.Thread(
+                target=self._listen,
+                name="tenant-cache-invalidation",
+                daemon=True,
+            ).start()
+
+    def _listen(self) -> None:
+        backoff = 1
+        while True:
+            try:
+                pubsub = _redis_client(socket_timeout=None).pubsub(
+                    ignore_subscribe_messages=True,
+                )
+                pubsub.subscribe(self.channel)
+                backoff = 1
+
+                for message in pubsub.listen():
+                    try:
+                        tenant_id = UUID(message["data"].decode())
+                    except (AttributeError, ValueError):
+                        continue
+                    self.invalidate_local(tenant_id)
+            except Exception:
+                # Without the listener L1 entries still expire after
+                # local_ttl_seconds; clear them now since we may have
+                # missed invalidations while disconnected.
+                self._local.clear()
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+def _redis_client(**overrides) -> redis.Redis:
+    options = {"socket_connect_timeout": 1, "socket_timeout": 1}
+    options.update(overrides)
+    return redis.from_url(
+        getattr(settings, "REDIS_URL", "redis://localhost:6379/1"),
+        **options,
+    )
+
+
+tenant_resolver = TenantResolver.from_settings()
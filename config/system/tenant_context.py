@@ -25,7 +25,7 @@
 
 # def get_current_tenant_db() -> Optional[str]:
 #     return _current_tenant_db.get()
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
 from contextlib import contextmanager
 from typing import Optional
 from django.db import connections
@@ -37,8 +37,12 @@ _current_tenant_db: ContextVar[Optional[str]] = ContextVar(
 )
 
 
-def set_current_tenant_db(db_alias: Optional[str]) -> None:
-    _current_tenant_db.set(db_alias)
+def set_current_tenant_db(db_alias: Optional[str]) -> Token:
+    return _current_tenant_db.set(db_alias)
+
+
+def reset_current_tenant_db(token: Token) -> None:
+    _current_tenant_db.reset(token)
 
 
 def get_current_tenant_db() -> Optional[str]:
@@ -0,0 +1,83 @@
+import time
+import uuid
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from system.concurrency_limit import ConcurrencyLimiter
+from system.middleware_rate_limit import TenantConcurrencyLimitMiddleware
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+
+def test_caps_in_flight_until_released(redis_client):
+    limiter = ConcurrencyLimiter(redis_client, initial=2, maximum=2)
+
+    first, second, third = (limiter.acquire("tenant:a") for _ in range(3))
+
+    assert (first.acquired, second.acquired, third.acquired) == (True, True, False)
+    assert limiter.acquire("tenant:b").acquired
+
+    limiter.release(first, 0.01)
+    assert limiter.acquire("tenant:a").acquired
+
+
+def test_limit_adapts_to_latency(redis_client):
+    limiter = ConcurrencyLimiter(
+        redis_client, initial=4, minimum=1, maximum=6, target_latency=0.5, backoff=0.5, lease_seconds=0.1
+    )
+
+    # A burst of slow requests cuts the cap once per lease period.
+    for _ in range(3):
+        limit = limiter.release(limiter.acquire("tenant:a"), 2.0)
+    assert limit == 2
+    time.sleep(0.15)
+    assert limiter.release(limiter.acquire("tenant:a"), 2.0) == 1
+
+    for _ in range(20):
+        limit = limiter.release(limiter.acquire("tenant:a"), 0.01)
+    assert 1 < limit <= 6
+
+
+def test_expired_leases_free_their_slot(redis_client):
+    limiter = ConcurrencyLimiter(redis_client, initial=1, lease_seconds=0.05)
+
+    assert limiter.acquire("tenant:a").acquired  # never released
+    time.sleep(0.1)
+
+    assert limiter.acquire("tenant:a").acquired
+
+
+def _request(tenant_id):
+    token = AccessToken()
+    token["tenant_id"] = str(tenant_id)
+    return RequestFactory().get("/api/v1/tasks/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+def test_middleware_sheds_busy_tenant_only(redis_client):
+    busy, quiet = uuid.uuid4(), uuid.uuid4()
+    inner = {}
+
+    def view(request):
+        if request._token_tenant_id == busy and not inner:
+            # While this request is in flight:
+            inner["busy"] = middleware(_request(busy))
+            inner["quiet"] = middleware(_request(quiet))
+        return HttpResponse()
+
+    middleware = TenantConcurrencyLimitMiddleware(view)
+    middleware.limiter = ConcurrencyLimiter(redis_client, initial=1, maximum=1)
+
+    assert middleware(_request(busy)).status_code == 200
+    assert inner["busy"].status_code == 503
+    assert inner["busy"]["Retry-After"] == "1"
+    assert inner["quiet"].status_code == 200
+    # The outer request released its slot.
+    assert middleware(_request(busy)).status_code == 200
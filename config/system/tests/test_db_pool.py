@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from django.db import connection, connections
+
+from system.db_pool import PoolExhausted, TenantPoolManager, tenant_pools
+from system.db_registry import TenantConnectionRegistry
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.rollbacks = 0
+        self.status = 0
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = 0
+
+    def close(self):
+        self.closed = 1
+
+
+def test_released_connections_are_reused():
+    pools = TenantPoolManager(max_total=4, max_size=2)
+
+    first = pools.acquire("tenant_a", FakeConnection)
+    first.status = 2  # left inside a transaction
+    pools.release(first)
+    again = pools.acquire("tenant_a", lambda: pytest.fail("should reuse"))
+
+    assert again is first
+    assert first.rollbacks == 1
+    assert pools.stats()["created"] == 1
+    assert pools.stats()["reused"] == 1
+
+
+def test_global_budget_evicts_least_recently_used_idle_pool():
+    pools = TenantPoolManager(max_total=2, max_size=2)
+
+    old = pools.acquire("tenant_old", FakeConnection)
+    recent = pools.acquire("tenant_recent", FakeConnection)
+    pools.release(old)
+    pools.release(recent)
+
+    pools.acquire("tenant_new", FakeConnection)
+
+    assert old.closed and not recent.closed
+    assert pools.stats()["open"] == 2
+    assert pools.stats()["evicted"] == 1
+
+
+def test_exhausted_budget_waits_then_raises():
+    pools = TenantPoolManager(max_total=1, max_size=1, acquire_timeout=0.05)
+    held = pools.acquire("tenant_a", FakeConnection)
+
+    with pytest.raises(PoolExhausted):
+        pools.acquire("tenant_b", FakeConnection)
+
+    threading.Timer(0.01, pools.release, [held]).start()
+    pools.acquire_timeout = 1
+    assert pools.acquire("tenant_a", FakeConnection) is held
+    assert pools.stats()["timeouts"] == 1
+
+
+def test_closed_pool_closes_checked_out_connection_on_release():
+    pools = TenantPoolManager(max_total=2, max_size=2)
+    conn = pools.acquire("tenant_a", FakeConnection)
+
+    pools.close_pool("tenant_a")
+    assert pools.stats()["open"] == 1
+
+    pools.release(conn)
+    assert conn.closed
+    assert pools.stats()["open"] == 0
+
+
+def test_pooled_backend_reuses_connection_across_requests(django_db_setup, django_db_blocker):
+    registry = TenantConnectionRegistry(max_aliases=10, ttl_seconds=None)
+    registry.register("tenant_pooled", {"NAME": connection.settings_dict["NAME"]})
+
+    with django_db_blocker.unblock():
+        _assert_same_backend_across_requests("tenant_pooled")
+
+    registry.clear()
+    assert tenant_pools.stats()["pools"] == 0
+
+
+def _assert_same_backend_across_requests(alias):
+
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid()")
+        first_pid = cursor.fetchone()[0]
+    connections[alias].close()
+
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid()")
+        assert cursor.fetchone()[0] == first_pid
+    connections[alias].close()
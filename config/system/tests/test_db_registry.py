@@ -0,0 +1,78 @@
+import pytest
+from django.db import connections
+from django.test import override_settings
+
+from system.db_registry import TenantConnectionRegistry, ensure_tenant_db_registered, tenant_connections
+from system.models import Tenant, TenantDatabase
+from system.tenant_cache import tenant_resolver
+
+
+def _config(name):
+    return {"NAME": name, "HOST": "localhost", "PORT": "5432"}
+
+
+def test_registry_evicts_least_recently_used_alias():
+    registry = TenantConnectionRegistry(max_aliases=2, ttl_seconds=None)
+
+    registry.register("tenant_a", _config("a"))
+    registry.register("tenant_b", _config("b"))
+    registry.get_or_register("tenant_a", lambda: pytest.fail("should be a hit"))
+    registry.register("tenant_c", _config("c"))
+
+    assert "tenant_a" in connections.databases
+    assert "tenant_b" not in connections.databases
+    assert "tenant_c" in connections.databases
+    assert registry.stats()["evictions"] == 1
+    assert registry.stats()["hits"] == 1
+
+    registry.clear()
+    assert "tenant_a" not in connections.databases
+
+
+def test_registry_expires_aliases_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("system.lru_cache.time.monotonic", lambda: now[0])
+    registry = TenantConnectionRegistry(max_aliases=10, ttl_seconds=60)
+
+    registry.register("tenant_ttl", _config("ttl"))
+    now[0] += 61
+
+    loads = []
+    registry.get_or_register("tenant_ttl", lambda: loads.append(1) or _config("ttl2"))
+
+    assert loads == [1]
+    assert connections.databases["tenant_ttl"]["NAME"] == "ttl2"
+    assert registry.stats()["expirations"] == 1
+    registry.clear()
+
+
+def test_reregistering_alias_keeps_new_config():
+    registry = TenantConnectionRegistry(max_aliases=10, ttl_seconds=None)
+
+    registry.register("tenant_moved", _config("old"))
+    registry.register("tenant_moved", _config("new"))
+
+    assert connections.databases["tenant_moved"]["NAME"] == "new"
+    registry.clear()
+
+
+@pytest.mark.django_db
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+def test_ensure_tenant_db_registered_hits_master_once(monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(tenant_resolver, "channel", None)
+    monkeypatch.setattr(tenant_resolver, "_might_exist", lambda tenant_id: True)
+    tenant = Tenant.objects.create(name="registry-tenant")
+    TenantDatabase.objects.create(
+        tenant=tenant,
+        db_name=f"tenant_{tenant.id.hex}",
+        db_user="postgres",
+        db_password="postgres",
+    )
+
+    with django_assert_num_queries(1):
+        alias = ensure_tenant_db_registered(tenant)
+        assert ensure_tenant_db_registered(tenant) == alias
+
+    assert connections.databases[alias]["NAME"] == f"tenant_{tenant.id.hex}"
+    tenant_connections.evict(alias)
+    assert alias not in connections.databases
@@ -0,0 +1,70 @@
+import pytest
+from django.test import override_settings
+from rest_framework.exceptions import ValidationError
+
+from system.models import DatabaseHost, Tenant, TenantDatabase
+from system.services.placement import PlacementService, RoundRobinPolicy
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def hosts():
+    return [
+        DatabaseHost.objects.create(name="shard-1", host="localhost", port="5432", weight=100),
+        DatabaseHost.objects.create(name="shard-2", host="localhost", port="5433", weight=200),
+    ]
+
+
+def _place_tenant(name, port):
+    tenant = Tenant.objects.create(name=name)
+    TenantDatabase.objects.create(
+        tenant=tenant,
+        db_name=f"tenant_{tenant.id.hex}",
+        db_user="postgres",
+        db_password="postgres",
+        db_host="localhost",
+        db_port=port,
+    )
+    return tenant
+
+
+@pytest.mark.django_db
+def test_without_hosts_falls_back_to_default():
+    placement = PlacementService.choose_host(Tenant(name="new"))
+
+    assert (placement.name, placement.host, placement.port) == ("default", "localhost", "5432")
+
+
+@pytest.mark.django_db
+@override_settings(TENANT_PLACEMENT={"policy": "least_loaded"})
+def test_least_loaded_respects_weights(hosts):
+    _place_tenant("one", "5432")
+    _place_tenant("two", "5433")
+
+    # shard-1: 1/100, shard-2: 1/200
+    assert PlacementService.choose_host(Tenant(name="new")).name == "shard-2"
+
+    _place_tenant("three", "5433")
+    _place_tenant("four", "5433")
+    assert PlacementService.choose_host(Tenant(name="new")).name == "shard-1"
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE, TENANT_PLACEMENT={"policy": "round_robin"})
+def test_round_robin_is_weighted(hosts):
+    chosen = [PlacementService.choose_host(Tenant(name="new")).name for _ in range(6)]
+
+    assert chosen.count("shard-1") == 2
+    assert chosen.count("shard-2") == 4
+    assert isinstance(PlacementService.get_policy(), RoundRobinPolicy)
+
+
+@pytest.mark.django_db
+def test_pinned_host_must_be_active(hosts):
+    assert PlacementService.choose_host(Tenant(name="new"), pinned_host="shard-1").port == "5432"
+
+    hosts[0].is_active = False
+    hosts[0].save()
+    with pytest.raises(ValidationError):
+        PlacementService.choose_host(Tenant(name="new"), pinned_host="shard-1")
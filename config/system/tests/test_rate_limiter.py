@@ -0,0 +1,254 @@
+import threading
+import uuid
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from system.circuit_breaker import CircuitBreaker
+from system.middleware_rate_limit import TenantRateLimitMiddleware
+from system.models import Plan
+from system.rate_limit import LIMITERS, HybridRateLimiter, get_limiter
+from system.tenant_cache import ResolvedTenant, tenant_resolver
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+
+@pytest.mark.parametrize("algorithm", sorted(LIMITERS))
+def test_allows_limit_then_denies_with_retry_after(redis_client, algorithm):
+    limiter = get_limiter(redis_client, algorithm)
+
+    results = [limiter.check("rl:test", limit=3, window=60) for _ in range(4)]
+
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results[:3]] == [2, 1, 0]
+    # The counter's estimate can keep a full window blocked into the next one.
+    assert 0 < results[-1].retry_after <= 2 * 60
+
+
+@pytest.mark.parametrize("algorithm", sorted(LIMITERS))
+def test_cost_consumes_several_units(redis_client, algorithm):
+    limiter = get_limiter(redis_client, algorithm)
+
+    assert limiter.check("rl:cost", limit=5, window=60, cost=4).remaining == 1
+    assert not limiter.check("rl:cost", limit=5, window=60, cost=2).allowed
+    assert limiter.check("rl:cost", limit=5, window=60, cost=1).allowed
+
+
+def test_check_is_one_round_trip(redis_client, monkeypatch):
+    limiter = get_limiter(redis_client, "gcra")
+    limiter.check("rl:rtt", limit=10, window=60)  # loads the script
+
+    commands = []
+    original = redis_client.execute_command
+    monkeypatch.setattr(
+        redis_client, "execute_command", lambda *args, **kwargs: commands.append(args[0]) or original(*args, **kwargs)
+    )
+    limiter.check("rl:rtt", limit=10, window=60)
+
+    assert commands == ["EVALSHA"]
+
+
+@pytest.fixture
+def plans(monkeypatch):
+    # tenant_id -> (requests, window_seconds); other tenants get the defaults
+    plans = {}
+    monkeypatch.setattr(
+        tenant_resolver,
+        "resolve",
+        lambda tenant_id: ResolvedTenant(tenant_id, True, "", {}, rate_limit=plans[tenant_id])
+        if tenant_id in plans
+        else None,
+    )
+    return plans
+
+
+@pytest.fixture
+def middleware(redis_client, plans):
+    middleware = TenantRateLimitMiddleware(lambda request: None)
+    middleware.limiter = get_limiter(redis_client, "sliding_window_counter")
+    middleware.max_requests = 2
+    middleware.costs = {}
+    return middleware
+
+
+def _bearer(tenant_id):
+    token = AccessToken()
+    token["tenant_id"] = str(tenant_id)
+    return f"Bearer {token}"
+
+
+def test_limits_by_token_claim_without_authentication(middleware):
+    # No django_db mark: past the (stubbed) tenant cache, any database
+    # query would fail the test.
+    request = RequestFactory().get("/api/v1/projects/", HTTP_AUTHORIZATION=_bearer(uuid.uuid4()))
+
+    assert middleware.process_request(request) is None
+    assert middleware.process_request(request) is None
+    response = middleware.process_request(request)
+
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) >= 1
+
+
+def test_tenants_are_limited_separately(middleware):
+    first = RequestFactory().get("/api/v1/projects/", HTTP_AUTHORIZATION=_bearer(uuid.uuid4()))
+    second = RequestFactory().get("/api/v1/projects/", HTTP_AUTHORIZATION=_bearer(uuid.uuid4()))
+
+    for _ in range(2):
+        assert middleware.process_request(first) is None
+    assert middleware.process_request(first).status_code == 429
+    assert middleware.process_request(second) is None
+
+
+def test_requests_without_valid_token_are_left_to_auth(middleware):
+    forged = RequestFactory().get("/api/v1/projects/", HTTP_AUTHORIZATION="Bearer not-a-jwt")
+    anonymous = RequestFactory().get("/api/v1/projects/")
+
+    for _ in range(3):
+        assert middleware.process_request(forged) is None
+        assert middleware.process_request(anonymous) is None
+
+
+def test_plan_limit_and_headers(middleware, plans):
+    tenant_id = uuid.uuid4()
+    plans[tenant_id] = (5, 60)
+    request = RequestFactory().get("/api/v1/tasks/1/", HTTP_AUTHORIZATION=_bearer(tenant_id))
+
+    assert middleware.process_request(request) is None
+    response = middleware.process_response(request, HttpResponse())
+
+    assert response["X-RateLimit-Limit"] == "5"
+    assert response["X-RateLimit-Remaining"] == "4"
+    assert int(response["X-RateLimit-Reset"]) > 0
+
+
+def test_expensive_endpoints_cost_more(middleware, plans):
+    tenant_id = uuid.uuid4()
+    plans[tenant_id] = (5, 60)
+    middleware.costs = {"project-analytics": 3}
+    analytics = RequestFactory().get("/api/v1/analytics/projects/1/", HTTP_AUTHORIZATION=_bearer(tenant_id))
+    retrieve = RequestFactory().get("/api/v1/tasks/1/", HTTP_AUTHORIZATION=_bearer(tenant_id))
+
+    assert middleware.process_request(analytics) is None
+    assert analytics.rate_limit.remaining == 2
+    # Through the full middleware, which adds the headers once.
+    response = middleware(analytics)
+    assert response.status_code == 429
+    assert response["X-RateLimit-Remaining"] == "2"
+    assert middleware.process_request(retrieve) is None
+
+
+def test_resolved_tenant_caches_plan_limit():
+    resolved = ResolvedTenant(uuid.uuid4(), True, "", {}, rate_limit=(500, 60))
+
+    assert ResolvedTenant.from_cache(resolved.to_cache()).rate_limit == (500, 60)
+
+
+def _record_commands(redis_client, monkeypatch):
+    commands = []
+    original = redis_client.execute_command
+    monkeypatch.setattr(
+        redis_client, "execute_command", lambda *args, **kwargs: commands.append(args[0]) or original(*args, **kwargs)
+    )
+    return commands
+
+
+def _hybrid(redis_client, **kwargs):
+    # A long interval keeps the background thread out of the way; tests sync by hand.
+    return HybridRateLimiter(redis_client, sync_interval=3600, **kwargs)
+
+
+def test_hybrid_answers_locally_within_error_budget(redis_client, monkeypatch):
+    limiter = _hybrid(redis_client, error_budget=0.1)
+    commands = _record_commands(redis_client, monkeypatch)
+
+    results = [limiter.check("rl:hybrid", limit=100, window=60) for _ in range(11)]
+
+    assert commands == []
+    assert all(result.allowed for result in results[:10])
+    assert not results[-1].allowed
+    assert results[-1].retry_after == limiter.sync_interval
+
+
+def test_hybrid_reconciles_usage_across_workers(redis_client):
+    first = _hybrid(redis_client, error_budget=1.0)
+    second = _hybrid(redis_client, error_budget=1.0)
+
+    for _ in range(3):
+        assert first.check("rl:shared", limit=5, window=60).allowed
+    assert first.sync() == 1
+
+    assert second.check("rl:shared", limit=5, window=60).allowed
+    second.sync()
+
+    # 4 of 5 used globally: one more, then denied until the window slides.
+    assert second.check("rl:shared", limit=5, window=60).allowed
+    denied = second.check("rl:shared", limit=5, window=60)
+    assert not denied.allowed
+    assert denied.retry_after > 0
+
+
+def test_hybrid_falls_back_to_local_buckets_when_breaker_opens(monkeypatch):
+    server = fakeredis.FakeServer()
+    redis_client = fakeredis.FakeRedis(server=server)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=3600)
+    limiter = _hybrid(redis_client, error_budget=0.1, breaker=breaker)
+    server.connected = False
+
+    for _ in range(2):
+        limiter.check("rl:down", limit=3, window=60)
+        limiter.sync()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    commands = _record_commands(redis_client, monkeypatch)
+    # One of the 3 local tokens went before Redis failed.
+    results = [limiter.check("rl:down", limit=3, window=60) for _ in range(3)]
+    assert [result.allowed for result in results] == [True, True, False]
+    assert limiter.sync() == 0
+    assert commands == []
+
+
+def test_breaker_probes_in_background_and_closes():
+    probed = threading.Event()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, probe=probed.set)
+    breaker.record_failure()
+
+    # Callers are never held up by the probe, even the one that starts it.
+    assert breaker.allow() is False
+    assert probed.wait(5)
+    for _ in range(100):
+        if breaker.state == CircuitBreaker.CLOSED:
+            break
+        threading.Event().wait(0.01)
+
+    assert breaker.allow() is True
+
+
+def test_middleware_skips_redis_while_breaker_is_open(middleware, redis_client, monkeypatch):
+    middleware.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=3600)
+    middleware.breaker.record_failure()
+    commands = _record_commands(redis_client, monkeypatch)
+    request = RequestFactory().get("/api/v1/projects/", HTTP_AUTHORIZATION=_bearer(uuid.uuid4()))
+
+    for _ in range(3):
+        assert middleware.process_request(request) is None
+    assert commands == []
+
+
+@pytest.mark.django_db
+def test_plans_cannot_have_a_zero_limit():
+    with pytest.raises(ValidationError):
+        Plan(name="free", requests=0).full_clean()
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Plan.objects.create(name="free", requests=0)
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Plan.objects.create(name="instant", requests=10, window_seconds=0)
@@ -0,0 +1,67 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import override_settings
+
+from system import read_replicas
+from system.db_registry import tenant_connections, tenant_db_alias
+from system.models import Tenant, TenantDatabase, User
+from system.read_replicas import LAG_SQL, get_tenant_read_db, mark_write
+from system.tenant_cache import tenant_resolver
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def replica_user(monkeypatch):
+    monkeypatch.setattr(tenant_resolver, "channel", None)
+    monkeypatch.setattr(tenant_resolver, "_might_exist", lambda tenant_id: True)
+    tenant = Tenant.objects.create(name="replicated")
+    TenantDatabase.objects.create(
+        tenant=tenant,
+        db_name=f"tenant_{tenant.id.hex}",
+        db_user="postgres",
+        db_password="postgres",
+        replicas=[{"HOST": "replica-1"}, {"HOST": "replica-2"}],
+    )
+    user = User.objects.create_user(username="reader", password="pw", tenant=tenant)
+    yield user
+    tenant_connections.evict_tenant(tenant_db_alias(tenant.id))
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_reads_go_to_first_replica_within_lag(monkeypatch, replica_user):
+    lags = {"replica-1": 30.0, "replica-2": 0.5}
+    monkeypatch.setattr(
+        read_replicas,
+        "replica_lag",
+        lambda alias: lags[connections.databases[alias]["HOST"]],
+    )
+
+    alias = get_tenant_read_db(replica_user)
+
+    assert alias == tenant_db_alias(replica_user.tenant_id) + "_replica_1"
+    assert connections.databases[alias]["NAME"] == f"tenant_{replica_user.tenant_id.hex}"
+    assert connections.databases[alias]["OPTIONS"]["connect_timeout"] == 2
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_recent_write_and_lag_fall_back_to_primary(monkeypatch, replica_user):
+    primary = tenant_db_alias(replica_user.tenant_id)
+    monkeypatch.setattr(read_replicas, "replica_lag", lambda alias: 0.0)
+
+    mark_write(replica_user)
+    assert get_tenant_read_db(replica_user) == primary
+
+    cache.clear()
+    monkeypatch.setattr(read_replicas, "replica_lag", lambda alias: None)
+    assert get_tenant_read_db(replica_user) == primary
+
+
+@pytest.mark.django_db
+def test_lag_probe_reports_zero_on_primary():
+    with connection.cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        assert float(cursor.fetchone()[0]) == 0
@@ -0,0 +1,147 @@
+import uuid
+
+import pytest
+from django.test import RequestFactory, override_settings
+
+from system.middleware import TenantMiddleware
+from system.models import Tenant, TenantDatabase
+from system.tenant_cache import TenantResolver, tenant_resolver
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def resolver():
+    return TenantResolver(
+        local_max_size=10,
+        local_ttl_seconds=30,
+        shared_ttl_seconds=60,
+        channel=None,
+    )
+
+
+@pytest.fixture
+def tenant_db():
+    tenant = Tenant.objects.create(name="cached-tenant")
+    return TenantDatabase.objects.create(
+        tenant=tenant,
+        db_name=f"tenant_{tenant.id.hex}",
+        db_user="postgres",
+        db_password="postgres",
+    )
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_resolve_queries_master_once(resolver, tenant_db, django_assert_num_queries):
+    resolver.resolve(uuid.uuid4())  # builds the Bloom filter
+
+    with django_assert_num_queries(1):
+        first = resolver.resolve(tenant_db.tenant_id)
+        second = resolver.resolve(tenant_db.tenant_id)
+
+    assert first is second
+    assert first.is_active
+    assert first.db_config["NAME"] == tenant_db.db_name
+    assert first.db_alias == f"tenant_{tenant_db.tenant_id.hex}"
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_shared_cache_serves_other_processes(resolver, tenant_db, django_assert_num_queries):
+    resolver.resolve(tenant_db.tenant_id)
+    other_process = TenantResolver(
+        local_max_size=10,
+        local_ttl_seconds=30,
+        shared_ttl_seconds=60,
+        channel=None,
+    )
+    other_process.resolve(uuid.uuid4())  # builds the Bloom filter
+
+    with django_assert_num_queries(0):
+        resolved = other_process.resolve(tenant_db.tenant_id)
+
+    assert resolved.db_config["NAME"] == tenant_db.db_name
+    assert other_process.stats()["shared_hits"] == 1
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_deactivating_tenant_invalidates_cache(
+    monkeypatch, tenant_db, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(tenant_resolver, "channel", None)
+    monkeypatch.setattr(tenant_resolver, "_might_exist", lambda tenant_id: True)
+    assert tenant_resolver.resolve(tenant_db.tenant_id).is_active
+
+    tenant = tenant_db.tenant
+    tenant.is_active = False
+    with django_capture_on_commit_callbacks(execute=True):
+        tenant.save()
+
+    assert tenant_resolver.resolve(tenant_db.tenant_id).is_active is False
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_middleware_attaches_resolved_tenant(monkeypatch, tenant_db):
+    monkeypatch.setattr(tenant_resolver, "channel", None)
+    monkeypatch.setattr(tenant_resolver, "_might_exist", lambda tenant_id: True)
+    seen = {}
+
+    def view(request):
+        seen["tenant"] = request.tenant
+        return "ok"
+
+    middleware = TenantMiddleware(view)
+    request = RequestFactory().get("/api/v1/tasks/", HTTP_X_TENANT_ID=str(tenant_db.tenant_id))
+
+    assert middleware(request) == "ok"
+    assert seen["tenant"].tenant_id == tenant_db.tenant_id
+
+    unknown = RequestFactory().get("/api/v1/tasks/", HTTP_X_TENANT_ID=str(uuid.uuid4()))
+    assert middleware(unknown).status_code == 403
+
+    malformed = RequestFactory().get("/api/v1/tasks/", HTTP_X_TENANT_ID="not-a-uuid")
+    assert middleware(malformed).status_code == 403
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_unknown_tenant_rejected_without_master_query(resolver, tenant_db, django_assert_num_queries):
+    resolver.resolve(tenant_db.tenant_id)  # builds the Bloom filter
+
+    with django_assert_num_queries(0):
+        for _ in range(5):
+            assert resolver.resolve(uuid.uuid4()) is None
+
+    stats = resolver.stats()
+    assert stats["bloom_rejections"] == 5
+    assert stats["short_circuited"] == 5
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_tenant_created_by_other_worker_rebuilds_bloom(resolver, tenant_db):
+    resolver.resolve(tenant_db.tenant_id)
+
+    newcomer = Tenant.objects.create(name="created-elsewhere")
+    TenantDatabase.objects.create(tenant=newcomer, db_name="tenant_new", db_user="u", db_password="p")
+    other_worker = TenantResolver(local_max_size=10, local_ttl_seconds=30, shared_ttl_seconds=60, channel=None)
+    other_worker.note_tenant_created(newcomer.id)
+
+    assert resolver.resolve(newcomer.id).db_config["NAME"] == "tenant_new"
+    assert resolver.stats()["bloom_rebuilds"] == 2
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_tenant_without_database_is_negatively_cached(resolver, django_assert_num_queries):
+    tenant = Tenant.objects.create(name="no-database-yet")
+    resolver.resolve(uuid.uuid4())  # builds the Bloom filter
+
+    with django_assert_num_queries(1):
+        assert resolver.resolve(tenant.id) is None
+        assert resolver.resolve(tenant.id) is None
+
+    assert resolver.stats()["negative_hits"] == 1
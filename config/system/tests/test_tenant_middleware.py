@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from system.db_registry import get_tenant_db, tenant_db_alias
+from system.middleware import TenantMiddleware
+from system.models import Tenant, TenantDatabase, User
+from system.tenant_cache import tenant_resolver
+from system.tenant_context import get_current_tenant_db
+from users.api.serializers import CustomTokenObtainPairSerializer
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def tenant_user(monkeypatch):
+    monkeypatch.setattr(tenant_resolver, "channel", None)
+    monkeypatch.setattr(tenant_resolver, "_might_exist", lambda tenant_id: True)
+
+    tenant = Tenant.objects.create(name="jwt-tenant")
+    TenantDatabase.objects.create(
+        tenant=tenant,
+        db_name=f"tenant_{tenant.id.hex}",
+        db_user="postgres",
+        db_password="postgres",
+    )
+    return User.objects.create_user(username="jwt-user", password="pw", tenant=tenant)
+
+
+def _bearer(user):
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    return f"Bearer {token}"
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_alias_bound_from_token_claim(tenant_user):
+    seen = {}
+
+    def view(request):
+        seen["bound"] = get_current_tenant_db()
+        with CaptureQueriesContext(connection) as queries:
+            seen["service"] = get_tenant_db(tenant_user)
+        seen["queries"] = len(queries)
+        return "ok"
+
+    request = RequestFactory().get("/api/v1/tasks/", HTTP_AUTHORIZATION=_bearer(tenant_user))
+
+    assert TenantMiddleware(view)(request) == "ok"
+    assert seen["bound"] == tenant_db_alias(tenant_user.tenant_id)
+    assert seen["service"] == seen["bound"]
+    assert seen["queries"] == 0
+    assert get_current_tenant_db() is None
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_header_for_other_tenant_is_rejected(tenant_user):
+    request = RequestFactory().get(
+        "/api/v1/tasks/",
+        HTTP_AUTHORIZATION=_bearer(tenant_user),
+        HTTP_X_TENANT_ID=str(uuid.uuid4()),
+    )
+
+    response = TenantMiddleware(lambda request: "ok")(request)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_invalid_token_is_left_to_authentication(tenant_user):
+    request = RequestFactory().get("/api/v1/tasks/", HTTP_AUTHORIZATION="Bearer not-a-jwt")
+
+    assert TenantMiddleware(lambda request: "ok")(request) == "ok"
@@ -0,0 +1,80 @@
+import uuid
+
+import pytest
+
+from django.db import connection
+
+from system.models import Tenant, TenantDatabase
+from system.services.migration_utils import migrate_tenant_database, tenant_migration_state
+from system.services import tenant_migrations
+from system.services.tenant_migrations import TenantMigrationResult, TenantMigrationService
+
+
+def _tenant_db(name):
+    return TenantDatabase(
+        tenant=Tenant(id=uuid.uuid4(), name=name),
+        db_name=f"db_{name}",
+        db_user="postgres",
+        db_password="postgres",
+    )
+
+
+def fake_worker(tenant_id, db_config, timeout):
+    if db_config["NAME"] == "db_broken":
+        raise RuntimeError("worker died")
+    return TenantMigrationResult(tenant_id, "ok", 0.01)
+
+
+def test_checkpoint_round_trip_keeps_only_successes(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    TenantMigrationService.write_checkpoint(path, TenantMigrationResult("aaa", "ok", 1.0))
+    TenantMigrationService.write_checkpoint(path, TenantMigrationResult("bbb", "timeout", 5.0, "exceeded 5s"))
+
+    assert TenantMigrationService.read_checkpoint(path) == {"aaa"}
+    assert TenantMigrationService.read_checkpoint(str(tmp_path / "missing.jsonl")) == set()
+
+
+@pytest.mark.django_db
+def test_plan_puts_oldest_tenants_first_and_skips_done():
+    tenant_dbs = []
+    for name in ("first", "second", "third"):
+        tenant_db = _tenant_db(name)
+        tenant_db.tenant.save()
+        tenant_db.save()
+        tenant_dbs.append(tenant_db)
+
+    plan = TenantMigrationService.plan(canary=1, done={tenant_dbs[1].tenant_id.hex})
+
+    assert [tenant_db.db_name for tenant_db in plan["canary"]] == ["db_first"]
+    assert [tenant_db.db_name for tenant_db in plan["rest"]] == ["db_third"]
+
+
+def test_migrate_all_reports_every_tenant(monkeypatch):
+    monkeypatch.setattr(tenant_migrations, "migrate_tenant_worker", fake_worker)
+    reported = []
+
+    results = TenantMigrationService.migrate_all(
+        [_tenant_db("a"), _tenant_db("b"), _tenant_db("broken")],
+        concurrency=2,
+        timeout=10,
+        on_result=reported.append,
+    )
+
+    assert reported == results
+    assert sorted(result.status for result in results) == ["failed", "ok", "ok"]
+
+
+@pytest.mark.django_db
+def test_migration_state_compares_django_migrations_with_code():
+    # The test database has every tenant app migrated.
+    assert tenant_migration_state("default") == {"behind": [], "ahead": []}
+    assert migrate_tenant_database("default") is False
+
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM django_migrations WHERE app = 'projects' AND name = '0001_initial'")
+        cursor.execute("INSERT INTO django_migrations (app, name, applied) VALUES ('tasks', '9999_future', now())")
+
+    assert tenant_migration_state("default") == {
+        "behind": ["projects.0001_initial"],
+        "ahead": ["tasks.9999_future"],
+    }
@@ -0,0 +1,110 @@
+import pytest
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from system.models import Tenant, TenantDatabase, TenantProvisioning, User
+from system.services.tenant_provisioning import TenantProvisioningService
+from system.services.tenant_storage import TenantStorageService
+
+State = TenantProvisioning.State
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    """
+    Storage that is "created" without touching Postgres, pre-migrated,
+    so the pipeline goes straight from PENDING to MIGRATED.
+    """
+    dropped = []
+
+    def provision(tenant, isolation_mode, placement):
+        fields = {
+            "isolation_mode": isolation_mode,
+            "db_name": f"tenant_{tenant.id.hex}",
+            "schema_name": "",
+            "db_user": "postgres",
+            "db_password": "postgres",
+            "db_host": placement.host,
+            "db_port": placement.port,
+        }
+        return fields, True
+
+    monkeypatch.setattr(TenantStorageService, "provision", staticmethod(provision))
+    monkeypatch.setattr(TenantStorageService, "drop_storage", staticmethod(lambda config: dropped.append(config["NAME"])))
+    monkeypatch.setattr(TenantProvisioningService, "_drop_unrecorded_storage", staticmethod(lambda provisioning: None))
+    return dropped
+
+
+def _start(name="acme", **kwargs):
+    return TenantProvisioningService.start(
+        tenant_name=name, admin_username=f"{name}-admin", admin_password="secret", dispatch=False, **kwargs
+    )
+
+
+@pytest.mark.django_db
+def test_start_reserves_inactive_tenant_and_hashes_password():
+    provisioning = _start(admin_email="admin@acme.test")
+
+    assert provisioning.state == State.PENDING
+    assert provisioning.tenant.is_active is False
+    assert provisioning.admin_password != "secret"
+
+    with pytest.raises(ValidationError):
+        _start()
+
+
+@pytest.mark.django_db
+def test_stages_advance_once(fake_storage):
+    provisioning = _start()
+
+    TenantProvisioningService.run_stage(provisioning)
+    assert provisioning.state == State.MIGRATED
+    assert TenantDatabase.objects.filter(tenant=provisioning.tenant).count() == 1
+
+    # A redelivered create_database for a provisioning that moved on is a no-op.
+    assert not TenantProvisioningService._advance(provisioning, State.PENDING, State.DATABASE_CREATED)
+
+    TenantProvisioningService.run_stage(provisioning)
+    assert provisioning.state == State.ADMIN_SEEDED
+    admin = User.objects.get(username="acme-admin")
+    assert admin.tenant_id == provisioning.tenant_id and admin.check_password("secret")
+
+
+@pytest.mark.django_db
+def test_failed_stage_is_compensated(fake_storage, monkeypatch):
+    def mirror_user(provisioning):
+        raise RuntimeError("tenant database unreachable")
+
+    monkeypatch.setattr(TenantProvisioningService, "mirror_user", staticmethod(mirror_user))
+    provisioning = _start()
+    tenant_id = provisioning.tenant_id
+
+    with pytest.raises(RuntimeError):
+        TenantProvisioningService.run(provisioning)
+
+    provisioning.refresh_from_db()
+    assert provisioning.state == State.FAILED
+    assert provisioning.error == "tenant database unreachable"
+    assert provisioning.admin_password == ""
+    assert fake_storage == [f"tenant_{tenant_id.hex}"]
+    assert not Tenant.objects.filter(pk=tenant_id).exists()
+    assert not User.objects.filter(username="acme-admin").exists()
+
+
+@pytest.mark.django_db
+def test_signup_api_returns_202_and_status():
+    client = APIClient()
+
+    response = client.post(
+        "/tenants/signup/",
+        {"tenant_name": "acme", "username": "acme-admin", "password": "secret", "email": "a@acme.test"},
+        format="json",
+    )
+
+    assert response.status_code == 202
+    assert response["Location"] == response.data["status_url"]
+
+    status = client.get(response.data["status_url"])
+    assert status.status_code == 200
+    assert status.data["state"] == State.PENDING
+    assert status.data["tenant_id"] == response.data["tenant_id"]
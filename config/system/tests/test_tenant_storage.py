@@ -0,0 +1,174 @@
+import datetime
+import uuid
+
+import pytest
+from django.db import DatabaseError, connection, connections
+from django.test import RequestFactory, override_settings
+
+from projects.models import Project
+from system.db_pool import tenant_pools
+from system.db_registry import TenantConnectionRegistry, ensure_tenant_db_registered, tenant_connections, tenant_db_alias
+from system.middleware import TenantMiddleware
+from system.models import Tenant, TenantDatabase
+from system.services.db_utils import create_postgres_schema, drop_postgres_storage
+from system.services.migration_utils import migrate_tenant_database
+from system.services.tenant_copy import copy_tenant_data, sync_tenant_data
+from system.services.tenant_storage import TenantStorageService
+from system.tenant_cache import ResolvedTenant, tenant_resolver
+
+SCHEMAS = ["tenant_schema_a", "tenant_schema_b"]
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def schema_aliases(django_db_setup, django_db_blocker):
+    params = connection.settings_dict
+    credentials = {
+        "db_name": params["NAME"],
+        "user": params["USER"],
+        "password": params["PASSWORD"],
+        "host": params["HOST"],
+        "port": params["PORT"],
+    }
+    registry = TenantConnectionRegistry(max_aliases=10, ttl_seconds=None)
+
+    with django_db_blocker.unblock():
+        for schema in SCHEMAS:
+            create_postgres_schema(schema_name=schema, **credentials)
+            registry.register(schema, {"NAME": params["NAME"], "TENANT_SCHEMA": schema})
+            migrate_tenant_database(schema)
+
+        yield SCHEMAS
+
+        for schema in SCHEMAS:
+            connections[schema].close()
+        registry.clear()
+        tenant_pools.close_all()
+        for schema in SCHEMAS:
+            drop_postgres_storage(schema_name=schema, **credentials)
+
+
+def test_connection_config_carries_schema():
+    tenant_db = TenantDatabase(
+        tenant=Tenant(name="small"),
+        isolation_mode=TenantDatabase.IsolationMode.SCHEMA,
+        db_name="tenants_shared",
+        schema_name="tenant_abc",
+        db_user="postgres",
+        db_password="postgres",
+    )
+
+    assert tenant_db.connection_config()["TENANT_SCHEMA"] == "tenant_abc"
+    tenant_db.isolation_mode = TenantDatabase.IsolationMode.DATABASE
+    assert "TENANT_SCHEMA" not in tenant_db.connection_config()
+
+
+def test_schema_tenants_are_isolated_on_one_shared_pool(schema_aliases):
+    first, second = schema_aliases
+    Project.objects.using(first).create(name="only-in-a", created_by=1)
+
+    assert Project.objects.using(first).count() == 1
+    assert Project.objects.using(second).count() == 0
+    assert connections[first].settings_dict["POOL_KEY"] == connections[second].settings_dict["POOL_KEY"]
+
+    connections[first].close()
+    connections[second].close()
+    with connections[second].cursor() as cursor:
+        cursor.execute("SHOW search_path")
+        assert cursor.fetchone()[0].startswith(second)
+    assert tenant_pools.stats()["reused"] >= 1
+
+
+def test_copy_preserves_rows_and_resets_sequences(schema_aliases):
+    source, target = schema_aliases
+    created = Project.objects.using(source).create(name="moved", created_by=7)
+    Project.objects.using(source).filter(pk=created.pk).update(
+        created_at=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    )
+
+    counts = copy_tenant_data(source, target, batch_size=1)
+
+    copied = Project.objects.using(target).get()
+    assert counts["projects.Project"] == 1
+    assert copied.pk == created.pk
+    assert copied.created_at.year == 2024
+    assert Project.objects.using(target).create(name="next", created_by=7).pk > created.pk
+
+
+def test_sync_catches_up_inserts_updates_and_deletes(schema_aliases):
+    source, target = schema_aliases
+    kept = Project.objects.using(source).create(name="kept", created_by=1)
+    renamed = Project.objects.using(source).create(name="before", created_by=1)
+    removed = Project.objects.using(source).create(name="removed", created_by=1)
+    copy_tenant_data(source, target)
+
+    Project.objects.using(source).filter(pk=renamed.pk).update(name="after")
+    Project.objects.using(source).filter(pk=removed.pk).delete()
+    added = Project.objects.using(source).create(name="added", created_by=1)
+
+    counts = sync_tenant_data(source, target)
+
+    assert counts["projects.Project"] == 3
+    assert dict(Project.objects.using(target).values_list("pk", "name")) == {
+        kept.pk: "kept",
+        renamed.pk: "after",
+        added.pk: "added",
+    }
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_read_only_tenant_rejects_writes(monkeypatch):
+    monkeypatch.setattr(tenant_resolver, "channel", None)
+    monkeypatch.setattr(tenant_resolver, "_might_exist", lambda tenant_id: True)
+    tenant = Tenant.objects.create(name="moving", is_read_only=True)
+    TenantDatabase.objects.create(tenant=tenant, db_name="tenant_moving", db_user="u", db_password="p")
+    middleware = TenantMiddleware(lambda request: "ok")
+
+    read = RequestFactory().get("/api/v1/tasks/", HTTP_X_TENANT_ID=str(tenant.id))
+    write = RequestFactory().post("/api/v1/tasks/", HTTP_X_TENANT_ID=str(tenant.id))
+
+    assert middleware(read) == "ok"
+    response = middleware(write)
+    assert response.status_code == 503
+    assert response["Retry-After"]
+
+
+def _resolution(tenant_id, schema, *, read_only):
+    params = connection.settings_dict
+    return ResolvedTenant(
+        tenant_id=tenant_id,
+        is_active=True,
+        db_alias=tenant_db_alias(tenant_id),
+        db_config={"NAME": params["NAME"], "TENANT_SCHEMA": schema, "TENANT_ID": str(tenant_id)},
+        is_read_only=read_only,
+    )
+
+
+def test_tenant_sessions_reject_writes_while_read_only(schema_aliases, monkeypatch):
+    tenant_id = uuid.uuid4()
+    resolution = {"current": _resolution(tenant_id, schema_aliases[0], read_only=True)}
+    monkeypatch.setattr(tenant_resolver, "resolve", lambda tid: resolution["current"])
+    alias = ensure_tenant_db_registered(tenant_id)
+    try:
+        assert Project.objects.using(alias).count() == 0
+        with pytest.raises(DatabaseError):
+            Project.objects.using(alias).create(name="lost", created_by=1)
+        connections[alias].close()
+
+        # Writable again, on the storage the tenant was moved to.
+        resolution["current"] = _resolution(tenant_id, schema_aliases[1], read_only=False)
+        assert ensure_tenant_db_registered(tenant_id) == alias
+        Project.objects.using(alias).create(name="kept", created_by=1)
+
+        assert Project.objects.using(schema_aliases[1]).get().name == "kept"
+        assert not Project.objects.using(schema_aliases[0]).exists()
+    finally:
+        tenant_connections.evict(alias)
+
+
+def test_drain_outlasts_the_resolver_cache(settings):
+    settings.TENANT_CACHE = {"local_ttl_seconds": 30}
+    settings.TENANT_RELOCATION = {"drain_seconds": 2}
+
+    assert TenantStorageService.drain_seconds() == 32
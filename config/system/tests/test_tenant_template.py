@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from system.services.db_utils import drop_postgres_storage, postgres_admin_connection
+from system.services.migration_utils import tenant_migration_fingerprint
+from system.services.tenant_template import TenantTemplateService
+
+TEMPLATE_SETTINGS = {"enabled": True, "NAME": "test_tenant_template"}
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def test_fingerprint_is_stable_hex_digest():
+    first = tenant_migration_fingerprint()
+
+    tenant_migration_fingerprint.cache_clear()
+    assert tenant_migration_fingerprint() == first
+    assert len(first) == 64
+
+
+def test_stale_template_is_not_cloned_and_queues_rebuild(monkeypatch):
+    executed, rebuilds = [], []
+
+    class FakeCursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, query, params=None):
+            executed.append(query)
+
+        def fetchone(self):
+            return ("outdated",)
+
+    class FakeConnection:
+        def cursor(self):
+            return FakeCursor()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(TenantTemplateService, "_connect", staticmethod(lambda host, port: FakeConnection()))
+    monkeypatch.setattr(
+        TenantTemplateService, "request_rebuild", staticmethod(lambda host, port: rebuilds.append((host, port)))
+    )
+
+    with override_settings(TENANT_TEMPLATE_DATABASE=TEMPLATE_SETTINGS):
+        assert TenantTemplateService.clone("tenant_x", host="db", port="5432") is False
+
+    assert rebuilds == [("db", "5432")]
+    assert len(executed) == 1  # only the fingerprint lookup, no CREATE DATABASE
+
+
+def test_rebuilt_template_is_cloned_migrated(django_db_setup, django_db_blocker, monkeypatch):
+    params = connection.settings_dict
+    host, port = params["HOST"], params["PORT"]
+    clone_name = "test_tenant_from_template"
+    monkeypatch.setattr(TenantTemplateService, "request_rebuild", staticmethod(lambda host, port: None))
+
+    with django_db_blocker.unblock(), override_settings(
+        TENANT_TEMPLATE_DATABASE=TEMPLATE_SETTINGS, CACHES=LOCMEM_CACHE
+    ):
+        try:
+            assert TenantTemplateService.rebuild(host, port) == tenant_migration_fingerprint()
+            assert TenantTemplateService.template_fingerprint(host, port) == tenant_migration_fingerprint()
+            assert TenantTemplateService.clone(clone_name, host=host, port=port) is True
+
+            conn = postgres_admin_connection(
+                dbname=clone_name, user=params["USER"], password=params["PASSWORD"], host=host, port=port
+            )
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT count(*) FROM django_migrations WHERE app = 'projects'")
+                    assert cursor.fetchone()[0] > 0
+            finally:
+                conn.close()
+        finally:
+            credentials = {"user": params["USER"], "password": params["PASSWORD"], "host": host, "port": port}
+            drop_postgres_storage(db_name=clone_name, schema_name="", **credentials)
+            conn = postgres_admin_connection(dbname="postgres", **credentials)
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [TEMPLATE_SETTINGS["NAME"]])
+                    if cursor.fetchone():
+                        cursor.execute(f'ALTER DATABASE "{TEMPLATE_SETTINGS["NAME"]}" WITH IS_TEMPLATE false')
+            finally:
+                conn.close()
+            drop_postgres_storage(db_name=TEMPLATE_SETTINGS["NAME"], schema_name="", **credentials)
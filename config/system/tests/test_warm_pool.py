@@ -0,0 +1,63 @@
+import pytest
+from django.test import override_settings
+
+from system.models import WarmTenantDatabase
+from system.services.migration_utils import tenant_migration_fingerprint
+from system.services.placement import Placement, PlacementService
+from system.services.warm_pool import WarmPoolService
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+HOST = Placement(name="default", host="localhost", port="5432")
+
+
+def _warm(name, port="5432", fingerprint=None):
+    return WarmTenantDatabase.objects.create(
+        db_name=name,
+        db_host="localhost",
+        db_port=port,
+        fingerprint=fingerprint or tenant_migration_fingerprint(),
+    )
+
+
+@pytest.mark.django_db
+def test_claim_takes_oldest_current_database_on_host():
+    _warm("tenant_warm_stale", fingerprint="0" * 64)
+    _warm("tenant_warm_other_host", port="5433")
+    _warm("tenant_warm_first")
+    _warm("tenant_warm_second")
+
+    assert WarmPoolService.claim(HOST) == "tenant_warm_first"
+    assert WarmPoolService.claim(HOST) == "tenant_warm_second"
+    assert WarmPoolService.claim(HOST) is None
+    assert set(WarmTenantDatabase.objects.values_list("db_name", flat=True)) == {
+        "tenant_warm_stale",
+        "tenant_warm_other_host",
+    }
+
+
+@pytest.mark.django_db
+@override_settings(TENANT_WARM_POOL={"enabled": False})
+def test_disabled_pool_is_never_claimed():
+    _warm("tenant_warm_first")
+
+    assert WarmPoolService.claim(HOST) is None
+
+
+@pytest.mark.django_db
+@override_settings(TENANT_WARM_POOL={"enabled": True, "size": 3}, CACHES=LOCMEM_CACHE)
+def test_replenish_drops_stale_and_tops_up(monkeypatch):
+    dropped = []
+    monkeypatch.setattr(PlacementService, "servers", staticmethod(lambda: [("localhost", "5432")]))
+    monkeypatch.setattr(WarmPoolService, "_drop", staticmethod(lambda db_name, host, port: dropped.append(db_name)))
+    monkeypatch.setattr(
+        WarmPoolService,
+        "_create",
+        staticmethod(lambda host, port, fingerprint: _warm(f"tenant_warm_{WarmTenantDatabase.objects.count()}")),
+    )
+    _warm("tenant_warm_stale", fingerprint="0" * 64)
+    _warm("tenant_warm_ready")
+
+    assert WarmPoolService.replenish() == {"localhost:5432": 2}
+    assert dropped == ["tenant_warm_stale"]
+    assert WarmPoolService.depth()[("localhost", "5432")] == {"ready": 3, "stale": 0}
+    assert WarmPoolService.replenish() == {"localhost:5432": 0}
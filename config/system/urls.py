@@ -1,13 +1,15 @@
 from system.views import TenantSelectView, HomeView
 from django.urls import path, include
-from system.api.views import TenantListAPIView
-from system.views import TenantSignupAPIView
+from system.api.views import TenantListAPIView, TenantCacheStatsAPIView
+from system.views import TenantSignupAPIView, TenantSignupStatusAPIView
 
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
     path("select-tenant/", TenantSelectView.as_view(), name="select-tenant"),
     path("api/v1/tenants/", TenantListAPIView.as_view(), name="tenant-list"),
+    path("api/v1/system/tenant-cache/", TenantCacheStatsAPIView.as_view(), name="tenant-cache-stats"),
     path("tenants/signup/", TenantSignupAPIView.as_view(), name="tenant-signup"),
+    path("tenants/signup/<uuid:provisioning_id>/", TenantSignupStatusAPIView.as_view(), name="tenant-signup-status"),
     path("api/v1/auth/", include("users.api_urls")),
     path("", include("users.urls")),
 ]
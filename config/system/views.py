@@ -16,12 +16,14 @@
 #         {"tenants": tenants},
 #     )
 from django.views.generic import FormView
-from django.shortcuts import redirect
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
 from system.forms import TenantSelectForm
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from system.services.tenant_service import TenantService
+from system.models import TenantProvisioning
+from system.services.tenant_provisioning import TenantProvisioningService
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 
@@ -41,25 +43,48 @@ class HomeView(FormView):
         return redirect("project-list")
 
 class TenantSignupAPIView(APIView):
+    """
+    Starts an asynchronous signup; the database work runs in Celery and
+    the client polls the returned status URL.
+    """
     authentication_classes = []
     permission_classes = []
 
     def post(self, request):
-        tenant_name = request.data["tenant_name"]
-        username = request.data["username"]
-        password = request.data["password"]
-        email = request.data["email"]
+        provisioning = TenantProvisioningService.start(
+            tenant_name=request.data["tenant_name"],
+            admin_username=request.data["username"],
+            admin_password=request.data["password"],
+            admin_email=request.data.get("email", ""),
+        )
+        status_url = reverse("tenant-signup-status", args=[provisioning.id])
 
-        tenant, user = TenantService.create_tenant(
-            tenant_name=tenant_name,
-            admin_username=username,
-            admin_password=password,
+        return Response(
+            {
+                "provisioning_id": str(provisioning.id),
+                "tenant_id": str(provisioning.tenant_id),
+                "state": provisioning.state,
+                "status_url": status_url,
+            },
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": status_url},
         )
 
-        user.email = email
-        user.save(update_fields=["email"])
+
+class TenantSignupStatusAPIView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request, provisioning_id):
+        provisioning = get_object_or_404(TenantProvisioning, pk=provisioning_id)
 
         return Response(
-            {"tenant_id": str(tenant.id)},
-            status=status.HTTP_201_CREATED,
+            {
+                "provisioning_id": str(provisioning.id),
+                "tenant_id": str(provisioning.tenant_id) if provisioning.tenant_id else None,
+                "tenant_name": provisioning.tenant_name,
+                "state": provisioning.state,
+                "error": provisioning.error,
+                "updated_at": provisioning.updated_at,
+            }
         )
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from tasks.models import Task, TaskActivity, TaskSLA
 from system.models import User
+from tasks.services.task_service import TaskService
 
 class TaskSerializer(serializers.ModelSerializer):
     project_name = serializers.CharField(
@@ -22,6 +23,45 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
 
 
+class TaskListQuerySerializer(serializers.Serializer):
+    """
+    Filters and sort key of GET /tasks/, from the query string.
+    """
+    project = serializers.IntegerField(required=False, source="project_id")
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    assigned_to = serializers.IntegerField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    updated_after = serializers.DateTimeField(required=False)
+    updated_before = serializers.DateTimeField(required=False)
+    search = serializers.CharField(required=False, max_length=200)
+    sort = serializers.ChoiceField(choices=list(TaskService.LIST_ORDERINGS), required=False, default="-created_at")
+
+
+class TaskBulkItemSerializer(serializers.Serializer):
+    """
+    Field validation for one item of POST /tasks/bulk/ (no queries).
+    """
+    project = serializers.IntegerField()
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    assigned_to = serializers.IntegerField(required=False, allow_null=True, default=None)
+
+
+class TaskBulkUpdateItemSerializer(serializers.Serializer):
+    """
+    Field validation for one item of POST /tasks/bulk-update/ (no queries).
+    """
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    assigned_to = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if "status" not in attrs and "assigned_to" not in attrs:
+            raise serializers.ValidationError("Provide status and/or assigned_to")
+        return attrs
+
+
 class TaskActivitySerializer(serializers.ModelSerializer):
     performed_by_name = serializers.SerializerMethodField()
     old_value = serializers.SerializerMethodField()
@@ -1,19 +1,25 @@
 from rest_framework.viewsets import ViewSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from projects.models import Project
 from tasks.models import Task, TaskSLA
 from tasks.api.serializers import (
+    TaskBulkItemSerializer,
+    TaskBulkUpdateItemSerializer,
+    TaskListQuerySerializer,
     TaskSerializer,
     TaskActivitySerializer,
     TaskSLASerializer,
 )
 from tasks.services.task_service import TaskService
 from drf_yasg.utils import swagger_auto_schema
+from config.pagination import KeysetPagination
 from config.swagger import TENANT_HEADER
 from rest_framework import status
-from system.db_registry import ensure_tenant_db_registered
+from system.db_registry import get_tenant_db
 
 
 class TaskViewSet(ViewSet):
@@ -24,21 +30,31 @@ class TaskViewSet(ViewSet):
     def get_user(self, request):
         return request.user
 
-    @swagger_auto_schema(manual_parameters=[TENANT_HEADER])
+    @swagger_auto_schema(manual_parameters=[TENANT_HEADER], query_serializer=TaskListQuerySerializer)
     def list(self, request):
+        """
+        Filters: project, status, assigned_to, created_after/before,
+        updated_after/before (ISO 8601) and search (words of the title
+        or description). sort is one of created_at, updated_at, newest
+        first with a leading "-" (the default, -created_at).
+        """
         user = self.get_user(request)
-        project_id = request.query_params.get("project")
+        query = TaskListQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
 
         tasks = TaskService.list_tasks(
             user=user,
-            project_id=project_id,
+            **query.validated_data,
         )
-        return Response(TaskSerializer(tasks, many=True).data)
+        self.keyset_ordering = TaskService.LIST_ORDERINGS[query.validated_data["sort"]]
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(tasks, request, view=self)
+        return paginator.get_paginated_response(TaskSerializer(page, many=True).data)
 
     @swagger_auto_schema(manual_parameters=[TENANT_HEADER])
     def retrieve(self, request, pk=None):
         user = self.get_user(request)
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
 
         task = get_object_or_404(
             Task.objects.using(db),
@@ -51,7 +67,7 @@ class TaskViewSet(ViewSet):
     @swagger_auto_schema(manual_parameters=[TENANT_HEADER])
     def create(self, request):
         user = self.get_user(request)
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
 
         project = get_object_or_404(
             Project.objects.using(db),
@@ -71,10 +87,125 @@ class TaskViewSet(ViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @swagger_auto_schema(manual_parameters=[TENANT_HEADER])
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Creates a batch of tasks: a list (or {"tasks": [...]}) of items
+        shaped like ``create``'s body. Valid items are created even when
+        others fail; the response has one result per item, in order.
+        201 when all were created, 207 when some were, 400 when none.
+        """
+        user = self.get_user(request)
+        items, error = self._bulk_items(request)
+        if error is not None:
+            return error
+
+        item_serializers = [TaskBulkItemSerializer(data=item) for item in items]
+        valid = [serializer for serializer in item_serializers if serializer.is_valid()]
+        created = iter(
+            TaskService.bulk_create_tasks(
+                user=user,
+                items=[serializer.validated_data for serializer in valid],
+            )
+            if valid
+            else []
+        )
+
+        results = []
+        for index, serializer in enumerate(item_serializers):
+            outcome = next(created) if not serializer.errors else serializer.errors
+            if isinstance(outcome, Task):
+                results.append({"index": index, "status": "created", "task": TaskSerializer(outcome).data})
+            else:
+                results.append({"index": index, "status": "invalid", "errors": outcome})
+
+        created_count = sum(result["status"] == "created" for result in results)
+        if created_count == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif created_count:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(
+            {"created": created_count, "failed": len(results) - created_count, "results": results},
+            status=response_status,
+        )
+
+    @swagger_auto_schema(manual_parameters=[TENANT_HEADER])
+    @action(detail=False, methods=["post"], url_path="bulk-update")
+    def bulk_update(self, request):
+        """
+        Moves and/or reassigns a batch of tasks: a list (or
+        {"tasks": [...]}) of {"id", "status", "assigned_to"} items.
+        Changes are applied in order; invalid ones are skipped and
+        reported. 200 when none failed, 207 when some did, 400 when all.
+        """
+        user = self.get_user(request)
+        items, error = self._bulk_items(request)
+        if error is not None:
+            return error
+
+        item_serializers = [TaskBulkUpdateItemSerializer(data=item) for item in items]
+        valid = [serializer for serializer in item_serializers if serializer.is_valid()]
+        applied = iter(
+            TaskService.bulk_update_tasks(
+                user=user,
+                changes=[serializer.validated_data for serializer in valid],
+            )
+            if valid
+            else []
+        )
+
+        results = []
+        for index, serializer in enumerate(item_serializers):
+            outcome = next(applied) if not serializer.errors else {"result": "invalid", "errors": serializer.errors}
+            if "task" in outcome:
+                results.append({"index": index, "status": outcome["result"], "task": TaskSerializer(outcome["task"]).data})
+            else:
+                results.append({"index": index, "status": "invalid", "errors": outcome["errors"]})
+
+        failed = sum(result["status"] == "invalid" for result in results)
+        if not failed:
+            response_status = status.HTTP_200_OK
+        elif failed < len(results):
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(
+            {
+                "updated": sum(result["status"] == "updated" for result in results),
+                "failed": failed,
+                "results": results,
+            },
+            status=response_status,
+        )
+
+    def _bulk_items(self, request):
+        """
+        The item list of a bulk request, or an error response.
+        """
+        items = request.data.get("tasks") if isinstance(request.data, dict) else request.data
+        max_items = int(getattr(settings, "TASK_BULK", {}).get("max_items", 5000))
+
+        if not isinstance(items, list) or not items:
+            return None, Response(
+                {"detail": "Expected a non-empty list of tasks"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > max_items:
+            return None, Response(
+                {"detail": f"At most {max_items} tasks per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return items, None
+
     @swagger_auto_schema(manual_parameters=[TENANT_HEADER])
     def partial_update(self, request, pk=None):
         user = self.get_user(request)
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
 
         task = get_object_or_404(
             Task.objects.using(db),
@@ -88,11 +219,15 @@ class TaskViewSet(ViewSet):
             if k in allowed_fields
         }
 
-        updated_task = TaskService.update_task(
-            user=user,
-            task=task,
-            **updates,
-        )
+        try:
+            updated_task = TaskService.update_task(
+                user=user,
+                task=task,
+                **updates,
+            )
+        except Task.DoesNotExist:
+            # Deleted since it was loaded above.
+            raise Http404
 
         return Response(TaskSerializer(updated_task).data)
 
@@ -101,15 +236,16 @@ class TaskViewSet(ViewSet):
     @action(detail=True, methods=["get"])
     def audit(self, request, pk=None):
         user = self.get_user(request)
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
 
         task = get_object_or_404(
             Task.objects.using(db),
             pk=pk,
         )
 
-        activities = task.activities.all().order_by("-created_at")
-        return Response(
+        paginator = KeysetPagination()
+        activities = paginator.paginate_queryset(task.activities.all(), request, view=self)
+        return paginator.get_paginated_response(
             TaskActivitySerializer(activities, many=True).data
         )
 
@@ -117,7 +253,7 @@ class TaskViewSet(ViewSet):
     @action(detail=True, methods=["get"])
     def sla(self, request, pk=None):
         user = self.get_user(request)
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
 
         task = get_object_or_404(
             Task.objects.using(db),
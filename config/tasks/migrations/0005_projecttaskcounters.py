@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_project_created_by'),
+        ('tasks', '0004_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectTaskCounters',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_counters', serialize=False, to='projects.project')),
+                ('tasks_open', models.IntegerField(default=0)),
+                ('tasks_in_progress', models.IntegerField(default=0)),
+                ('tasks_blocked', models.IntegerField(default=0)),
+                ('tasks_done', models.IntegerField(default=0)),
+                ('day', models.DateField()),
+                ('tasks_created', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('sla_tasks', models.IntegerField(default=0)),
+                ('in_progress_seconds', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
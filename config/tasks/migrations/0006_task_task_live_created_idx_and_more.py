@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_project_live_created_idx'),
+        ('tasks', '0005_projecttaskcounters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at', '-id'], name='task_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['project', '-created_at', '-id'], name='task_live_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskactivity',
+            index=models.Index(fields=['task', '-created_at', '-id'], name='taskactivity_task_created_idx'),
+        ),
+    ]
@@ -1,8 +1,15 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 from projects.models import Project
 from system.models import User
 
 
+# Full-text document of a task, shared by the GIN index and the task
+# list's ``search`` filter: the query must repeat the index expression.
+TASK_SEARCH_VECTOR = SearchVector("title", "description", config="simple")
+
+
 class Task(models.Model):
     class Status(models.TextChoices):
         OPEN = "OPEN"
@@ -31,6 +38,38 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Keyset pagination, filters and sort keys of the task list. All
+        # but the search index skip soft-deleted tasks.
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_deleted=False),
+                name="task_live_created_idx",
+            ),
+            models.Index(
+                fields=["project", "-created_at", "-id"],
+                condition=models.Q(is_deleted=False),
+                name="task_live_project_created_idx",
+            ),
+            models.Index(
+                fields=["-updated_at", "-id"],
+                condition=models.Q(is_deleted=False),
+                name="task_live_updated_idx",
+            ),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                condition=models.Q(is_deleted=False),
+                name="task_live_status_created_idx",
+            ),
+            models.Index(
+                fields=["assigned_to", "status"],
+                condition=models.Q(is_deleted=False),
+                name="task_live_assignee_status_idx",
+            ),
+            GinIndex(TASK_SEARCH_VECTOR, name="task_search_idx"),
+        ]
+
 
 
 class TaskActivity(models.Model):
@@ -67,6 +106,9 @@ class TaskActivity(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["task", "-created_at", "-id"], name="taskactivity_task_created_idx"),
+        ]
     def __str__(self):
         return f"TaskActivity(id={self.id}, action={self.action}, task_id={self.task.id})"
     
@@ -89,3 +131,36 @@ class TaskSLA(models.Model):
     last_status_changed_at = models.DateTimeField()
 
     updated_at = models.DateTimeField(auto_now=True)
+
+
+class ProjectTaskCounters(models.Model):
+    """
+    Task counts per project, kept current by TaskService in the same
+    transaction as every task write (TaskCounterService), so analytics
+    read one row instead of counting tasks.
+    """
+    _tenant_model = True
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_counters",
+    )
+
+    tasks_open = models.IntegerField(default=0)
+    tasks_in_progress = models.IntegerField(default=0)
+    tasks_blocked = models.IntegerField(default=0)
+    tasks_done = models.IntegerField(default=0)
+
+    # Tasks created / completed on ``day``; restart at the first write
+    # of a new day.
+    day = models.DateField()
+    tasks_created = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+
+    # TaskSLA rows and the sum of their in_progress_seconds, for the
+    # average completion time.
+    sla_tasks = models.IntegerField(default=0)
+    in_progress_seconds = models.BigIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
@@ -1,7 +1,11 @@
+from typing import List
+
 from celery import shared_task
-from django.core.mail import send_mail
+from django.core.mail import send_mail, send_mass_mail
+from system.db_registry import get_tenant_db
 from system.models import User
 from tasks.models import Task
+from users.models import TenantUser
 
 
 @shared_task(bind=True, max_retries=3)
@@ -41,3 +45,64 @@ def notify_status_change(self, task_id: int, old_status: str, new_status: str):
             send_mail(subject, message, 'no-reply@example.com', [task.assigned_to.email])
         except Exception:
             print(f"Notification (status) for task={task.id} to {task.assigned_to.username}")
+
+
+@shared_task(bind=True, max_retries=3)
+def notify_task_changes(self, *, actor_id: int, assignments: List[List], status_changes: List[List]):
+    """
+    Notifications for a batch of task changes (TaskService.bulk_update_tasks).
+
+    ``assignments`` are [tenant_user_id, task_id] pairs and
+    ``status_changes`` [task_id, old_status, new_status] triples; like
+    ``Task.assigned_to``, assignees are TenantUser ids and are mapped to
+    their auth users before mailing. The actor, tasks, tenant users and
+    users are loaded in bulk (four queries in all) and every mail goes
+    out over one connection.
+    """
+    actor = User.objects.filter(id=actor_id).first()
+    if actor is None:
+        return
+    db = get_tenant_db(actor)
+
+    task_ids = {task_id for _, task_id in assignments} | {task_id for task_id, _, _ in status_changes}
+    tasks = Task.objects.using(db).in_bulk(task_ids)
+    # Status changes go to the task's assignee.
+    tenant_user_ids = {tenant_user_id for tenant_user_id, _ in assignments}
+    tenant_user_ids |= {task.assigned_to for task in tasks.values() if task.assigned_to}
+    auth_users = dict(
+        TenantUser.objects.using(db)
+        .filter(id__in=tenant_user_ids, tenant=actor.tenant_id)
+        .values_list("id", "auth_user")
+    )
+    users = User.objects.in_bulk(set(auth_users.values()))
+
+    def recipient(tenant_user_id):
+        return users.get(auth_users.get(tenant_user_id))
+
+    messages = []
+    for tenant_user_id, task_id in assignments:
+        user, task = recipient(tenant_user_id), tasks.get(task_id)
+        if user and task and user.email:
+            messages.append((
+                f"You've been assigned to task: {task.title}",
+                f"Hi {user.username},\n\nYou have been assigned to task '{task.title}'.",
+                'no-reply@example.com',
+                [user.email],
+            ))
+    for task_id, old_status, new_status in status_changes:
+        task = tasks.get(task_id)
+        user = recipient(task.assigned_to) if task else None
+        if user and user.email:
+            messages.append((
+                f"Task status changed: {task.title}",
+                f"Task '{task.title}' changed from {old_status} to {new_status}.",
+                'no-reply@example.com',
+                [user.email],
+            ))
+
+    if not messages:
+        return
+    try:
+        send_mass_mail(messages)
+    except Exception:
+        print(f"Notifications (batch) for {len(messages)} task changes")
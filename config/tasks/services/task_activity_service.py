@@ -1,6 +1,6 @@
 from tasks.models import TaskActivity, Task
 from system.models import User
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class TaskActivityService:
@@ -31,3 +31,34 @@ class TaskActivityService:
             comment=comment,
             performed_by=user_id,
         )
+
+    @staticmethod
+    def log_many(
+        *,
+        db,
+        entries: List[Dict[str, Any]],
+        user_id: Optional[User.id],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """
+        Logs many actions with batched INSERTs. Each entry holds the
+        ``log`` arguments: task, action and optionally old_value,
+        new_value and comment.
+
+        Time: O(N / batch_size) queries where N = entries
+        Space: O(N)
+        """
+        TaskActivity.objects.using(db).bulk_create(
+            [
+                TaskActivity(
+                    task=entry["task"],
+                    action=entry["action"],
+                    old_value=entry.get("old_value"),
+                    new_value=entry.get("new_value"),
+                    comment=entry.get("comment", ""),
+                    performed_by=user_id,
+                )
+                for entry in entries
+            ],
+            batch_size=batch_size,
+        )
@@ -0,0 +1,166 @@
+from typing import Dict, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from tasks.models import ProjectTaskCounters, Task, TaskSLA
+
+STATUS_FIELDS = {
+    Task.Status.OPEN: "tasks_open",
+    Task.Status.IN_PROGRESS: "tasks_in_progress",
+    Task.Status.BLOCKED: "tasks_blocked",
+    Task.Status.DONE: "tasks_done",
+}
+
+COUNTER_FIELDS = (
+    *STATUS_FIELDS.values(),
+    "tasks_created",
+    "tasks_completed",
+    "sla_tasks",
+    "in_progress_seconds",
+)
+
+
+class TaskCounterService:
+    """
+    Maintains ProjectTaskCounters incrementally.
+
+    Writers call ``apply`` with their deltas inside the transaction of
+    the task write; ``recount`` rebuilds a row from the tasks (lazily for
+    projects without one, and from ``reconcile_task_counters`` to repair
+    drift).
+    """
+
+    @staticmethod
+    def apply(
+        *,
+        db: str,
+        project_id: int,
+        status: Optional[Dict[str, int]] = None,
+        created: int = 0,
+        completed: int = 0,
+        sla_tasks: int = 0,
+        in_progress_seconds: int = 0,
+    ) -> None:
+        """
+        Adds the deltas to the project's counters: ``status`` maps task
+        statuses to count deltas, ``created``/``completed`` count towards
+        today. Call inside the write's transaction, after the write.
+
+        Time: O(1), one UPDATE (a recount the first time per project)
+        Space: O(1)
+        """
+        today = timezone.localdate()
+        updates = {
+            STATUS_FIELDS[task_status]: F(STATUS_FIELDS[task_status]) + delta
+            for task_status, delta in (status or {}).items()
+            if delta
+        }
+        if sla_tasks:
+            updates["sla_tasks"] = F("sla_tasks") + sla_tasks
+        if in_progress_seconds:
+            updates["in_progress_seconds"] = F("in_progress_seconds") + in_progress_seconds
+        for field, delta in (("tasks_created", created), ("tasks_completed", completed)):
+            updates[field] = Case(
+                When(day=today, then=F(field) + delta),
+                default=Value(max(delta, 0)),
+            )
+        updates["day"] = today
+        updates["updated_at"] = timezone.now()
+
+        counters = ProjectTaskCounters.objects.using(db).filter(project_id=project_id)
+        if counters.update(**updates):
+            return
+
+        # First write since the counters existed: count everything,
+        # including this transaction's own write.
+        try:
+            with transaction.atomic(using=db):
+                ProjectTaskCounters.objects.using(db).create(
+                    project_id=project_id,
+                    day=today,
+                    **TaskCounterService._count(db=db, project_id=project_id, today=today),
+                )
+        except IntegrityError:
+            # A concurrent writer created the row first; its count does
+            # not include this write.
+            counters.update(**updates)
+
+    @staticmethod
+    def recount(*, db: str, project_id: int) -> Dict[str, Tuple[int, int]]:
+        """
+        Recounts the project's counters from its tasks and stores them.
+        Returns the fields that had drifted as ``{field: (stored, actual)}``.
+
+        The row is locked while counting, so concurrent ``apply`` calls
+        queue behind the recount instead of being overwritten.
+
+        Time: O(T) where T = tasks in the project
+        Space: O(1)
+        """
+        today = timezone.localdate()
+        with transaction.atomic(using=db):
+            counters = (
+                ProjectTaskCounters.objects.using(db)
+                .select_for_update()
+                .filter(project_id=project_id)
+                .first()
+            )
+            actual = TaskCounterService._count(db=db, project_id=project_id, today=today)
+
+            if counters is None:
+                ProjectTaskCounters.objects.using(db).create(project_id=project_id, day=today, **actual)
+                return {}
+
+            stored = TaskCounterService.values(counters, today=today)
+            drift = {field: (stored[field], actual[field]) for field in COUNTER_FIELDS if stored[field] != actual[field]}
+            if drift or counters.day != today:
+                for field, value in actual.items():
+                    setattr(counters, field, value)
+                counters.day = today
+                counters.save(using=db)
+            return drift
+
+    @staticmethod
+    def current(*, db: str, project_id: int) -> Dict[str, int]:
+        """
+        The project's counters as of today, creating them if needed.
+
+        Time: O(1) (O(T) the first time per project)
+        Space: O(1)
+        """
+        counters = ProjectTaskCounters.objects.using(db).filter(project_id=project_id).first()
+        if counters is None:
+            TaskCounterService.recount(db=db, project_id=project_id)
+            counters = ProjectTaskCounters.objects.using(db).get(project_id=project_id)
+        return TaskCounterService.values(counters, today=timezone.localdate())
+
+    @staticmethod
+    def values(counters: ProjectTaskCounters, *, today) -> Dict[str, int]:
+        values = {field: getattr(counters, field) for field in COUNTER_FIELDS}
+        if counters.day != today:
+            values["tasks_created"] = values["tasks_completed"] = 0
+        return values
+
+    @staticmethod
+    def _count(*, db: str, project_id: int, today) -> Dict[str, int]:
+        counts = Task.objects.using(db).filter(project_id=project_id, is_deleted=False).aggregate(
+            **{field: Count("id", filter=Q(status=task_status)) for task_status, field in STATUS_FIELDS.items()},
+            tasks_created=Count("id", filter=Q(created_at__date=today)),
+            # Moved to DONE today; updated_at also moves on later edits.
+            tasks_completed=Count(
+                "id",
+                filter=Q(status=Task.Status.DONE, sla__last_status_changed_at__date=today),
+            ),
+        )
+        counts.update(
+            TaskSLA.objects.using(db)
+            .filter(task__project_id=project_id)
+            .aggregate(
+                sla_tasks=Count("id"),
+                in_progress_seconds=Coalesce(Sum("in_progress_seconds"), 0),
+            )
+        )
+        return counts
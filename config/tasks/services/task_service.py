@@ -1,17 +1,23 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
 from django.utils import timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 
-from tasks.models import Task, TaskSLA
+from tasks.models import TASK_SEARCH_VECTOR, Task, TaskSLA
 from tasks.services.task_activity_service import TaskActivityService
+from tasks.services.task_counter_service import TaskCounterService
 from projects.models import Project
 from config.permissions import Permissions
 from system.tenant_context import set_current_tenant_db as set_current_tenant
 from system.models import User
-from system.db_registry import ensure_tenant_db_registered
-# Import Celery tasks (created in analytics.tasks)
-from analytics.tasks import generate_project_snapshot
-from tasks.notifications import notify_assignment, notify_status_change
+from system.db_registry import get_tenant_db
+from system.read_replicas import get_tenant_read_db
+from analytics.services.snapshot_refresh import SnapshotRefreshService
+from tasks.notifications import notify_assignment, notify_status_change, notify_task_changes
 from users.models import TenantUser
 
 class TaskService:
@@ -21,6 +27,14 @@ class TaskService:
         Task.Status.BLOCKED: [Task.Status.IN_PROGRESS],
     }
 
+    # Sort keys accepted by list_tasks and the keyset each one pages on;
+    # every key is backed by an index on Task.
+    LIST_ORDERINGS = {
+        "created_at": ("created_at", "id"),
+        "-created_at": ("-created_at", "-id"),
+        "updated_at": ("updated_at", "id"),
+        "-updated_at": ("-updated_at", "-id"),
+    }
 
     @staticmethod
     def _validate_assignment(*, actor: User, assignee: Optional[TenantUser]) -> int:
@@ -35,16 +49,59 @@ class TaskService:
 
         # Member can only assign to themselves
         if actor.role == User.Role.MEMBER:
-            if assignee.id != actor.id:
+            if assignee.auth_user != actor.id:
                 raise PermissionDenied(
                     "Members can only assign tasks to themselves"
                 )
 
         return assignee.id
 
+    @staticmethod
+    def _tenant_assignees(*, db: str, user: User, ids) -> Dict[int, int]:
+        """
+        Maps the ids among ``ids`` that are TenantUsers of ``user``'s
+        tenant to their auth user ids (``Task.assigned_to`` holds
+        TenantUser ids). ``None`` is ignored.
+
+        Time: O(K), one query when any id is given
+        Space: O(K)
+        """
+        ids = {assignee_id for assignee_id in ids if assignee_id is not None}
+        if not ids:
+            return {}
+        return dict(
+            TenantUser.objects.using(db)
+            .filter(id__in=ids, tenant=user.tenant_id)
+            .values_list("id", "auth_user")
+        )
+
+    @staticmethod
+    def _record_sla_transition(sla: TaskSLA, new_status: str, now) -> int:
+        """
+        Adds the time spent in the status being left to its total and
+        starts timing ``new_status``. Does not save. Returns the seconds
+        added to ``in_progress_seconds``.
+
+        Time: O(1)
+        Space: O(1)
+        """
+        elapsed = int((now - sla.last_status_changed_at).total_seconds()) if sla.last_status_changed_at else 0
+        left = sla.last_status
+
+        if left == Task.Status.OPEN:
+            sla.open_seconds += elapsed
+        elif left == Task.Status.IN_PROGRESS:
+            sla.in_progress_seconds += elapsed
+        elif left == Task.Status.BLOCKED:
+            sla.blocked_seconds += elapsed
+
+        sla.last_status = new_status
+        sla.last_status_changed_at = now
+        return elapsed if left == Task.Status.IN_PROGRESS else 0
+
     @staticmethod
     def get_task(*, user, task_id):
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
         set_current_tenant(db)
         return Task.objects.using(db).get(id=task_id, is_deleted=False)
 
@@ -53,7 +110,7 @@ class TaskService:
         if not Permissions.can_create_task(user):
             raise PermissionDenied("Not allowed to create tasks")
 
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
         set_current_tenant(db)
 
         assignee_id = TaskService._validate_assignment(
@@ -61,123 +118,255 @@ class TaskService:
             assignee=assigned_to,
         )
 
-        task = Task.objects.using(db).create(
-            project=project, 
-            title=title,
-            description = description,
-            assigned_to = assignee_id
-        )
+        with transaction.atomic(using=db):
+            task = Task.objects.using(db).create(
+                project=project, 
+                title=title,
+                description = description,
+                assigned_to = assignee_id
+            )
 
-        TaskActivityService.log(
-            db=db,
-            task=task,
-            action="CREATE",
-            user_id=user.id,
-        )
+            TaskActivityService.log(
+                db=db,
+                task=task,
+                action="CREATE",
+                user_id=user.id,
+            )
 
-        # Initialize SLA tracking for the task
-        TaskSLA.objects.using(db).create(
-            task=task,
-            last_status=task.status,
-            last_status_changed_at=timezone.now(),
-            open_seconds=0,
-            in_progress_seconds=0,
-            blocked_seconds=0,
-        )
+            # Initialize SLA tracking for the task
+            TaskSLA.objects.using(db).create(
+                task=task,
+                last_status=task.status,
+                last_status_changed_at=timezone.now(),
+                open_seconds=0,
+                in_progress_seconds=0,
+                blocked_seconds=0,
+            )
 
-        # Trigger async analytics update for the project (idempotent)
-        try:
-            generate_project_snapshot(
+            TaskCounterService.apply(
                 db=db,
                 project_id=project.id,
+                status={task.status: 1},
+                created=1,
+                sla_tasks=1,
             )
-        except Exception:
-            pass
 
+        # Debounced, asynchronous analytics update for the project
+        SnapshotRefreshService.mark_dirty(tenant_id=user.tenant_id, project_id=project.id)
 
         return task
-    
+
     @staticmethod
-    def list_tasks(*, user, project_id=None):
-        db = ensure_tenant_db_registered(user.tenant)
+    def bulk_create_tasks(*, user, items: List[Dict[str, Any]]) -> List[Union[Task, Dict[str, List[str]]]]:
+        """
+        Creates many tasks at once: permissions are checked once, the
+        projects and the tenant's assignees are loaded in one query each,
+        and tasks, CREATE activities and SLA rows are written with batched
+        INSERTs in one transaction. Each affected project is marked for
+        one (debounced) snapshot refresh.
+
+        ``items`` are field-validated dicts (project, title, description,
+        assigned_to). Returns one entry per item, in order: the created
+        Task, or a dict of errors for items that were skipped.
+
+        Time: O(N / batch_size) queries where N = items
+        Space: O(N)
+        """
+        if not Permissions.can_create_task(user):
+            raise PermissionDenied("Not allowed to create tasks")
+
+        db = get_tenant_db(user)
+        set_current_tenant(db)
+
+        projects = Project.objects.using(db).in_bulk({item["project"] for item in items})
+        assignees = TaskService._tenant_assignees(
+            db=db,
+            user=user,
+            ids={item.get("assigned_to") for item in items},
+        )
+        results = []
+        tasks = []
+
+        for item in items:
+            assignee_id = item.get("assigned_to")
+            if item["project"] not in projects:
+                results.append({"project": ["Project not found"]})
+            elif assignee_id is not None and assignee_id not in assignees:
+                results.append({"assigned_to": ["User not found"]})
+            elif assignee_id is not None and user.role == User.Role.MEMBER and assignees[assignee_id] != user.id:
+                results.append({"assigned_to": ["Members can only assign tasks to themselves"]})
+            else:
+                task = Task(
+                    project=projects[item["project"]],
+                    title=item["title"],
+                    description=item.get("description", ""),
+                    assigned_to=assignee_id,
+                )
+                tasks.append(task)
+                results.append(task)
+
+        if not tasks:
+            return results
+
+        batch_size = int(getattr(settings, "TASK_BULK", {}).get("batch_size", 500))
+        now = timezone.now()
+
+        with transaction.atomic(using=db):
+            Task.objects.using(db).bulk_create(tasks, batch_size=batch_size)
+            TaskActivityService.log_many(
+                db=db,
+                entries=[{"task": task, "action": "CREATE"} for task in tasks],
+                user_id=user.id,
+                batch_size=batch_size,
+            )
+            TaskSLA.objects.using(db).bulk_create(
+                [
+                    TaskSLA(task=task, last_status=task.status, last_status_changed_at=now)
+                    for task in tasks
+                ],
+                batch_size=batch_size,
+            )
+
+            created = Counter(task.project_id for task in tasks)
+            for project_id, count in sorted(created.items()):
+                TaskCounterService.apply(
+                    db=db,
+                    project_id=project_id,
+                    status={Task.Status.OPEN: count},
+                    created=count,
+                    sla_tasks=count,
+                )
+
+        for project_id in sorted({task.project_id for task in tasks}):
+            SnapshotRefreshService.mark_dirty(tenant_id=user.tenant_id, project_id=project_id)
+
+        return results
+
+    @staticmethod
+    def list_tasks(
+        *,
+        user,
+        project_id=None,
+        status: Optional[str] = None,
+        assigned_to: Optional[int] = None,
+        created_after=None,
+        created_before=None,
+        updated_after=None,
+        updated_before=None,
+        search: Optional[str] = None,
+        sort: str = "-created_at",
+    ):
+        """
+        Live tasks matching every given filter, ordered by ``sort`` (a
+        key of LIST_ORDERINGS). Date bounds are inclusive; ``search``
+        matches words of the title and description.
+
+        Time: O(log N + K) per page through the Task indexes
+        Space: O(1)
+        """
+        db = get_tenant_read_db(user)
         set_current_tenant(db)
 
         qs = Task.objects.using(db).filter(is_deleted=False)
 
         if project_id:
             qs = qs.filter(project_id=project_id)
+        if status:
+            qs = qs.filter(status=status)
+        if assigned_to is not None:
+            qs = qs.filter(assigned_to=assigned_to)
+        if created_after:
+            qs = qs.filter(created_at__gte=created_after)
+        if created_before:
+            qs = qs.filter(created_at__lte=created_before)
+        if updated_after:
+            qs = qs.filter(updated_at__gte=updated_after)
+        if updated_before:
+            qs = qs.filter(updated_at__lte=updated_before)
+        if search:
+            qs = qs.annotate(search_vector=TASK_SEARCH_VECTOR).filter(
+                search_vector=SearchQuery(search, config="simple")
+            )
 
-        return qs.order_by("-created_at")
+        return qs.order_by(*TaskService.LIST_ORDERINGS[sort])
 
     @staticmethod
     def update_task(*, user, task: Task, **updates) -> Task:
         if not Permissions.can_update_task_status(user): 
             raise PermissionDenied("Not allowed to update tasks")
 
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
         set_current_tenant(db)
         old_values = {}
 
-        # Handle status change specially to update SLA and emit background jobs
-        if 'status' in updates:
-            new_status = updates['status']
-
-            # Idempotent: no-op if same status
-            if new_status == task.status:
-                return task
-
-            # Validate allowed transition
-            if new_status not in TaskService.ALLOWED_TRANSITIONS.get(task.status, []):
-                raise ValueError("Invalid status transition")
-
-            # record old value and set
-            old_values['status'] = task.status
-            task.status = new_status
-
-            # Update SLA timings
-            now = timezone.now()
-            try:
-                sla = task.sla
-            except TaskSLA.DoesNotExist:
-                sla = TaskSLA.objects.using(db).create(
+        with transaction.atomic(using=db):
+            # Lock the row and work from its committed state, so that
+            # concurrent updates of one task apply their transitions (and
+            # counter deltas) one after the other.
+            task = Task.objects.using(db).select_for_update().get(pk=task.pk, is_deleted=False)
+
+            # Handle status change specially to update SLA and emit background jobs
+            if 'status' in updates:
+                new_status = updates['status']
+
+                # Idempotent: no-op if same status
+                if new_status == task.status:
+                    return task
+
+                # Validate allowed transition
+                if new_status not in TaskService.ALLOWED_TRANSITIONS.get(task.status, []):
+                    raise ValueError("Invalid status transition")
+
+            counter_deltas = {}
+
+            if 'status' in updates:
+                # record old value and set
+                old_values['status'] = task.status
+                task.status = new_status
+
+                # Update SLA timings
+                now = timezone.now()
+                try:
+                    sla = task.sla
+                except TaskSLA.DoesNotExist:
+                    sla = TaskSLA.objects.using(db).create(
+                        task=task,
+                        last_status=old_values['status'],
+                        last_status_changed_at=now,
+                    )
+                    counter_deltas["sla_tasks"] = 1
+
+                counter_deltas["in_progress_seconds"] = TaskService._record_sla_transition(sla, new_status, now)
+                sla.save()
+
+                counter_deltas["status"] = {old_values['status']: -1, new_status: 1}
+                if new_status == Task.Status.DONE:
+                    counter_deltas["completed"] = 1
+
+            # Handle other updatable fields
+            for field in ['title', 'description', 'assigned_to']:
+                if field in updates:
+                    old_values[field] = getattr(task, field)
+                    setattr(task, field, updates[field])
+
+            task.save()
+
+            if counter_deltas:
+                TaskCounterService.apply(db=db, project_id=task.project_id, **counter_deltas)
+
+            # Log the update or status change
+            if old_values:
+                action = "STATUS_CHANGE" if 'status' in old_values else "UPDATE"
+                TaskActivityService.log(
+                    db=db,
                     task=task,
-                    last_status=old_values['status'],
-                    last_status_changed_at=now,
+                    action=action,
+                    user_id=user.id,
+                    old_value=str(old_values),
+                    new_value=str(updates),
                 )
 
-            elapsed = int((now - sla.last_status_changed_at).total_seconds()) if sla.last_status_changed_at else 0
-
-            if sla.last_status == Task.Status.OPEN:
-                sla.open_seconds += elapsed
-            elif sla.last_status == Task.Status.IN_PROGRESS:
-                sla.in_progress_seconds += elapsed
-            elif sla.last_status == Task.Status.BLOCKED:
-                sla.blocked_seconds += elapsed
-
-            sla.last_status = new_status
-            sla.last_status_changed_at = now
-            sla.save()
-
-        # Handle other updatable fields
-        for field in ['title', 'description', 'assigned_to']:
-            if field in updates:
-                old_values[field] = getattr(task, field)
-                setattr(task, field, updates[field])
-
-        task.save()
-
-        # Log the update or status change
         if old_values:
-            action = "STATUS_CHANGE" if 'status' in old_values else "UPDATE"
-            TaskActivityService.log(
-                db=db,
-                task=task,
-                action=action,
-                user_id=user.id,
-                old_value=str(old_values),
-                new_value=str(updates),
-            )
-
             # Fire notifications asynchronously for relevant changes
             try:
                 if 'assigned_to' in old_values and task.assigned_to is not None:
@@ -192,30 +381,221 @@ class TaskService:
             except Exception:
                 pass
 
-        try:
-            generate_project_snapshot(
+        SnapshotRefreshService.mark_dirty(tenant_id=user.tenant_id, project_id=task.project_id)
+
+        return task
+
+    @staticmethod
+    def bulk_update_tasks(*, user, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Applies status transitions and reassignments to many tasks at once.
+
+        Tasks and their SLA rows are loaded and row-locked in one query,
+        every change is checked in memory against ALLOWED_TRANSITIONS and
+        the assignment rules, then tasks and SLAs are written with one
+        UPDATE ... CASE per batch and the activities with batched INSERTs.
+        After commit, one Celery task sends every notification and each
+        affected project is marked for a snapshot refresh.
+
+        ``changes`` are field-validated dicts with ``id`` plus ``status``
+        and/or ``assigned_to``; they apply in order. Returns one entry per
+        change: ``{"result": "updated" | "unchanged", "task": Task}`` or
+        ``{"result": "invalid", "errors": {...}}``.
+
+        Time: O(N / batch_size) queries where N = changes
+        Space: O(N)
+        """
+        if not Permissions.can_update_task_status(user):
+            raise PermissionDenied("Not allowed to update tasks")
+
+        db = get_tenant_db(user)
+        set_current_tenant(db)
+        batch_size = int(getattr(settings, "TASK_BULK", {}).get("batch_size", 500))
+        now = timezone.now()
+
+        results = []
+        updated = {}
+        slas = {}
+        new_slas = {}
+        counter_deltas = defaultdict(lambda: {"status": Counter(), "completed": 0, "sla_tasks": 0, "in_progress_seconds": 0})
+        activities = []
+        assignments = []
+        status_changes = []
+
+        with transaction.atomic(using=db):
+            tasks = (
+                Task.objects.using(db)
+                .filter(is_deleted=False)
+                .select_related("sla", "project")
+                .select_for_update(of=("self",))
+                .in_bulk({change["id"] for change in changes})
+            )
+            assignees = TaskService._tenant_assignees(
                 db=db,
-                project_id=task.project.id,
+                user=user,
+                ids={change.get("assigned_to") for change in changes},
+            )
+
+            for change in changes:
+                task = tasks.get(change["id"])
+                if task is None:
+                    results.append({"result": "invalid", "errors": {"id": ["Task not found"]}})
+                    continue
+
+                errors = {}
+                old_values = {}
+                new_values = {}
+
+                new_status = change.get("status", task.status)
+                if new_status != task.status:
+                    if new_status in TaskService.ALLOWED_TRANSITIONS.get(task.status, []):
+                        old_values["status"], new_values["status"] = task.status, new_status
+                    else:
+                        errors["status"] = [f"Invalid status transition from {task.status} to {new_status}"]
+
+                if "assigned_to" in change and change["assigned_to"] != task.assigned_to:
+                    assignee_id = change["assigned_to"]
+                    if assignee_id is not None and assignee_id not in assignees:
+                        errors["assigned_to"] = ["User not found"]
+                    elif assignee_id is not None and user.role == User.Role.MEMBER and assignees[assignee_id] != user.id:
+                        errors["assigned_to"] = ["Members can only assign tasks to themselves"]
+                    else:
+                        old_values["assigned_to"], new_values["assigned_to"] = task.assigned_to, assignee_id
+
+                if errors:
+                    results.append({"result": "invalid", "errors": errors})
+                    continue
+                if not new_values:
+                    results.append({"result": "unchanged", "task": task})
+                    continue
+
+                if "status" in new_values:
+                    deltas = counter_deltas[task.project_id]
+                    try:
+                        sla = task.sla
+                        slas[sla.pk] = sla
+                    except TaskSLA.DoesNotExist:
+                        if task.id not in new_slas:
+                            new_slas[task.id] = TaskSLA(
+                                task=task,
+                                last_status=task.status,
+                                last_status_changed_at=now,
+                            )
+                            deltas["sla_tasks"] += 1
+                        sla = new_slas[task.id]
+                    deltas["in_progress_seconds"] += TaskService._record_sla_transition(sla, new_status, now)
+                    sla.updated_at = now
+                    deltas["status"][task.status] -= 1
+                    deltas["status"][new_status] += 1
+                    if new_status == Task.Status.DONE:
+                        deltas["completed"] += 1
+                    task.status = new_status
+                    status_changes.append([task.id, old_values["status"], new_status])
+
+                if "assigned_to" in new_values:
+                    task.assigned_to = new_values["assigned_to"]
+                    if task.assigned_to is not None:
+                        assignments.append([task.assigned_to, task.id])
+
+                task.updated_at = now
+                updated[task.id] = task
+                activities.append(
+                    {
+                        "task": task,
+                        "action": "STATUS_CHANGE" if "status" in old_values else "UPDATE",
+                        "old_value": str(old_values),
+                        "new_value": str(new_values),
+                    }
+                )
+                results.append({"result": "updated", "task": task})
+
+            if not updated:
+                return results
+
+            Task.objects.using(db).bulk_update(
+                updated.values(), ["status", "assigned_to", "updated_at"], batch_size=batch_size
+            )
+            if slas:
+                TaskSLA.objects.using(db).bulk_update(
+                    slas.values(),
+                    [
+                        "open_seconds",
+                        "in_progress_seconds",
+                        "blocked_seconds",
+                        "last_status",
+                        "last_status_changed_at",
+                        "updated_at",
+                    ],
+                    batch_size=batch_size,
+                )
+            if new_slas:
+                TaskSLA.objects.using(db).bulk_create(new_slas.values(), batch_size=batch_size)
+            TaskActivityService.log_many(db=db, entries=activities, user_id=user.id, batch_size=batch_size)
+
+            for project_id, deltas in sorted(counter_deltas.items()):
+                TaskCounterService.apply(db=db, project_id=project_id, **deltas)
+
+        try:
+            notify_task_changes.delay(
+                actor_id=user.id,
+                assignments=assignments,
+                status_changes=status_changes,
             )
         except Exception:
             pass
 
-        return task
+        for project_id in sorted({task.project_id for task in updated.values()}):
+            SnapshotRefreshService.mark_dirty(tenant_id=user.tenant_id, project_id=project_id)
+
+        return results
 
     @staticmethod
     def soft_delete(*, user: User, task: Task) -> None:
         if not Permissions.can_delete_task(user):
             raise PermissionDenied("Only admin can delete")
 
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
         set_current_tenant(db)
 
-        task.is_deleted = True
-        task.save(update_fields=["is_deleted"])
+        today = timezone.localdate()
+        with transaction.atomic(using=db):
+            # Lock the row and work from its committed state, as update_task
+            # does, so that racing writes cannot remove it from the counts twice.
+            locked = (
+                Task.objects.using(db)
+                .select_related("sla")
+                .select_for_update(of=("self",))
+                .filter(pk=task.pk, is_deleted=False)
+                .first()
+            )
+            if locked is None:
+                return
 
-        TaskActivityService.log(
-            db=db,
-            task=task,
-            action="DELETE",
-            user=user,
-        )
+            locked.is_deleted = task.is_deleted = True
+            locked.save(update_fields=["is_deleted"])
+
+            # Deleted tasks drop out of every count, today's included. A
+            # task counted as completed today moved to DONE today; later
+            # edits bump updated_at but not the SLA's status change time.
+            try:
+                completed_today = (
+                    locked.status == Task.Status.DONE
+                    and timezone.localdate(locked.sla.last_status_changed_at) == today
+                )
+            except TaskSLA.DoesNotExist:
+                completed_today = False
+
+            TaskCounterService.apply(
+                db=db,
+                project_id=locked.project_id,
+                status={locked.status: -1},
+                created=-int(timezone.localdate(locked.created_at) == today),
+                completed=-int(completed_today),
+            )
+
+            TaskActivityService.log(
+                db=db,
+                task=locked,
+                action="DELETE",
+                user_id=user.id,
+            )
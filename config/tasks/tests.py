@@ -30,7 +30,7 @@ class TaskServiceTestCase(TestCase):
         mock_set_tenant.return_value = None
 
         with patch('tasks.services.task_service.TaskActivityService.log'), \
-             patch('tasks.services.task_service.generate_project_snapshot.delay'), \
+             patch('tasks.services.task_service.SnapshotRefreshService.mark_dirty'), \
              patch('tasks.services.task_service.Permissions.can_create_task', return_value=True):
 
             task = TaskService.create_task(
@@ -75,7 +75,7 @@ class TaskServiceTestCase(TestCase):
 
         with patch('tasks.services.task_service.Permissions.can_update_task_status', return_value=True), \
              patch('tasks.services.task_service.TaskActivityService.log'), \
-             patch('tasks.services.task_service.generate_project_snapshot.delay'), \
+             patch('tasks.services.task_service.SnapshotRefreshService.mark_dirty'), \
              patch('tasks.services.task_service.notify_status_change.delay'):
 
             updated_task = TaskService.update_task(
@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection, connections
+from rest_framework.test import APIClient
+
+from analytics.services.snapshot_refresh import SnapshotRefreshService
+from system.db_pool import tenant_pools
+from system.db_registry import TenantConnectionRegistry
+from system.models import Tenant, User
+from system.services.db_utils import create_postgres_schema, drop_postgres_storage
+from system.services.migration_utils import migrate_tenant_database
+
+TENANT_SCHEMA = "tenant_schema_tasks"
+
+
+@pytest.fixture
+def tenant_alias(django_db_setup, django_db_blocker):
+    """
+    A migrated tenant schema inside the test database, registered as a
+    tenant alias. Writes to it are committed, so it is rebuilt per test.
+    """
+    params = connection.settings_dict
+    credentials = {
+        "db_name": params["NAME"],
+        "user": params["USER"],
+        "password": params["PASSWORD"],
+        "host": params["HOST"],
+        "port": params["PORT"],
+    }
+    registry = TenantConnectionRegistry(max_aliases=1, ttl_seconds=None)
+
+    with django_db_blocker.unblock():
+        create_postgres_schema(schema_name=TENANT_SCHEMA, **credentials)
+        registry.register(TENANT_SCHEMA, {"NAME": params["NAME"], "TENANT_SCHEMA": TENANT_SCHEMA})
+        migrate_tenant_database(TENANT_SCHEMA)
+
+        yield TENANT_SCHEMA
+
+        connections[TENANT_SCHEMA].close()
+        registry.clear()
+        tenant_pools.close_all()
+        drop_postgres_storage(schema_name=TENANT_SCHEMA, **credentials)
+
+
+@pytest.fixture
+def snapshots(monkeypatch, tenant_alias):
+    """
+    Points TaskService at ``tenant_alias``; projects marked for a
+    snapshot refresh are recorded instead.
+    """
+    refreshed = []
+    monkeypatch.setattr("tasks.services.task_service.get_tenant_db", lambda user: tenant_alias)
+    monkeypatch.setattr(
+        SnapshotRefreshService,
+        "mark_dirty",
+        staticmethod(lambda *, tenant_id, project_id: refreshed.append(project_id)),
+    )
+    return refreshed
+
+
+@pytest.fixture
+def client(db):
+    tenant = Tenant.objects.create(name="Bulk Tenant")
+    user = User.objects.create_user(username="bulk", password="pw", tenant=tenant, role=User.Role.ADMIN)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    client.user = user
+    return client
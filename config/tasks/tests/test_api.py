@@ -35,7 +35,7 @@ class TaskAPITestCase(APITestCase):
         response = self.client.get(url, {'project': self.project.id})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_create_task(self):
         url = reverse('task-list')
@@ -69,7 +69,7 @@ class TaskAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Should have at least the CREATE activity
-        self.assertGreater(len(response.data), 0)
+        self.assertGreater(len(response.data['results']), 0)
 
     def test_get_task_sla(self):
         task = Task.objects.create(project=self.project, title="Test Task")
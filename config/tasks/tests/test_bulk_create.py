@@ -0,0 +1,85 @@
+import uuid
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from projects.models import Project
+from tasks.models import Task, TaskActivity, TaskSLA
+from tasks.services.task_counter_service import TaskCounterService
+from users.models import TenantUser
+
+
+@pytest.mark.django_db
+def test_bulk_create_reports_per_item_results(client, snapshots, tenant_alias):
+    first = Project.objects.using(tenant_alias).create(name="First", created_by=client.user.id)
+    second = Project.objects.using(tenant_alias).create(name="Second", created_by=client.user.id)
+
+    response = client.post(
+        "/api/v1/tasks/bulk/",
+        {
+            "tasks": [
+                {"project": first.id, "title": "A"},
+                {"project": second.id, "title": "B", "description": "b"},
+                {"project": first.id},
+                {"project": 999999, "title": "C"},
+                {"project": first.id, "title": "D"},
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == 207
+    assert [result["status"] for result in response.data["results"]] == [
+        "created", "created", "invalid", "invalid", "created",
+    ]
+    assert "title" in response.data["results"][2]["errors"]
+    assert "project" in response.data["results"][3]["errors"]
+    assert Task.objects.using(tenant_alias).count() == 3
+    assert TaskActivity.objects.using(tenant_alias).filter(action="CREATE").count() == 3
+    assert TaskSLA.objects.using(tenant_alias).filter(last_status=Task.Status.OPEN).count() == 3
+    assert snapshots == sorted([first.id, second.id])
+
+
+@pytest.mark.django_db
+def test_bulk_create_query_count_does_not_grow_with_batch(client, snapshots, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Import", created_by=client.user.id)
+    # The first write to a project without counters counts its tasks.
+    TaskCounterService.recount(db=tenant_alias, project_id=project.id)
+
+    def post(count):
+        with CaptureQueriesContext(connections[tenant_alias]) as queries:
+            response = client.post(
+                "/api/v1/tasks/bulk/",
+                [{"project": project.id, "title": f"Task {i}"} for i in range(count)],
+                format="json",
+            )
+        assert response.status_code == 201
+        return len(queries)
+
+    assert post(3) == post(300)
+    assert Task.objects.using(tenant_alias).count() == 303
+
+
+@pytest.mark.django_db
+def test_bulk_create_rejects_assignees_outside_the_tenant(client, snapshots, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Staffed", created_by=client.user.id)
+    member = TenantUser.objects.using(tenant_alias).create(
+        auth_user=client.user.id, tenant=client.user.tenant_id, role="member"
+    )
+    outsider = TenantUser.objects.using(tenant_alias).create(auth_user=99, tenant=uuid.uuid4(), role="member")
+
+    response = client.post(
+        "/api/v1/tasks/bulk/",
+        [
+            {"project": project.id, "title": "Mine", "assigned_to": member.id},
+            {"project": project.id, "title": "Ghost", "assigned_to": 999999},
+            {"project": project.id, "title": "Theirs", "assigned_to": outsider.id},
+        ],
+        format="json",
+    )
+
+    assert response.status_code == 207
+    assert [result["status"] for result in response.data["results"]] == ["created", "invalid", "invalid"]
+    assert "assigned_to" in response.data["results"][1]["errors"]
+    assert list(Task.objects.using(tenant_alias).values_list("assigned_to", flat=True)) == [member.id]
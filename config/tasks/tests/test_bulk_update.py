@@ -0,0 +1,132 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from projects.models import Project
+from tasks.models import Task, TaskActivity, TaskSLA
+from tasks.services.task_counter_service import TaskCounterService
+from users.models import TenantUser
+
+
+@pytest.fixture
+def notifications(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        "tasks.services.task_service.notify_task_changes.delay",
+        lambda **kwargs: sent.append(kwargs),
+    )
+    return sent
+
+
+def _tasks(alias, project, count, status=Task.Status.OPEN):
+    tasks = Task.objects.using(alias).bulk_create(
+        [Task(project=project, title=f"Task {i}", status=status) for i in range(count)]
+    )
+    an_hour_ago = timezone.now() - timedelta(hours=1)
+    TaskSLA.objects.using(alias).bulk_create(
+        [TaskSLA(task=task, last_status=status, last_status_changed_at=an_hour_ago) for task in tasks]
+    )
+    return tasks
+
+
+@pytest.mark.django_db
+def test_bulk_update_applies_valid_changes(client, snapshots, notifications, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Board", created_by=client.user.id)
+    moved, reassigned, done, unchanged = _tasks(tenant_alias, project, 4)
+    member = TenantUser.objects.using(tenant_alias).create(
+        auth_user=client.user.id, tenant=client.user.tenant_id, role="member"
+    )
+
+    response = client.post(
+        "/api/v1/tasks/bulk-update/",
+        [
+            {"id": moved.id, "status": "IN_PROGRESS"},
+            {"id": reassigned.id, "assigned_to": member.id},
+            {"id": done.id, "status": "DONE"},
+            {"id": unchanged.id, "status": "OPEN"},
+            {"id": 999999, "status": "IN_PROGRESS"},
+            {"id": moved.id},
+        ],
+        format="json",
+    )
+
+    assert response.status_code == 207
+    assert [result["status"] for result in response.data["results"]] == [
+        "updated", "updated", "invalid", "unchanged", "invalid", "invalid",
+    ]
+    assert "status" in response.data["results"][2]["errors"]
+
+    moved.refresh_from_db(using=tenant_alias)
+    reassigned.refresh_from_db(using=tenant_alias)
+    assert moved.status == Task.Status.IN_PROGRESS
+    assert reassigned.assigned_to == member.id
+
+    sla = TaskSLA.objects.using(tenant_alias).get(task=moved)
+    assert sla.last_status == Task.Status.IN_PROGRESS
+    assert sla.open_seconds >= 3600 - 2
+    assert set(TaskActivity.objects.using(tenant_alias).values_list("task_id", "action")) == {
+        (moved.id, "STATUS_CHANGE"),
+        (reassigned.id, "UPDATE"),
+    }
+
+    assert notifications == [
+        {
+            "actor_id": client.user.id,
+            "assignments": [[member.id, reassigned.id]],
+            "status_changes": [[moved.id, "OPEN", "IN_PROGRESS"]],
+        }
+    ]
+    assert snapshots == [project.id]
+
+
+@pytest.mark.django_db
+def test_bulk_update_rejects_assignees_outside_the_tenant(client, snapshots, notifications, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Staffed", created_by=client.user.id)
+    mine, ghost, theirs = _tasks(tenant_alias, project, 3)
+    member = TenantUser.objects.using(tenant_alias).create(
+        auth_user=client.user.id, tenant=client.user.tenant_id, role="member"
+    )
+    outsider = TenantUser.objects.using(tenant_alias).create(auth_user=99, tenant=uuid.uuid4(), role="member")
+
+    response = client.post(
+        "/api/v1/tasks/bulk-update/",
+        [
+            {"id": mine.id, "assigned_to": member.id},
+            {"id": ghost.id, "assigned_to": 999999},
+            {"id": theirs.id, "assigned_to": outsider.id},
+        ],
+        format="json",
+    )
+
+    assert response.status_code == 207
+    assert [result["status"] for result in response.data["results"]] == ["updated", "invalid", "invalid"]
+    assert "assigned_to" in response.data["results"][1]["errors"]
+    assert "assigned_to" in response.data["results"][2]["errors"]
+    assert dict(Task.objects.using(tenant_alias).values_list("id", "assigned_to")) == {
+        mine.id: member.id, ghost.id: None, theirs.id: None,
+    }
+
+
+@pytest.mark.django_db
+def test_bulk_update_query_count_does_not_grow_with_batch(client, snapshots, notifications, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Board", created_by=client.user.id)
+    # The first write to a project without counters counts its tasks.
+    TaskCounterService.recount(db=tenant_alias, project_id=project.id)
+
+    def move(count):
+        tasks = _tasks(tenant_alias, project, count)
+        with CaptureQueriesContext(connections[tenant_alias]) as queries:
+            response = client.post(
+                "/api/v1/tasks/bulk-update/",
+                {"tasks": [{"id": task.id, "status": "IN_PROGRESS"} for task in tasks]},
+                format="json",
+            )
+        assert response.status_code == 200
+        return len(queries)
+
+    assert move(2) == move(200)
+    assert Task.objects.using(tenant_alias).filter(status=Task.Status.IN_PROGRESS).count() == 202
@@ -1,7 +1,10 @@
 import pytest
 from system.models import User
 from projects.models import Project
+from tasks.models import Task
+from tasks.notifications import notify_task_changes
 from tasks.services.task_service import TaskService
+from users.models import TenantUser
 
 
 @pytest.mark.django_db
@@ -47,3 +50,31 @@ def test_status_change_triggers_notification(monkeypatch):
 
     assert 'status' in called
     assert called['status'][0] == task.id
+
+
+@pytest.mark.django_db
+def test_batch_notifications_map_tenant_users_to_their_accounts(client, tenant_alias, monkeypatch):
+    sent = []
+    monkeypatch.setattr('tasks.notifications.get_tenant_db', lambda user: tenant_alias)
+    monkeypatch.setattr('tasks.notifications.send_mass_mail', lambda messages: sent.extend(messages))
+    assignee = User.objects.create_user(
+        username="assignee", password="pw", email="assignee@example.com", tenant_id=client.user.tenant_id
+    )
+    member = TenantUser.objects.using(tenant_alias).create(
+        auth_user=assignee.id, tenant=client.user.tenant_id, role="member"
+    )
+    project = Project.objects.using(tenant_alias).create(name="notif-batch", created_by=client.user.id)
+    assigned, moved = Task.objects.using(tenant_alias).bulk_create(
+        [Task(project=project, title="Assigned"), Task(project=project, title="Moved", assigned_to=member.id)]
+    )
+
+    notify_task_changes(
+        actor_id=client.user.id,
+        assignments=[[member.id, assigned.id], [999999, assigned.id]],
+        status_changes=[[moved.id, "OPEN", "IN_PROGRESS"]],
+    )
+
+    assert [(subject, recipients) for subject, _, _, recipients in sent] == [
+        ("You've been assigned to task: Assigned", ["assignee@example.com"]),
+        ("Task status changed: Moved", ["assignee@example.com"]),
+    ]
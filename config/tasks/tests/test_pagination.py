@@ -0,0 +1,78 @@
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from projects.models import Project
+from tasks.models import Task
+
+
+@pytest.fixture
+def tasks(monkeypatch, snapshots, tenant_alias, client):
+    monkeypatch.setattr("tasks.services.task_service.get_tenant_read_db", lambda user: tenant_alias)
+    project = Project.objects.using(tenant_alias).create(name="Paged", created_by=client.user.id)
+    created = Task.objects.using(tenant_alias).bulk_create(
+        [Task(project=project, title=f"Task {i}") for i in range(7)]
+    )
+    # Ties on created_at are broken by id.
+    Task.objects.using(tenant_alias).filter(id__in=[task.id for task in created[2:5]]).update(
+        created_at=timezone.now()
+    )
+    return Task.objects.using(tenant_alias).order_by("-created_at", "-id")
+
+
+def _pages(client, url):
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        yield response.data["results"]
+        url = response.data["next"]
+
+
+@pytest.mark.django_db
+def test_cursor_walks_every_task_once_in_order(client, tasks):
+    pages = list(_pages(client, "/api/v1/tasks/?page_size=3"))
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [task["id"] for page in pages for task in page] == [task.id for task in tasks]
+
+
+@pytest.mark.django_db
+def test_new_tasks_do_not_shift_later_pages(client, tasks):
+    first = client.get("/api/v1/tasks/?page_size=3").data
+    Task.objects.using(tasks.db).create(project=tasks[0].project, title="Newest")
+
+    second = client.get(first["next"]).data
+
+    assert [task["id"] for task in second["results"]] == [task.id for task in tasks[4:7]]
+
+
+@pytest.mark.django_db
+def test_page_size_is_capped_and_bad_cursors_rejected(client, tasks, settings):
+    settings.PAGINATION = {"page_size": 2, "max_page_size": 4}
+
+    assert len(client.get("/api/v1/tasks/").data["results"]) == 2
+    assert len(client.get("/api/v1/tasks/?page_size=100").data["results"]) == 4
+    assert client.get("/api/v1/tasks/?cursor=not-a-cursor").status_code == 404
+
+
+@pytest.mark.django_db
+def test_later_pages_seek_through_the_index(client, tasks):
+    project = tasks[0].project
+    Task.objects.using(tasks.db).bulk_create(
+        [Task(project=project, title=f"Filler {i}") for i in range(5000)], batch_size=1000
+    )
+    connection = connections[tasks.db]
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+    first = client.get("/api/v1/tasks/?page_size=50").data
+    with CaptureQueriesContext(connection) as queries:
+        client.get(first["next"])
+    sql = next(query["sql"] for query in queries if "ROW(" in query["sql"])
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {sql}")
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+
+    assert "task_live_created_idx" in plan
+    assert "Index Cond: (ROW(created_at, id) < ROW(" in plan
@@ -0,0 +1,52 @@
+import uuid
+
+import pytest
+from django.test import override_settings
+
+from analytics.services.snapshot_refresh import SnapshotRefreshService
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "analytics.tasks.refresh_project_snapshot.apply_async",
+        lambda kwargs, countdown: calls.append((kwargs, countdown)),
+    )
+    with override_settings(CACHES=LOCMEM_CACHE, ANALYTICS_SNAPSHOTS={"refresh_window_seconds": 15}):
+        yield calls
+
+
+def test_writes_in_a_window_schedule_one_refresh_per_project(scheduled):
+    tenant_id = uuid.uuid4()
+
+    marks = [SnapshotRefreshService.mark_dirty(tenant_id=tenant_id, project_id=1) for _ in range(50)]
+    SnapshotRefreshService.mark_dirty(tenant_id=tenant_id, project_id=2)
+
+    assert marks.count(True) == 1
+    assert scheduled == [
+        ({"tenant_id": str(tenant_id), "project_id": 1}, 15),
+        ({"tenant_id": str(tenant_id), "project_id": 2}, 15),
+    ]
+
+
+def test_refresh_clears_the_mark_for_the_next_window(scheduled):
+    tenant_id = uuid.uuid4()
+    SnapshotRefreshService.mark_dirty(tenant_id=tenant_id, project_id=1)
+
+    SnapshotRefreshService.clear(tenant_id=tenant_id, project_id=1)
+
+    assert SnapshotRefreshService.mark_dirty(tenant_id=tenant_id, project_id=1)
+    assert len(scheduled) == 2
+
+
+def test_unavailable_cache_never_fails_the_write(scheduled, monkeypatch):
+    def down(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr("analytics.services.snapshot_refresh.cache.add", down)
+
+    assert SnapshotRefreshService.mark_dirty(tenant_id=uuid.uuid4(), project_id=1) is False
+    assert scheduled == []
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from analytics.services.analytics_service import AnalyticsService
+from projects.models import Project
+from tasks.models import ProjectTaskCounters, Task, TaskSLA
+from tasks.services.task_counter_service import TaskCounterService
+from tasks.services.task_service import TaskService
+
+
+@pytest.mark.django_db
+def test_counters_follow_bulk_writes_and_deletes(client, snapshots, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Counted", created_by=client.user.id)
+
+    response = client.post(
+        "/api/v1/tasks/bulk/",
+        [{"project": project.id, "title": f"Task {i}"} for i in range(4)],
+        format="json",
+    )
+    ids = [result["task"]["id"] for result in response.data["results"]]
+    client.post(
+        "/api/v1/tasks/bulk-update/",
+        [
+            {"id": ids[0], "status": Task.Status.IN_PROGRESS},
+            {"id": ids[0], "status": Task.Status.DONE},
+            {"id": ids[1], "status": Task.Status.IN_PROGRESS},
+        ],
+        format="json",
+    )
+    TaskService.soft_delete(user=client.user, task=Task.objects.using(tenant_alias).get(id=ids[2]))
+
+    counters = TaskCounterService.current(db=tenant_alias, project_id=project.id)
+    assert counters["tasks_open"] == 1
+    assert counters["tasks_in_progress"] == 1
+    assert counters["tasks_done"] == 1
+    assert counters["tasks_created"] == 3
+    assert counters["tasks_completed"] == 1
+    assert TaskCounterService.recount(db=tenant_alias, project_id=project.id) == {}
+
+
+@pytest.mark.django_db
+def test_recount_repairs_drift(client, snapshots, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Drifted", created_by=client.user.id)
+    TaskService.create_task(user=client.user, project=project, title="Only", description="")
+    ProjectTaskCounters.objects.using(tenant_alias).filter(project=project).update(tasks_open=7)
+
+    assert TaskCounterService.recount(db=tenant_alias, project_id=project.id) == {"tasks_open": (7, 1)}
+    assert TaskCounterService.recount(db=tenant_alias, project_id=project.id) == {}
+
+
+@pytest.mark.django_db
+def test_todays_snapshot_reads_the_counters(client, snapshots, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Snapshot", created_by=client.user.id)
+    TaskService.create_task(user=client.user, project=project, title="One", description="")
+    TaskService.create_task(user=client.user, project=project, title="Two", description="")
+
+    snapshot = AnalyticsService.generate_daily_snapshot(db=tenant_alias, project=project)
+
+    assert (snapshot.tasks_open, snapshot.tasks_created, snapshot.tasks_done) == (2, 2, 0)
+
+
+@pytest.mark.django_db
+def test_stale_copies_do_not_apply_a_transition_twice(client, snapshots, tenant_alias, monkeypatch):
+    monkeypatch.setattr("tasks.services.task_service.notify_status_change.delay", lambda *args: None)
+    project = Project.objects.using(tenant_alias).create(name="Raced", created_by=client.user.id)
+    task = TaskService.create_task(user=client.user, project=project, title="Shared", description="")
+    first, second = (Task.objects.using(tenant_alias).get(id=task.id) for _ in range(2))
+
+    TaskService.update_task(user=client.user, task=first, status=Task.Status.IN_PROGRESS)
+    updated = TaskService.update_task(user=client.user, task=second, status=Task.Status.IN_PROGRESS)
+
+    assert updated.status == Task.Status.IN_PROGRESS
+    assert TaskCounterService.recount(db=tenant_alias, project_id=project.id) == {}
+
+
+@pytest.mark.django_db
+def test_deleting_a_task_completed_on_an_earlier_day(client, snapshots, tenant_alias, monkeypatch):
+    monkeypatch.setattr("tasks.services.task_service.notify_status_change.delay", lambda *args: None)
+    project = Project.objects.using(tenant_alias).create(name="Finished", created_by=client.user.id)
+    task = TaskService.create_task(user=client.user, project=project, title="Done", description="")
+    for status in (Task.Status.IN_PROGRESS, Task.Status.DONE):
+        task = TaskService.update_task(user=client.user, task=task, status=status)
+
+    # Completed yesterday; another task is created, then this one is
+    # edited and deleted today.
+    yesterday = timezone.now() - timedelta(days=1)
+    TaskSLA.objects.using(tenant_alias).filter(task=task).update(last_status_changed_at=yesterday)
+    Task.objects.using(tenant_alias).filter(id=task.id).update(created_at=yesterday)
+    ProjectTaskCounters.objects.using(tenant_alias).filter(project=project).update(day=yesterday.date())
+    TaskService.create_task(user=client.user, project=project, title="New today", description="")
+    task = TaskService.update_task(user=client.user, task=task, title="Done, renamed")
+    TaskService.soft_delete(user=client.user, task=task)
+
+    counters = TaskCounterService.current(db=tenant_alias, project_id=project.id)
+    assert (counters["tasks_done"], counters["tasks_created"], counters["tasks_completed"]) == (0, 1, 0)
+    assert AnalyticsService.generate_daily_snapshot(db=tenant_alias, project=project).tasks_completed == 0
+    assert TaskCounterService.recount(db=tenant_alias, project_id=project.id) == {}
+
+
+@pytest.mark.django_db
+def test_stale_copies_do_not_delete_twice_or_update_deleted_tasks(client, snapshots, tenant_alias):
+    project = Project.objects.using(tenant_alias).create(name="Raced", created_by=client.user.id)
+    task = TaskService.create_task(user=client.user, project=project, title="Shared", description="")
+    first, second, third = (Task.objects.using(tenant_alias).get(id=task.id) for _ in range(3))
+
+    TaskService.soft_delete(user=client.user, task=first)
+    TaskService.soft_delete(user=client.user, task=second)
+    with pytest.raises(Task.DoesNotExist):
+        TaskService.update_task(user=client.user, task=third, title="Too late")
+
+    assert TaskCounterService.current(db=tenant_alias, project_id=project.id)["tasks_open"] == 0
+    assert TaskCounterService.recount(db=tenant_alias, project_id=project.id) == {}
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.utils import timezone
+
+from projects.models import Project
+from tasks.models import Task
+from tasks.services.task_service import TaskService
+
+
+@pytest.fixture
+def board(monkeypatch, snapshots, tenant_alias, client):
+    monkeypatch.setattr("tasks.services.task_service.get_tenant_read_db", lambda user: tenant_alias)
+    project = Project.objects.using(tenant_alias).create(name="Board", created_by=client.user.id)
+    other = Project.objects.using(tenant_alias).create(name="Other", created_by=client.user.id)
+    Task.objects.using(tenant_alias).bulk_create(
+        [
+            Task(project=project, title="Fix login redirect", status=Task.Status.OPEN, assigned_to=7),
+            Task(project=project, title="Write release notes", status=Task.Status.DONE, assigned_to=7),
+            Task(project=project, title="Login audit", description="Check the redirect", assigned_to=8),
+            Task(project=other, title="Deleted redirect", is_deleted=True),
+            Task(project=other, title="Other project"),
+        ]
+    )
+    return project
+
+
+def _titles(response):
+    assert response.status_code == 200, response.data
+    return sorted(task["title"] for task in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_filters_combine(client, board):
+    assert _titles(client.get("/api/v1/tasks/", {"project": board.id, "assigned_to": 7})) == [
+        "Fix login redirect", "Write release notes",
+    ]
+    assert _titles(client.get("/api/v1/tasks/", {"status": "DONE"})) == ["Write release notes"]
+    assert _titles(client.get("/api/v1/tasks/", {"search": "redirect"})) == ["Fix login redirect", "Login audit"]
+    assert _titles(client.get("/api/v1/tasks/", {"search": "login", "assigned_to": 8})) == ["Login audit"]
+
+    tomorrow = (timezone.now() + timedelta(days=1)).isoformat()
+    assert _titles(client.get("/api/v1/tasks/", {"created_after": tomorrow})) == []
+    assert len(_titles(client.get("/api/v1/tasks/", {"created_before": tomorrow}))) == 4
+
+
+@pytest.mark.django_db
+def test_sort_is_whitelisted(client, board):
+    oldest_first = client.get("/api/v1/tasks/", {"sort": "created_at"}).data["results"]
+    assert [task["id"] for task in oldest_first] == sorted(task["id"] for task in oldest_first)
+
+    assert client.get("/api/v1/tasks/", {"sort": "title; drop table"}).status_code == 400
+    assert client.get("/api/v1/tasks/", {"status": "ARCHIVED"}).status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        # "filler": a project holding a tenth of the tasks
+        ({"project_id": "filler"}, "task_live_project_created_idx"),
+        ({"status": Task.Status.BLOCKED}, "task_live_status_created_idx"),
+        ({"assigned_to": 7, "status": Task.Status.OPEN}, "task_live_assignee_status_idx"),
+        ({"sort": "-updated_at"}, "task_live_updated_idx"),
+        ({}, "task_live_created_idx"),
+        ({"search": "redirect"}, "task_search_idx"),
+    ],
+)
+def test_common_filters_use_an_index(client, board, tenant_alias, filters, index):
+    # Enough unrelated tasks for the planner to prefer an index.
+    filler = [
+        Project.objects.using(tenant_alias).create(name=f"Filler {i}", created_by=client.user.id)
+        for i in range(10)
+    ]
+    Task.objects.using(tenant_alias).bulk_create(
+        [Task(project=filler[i % 10], title=f"Filler {i}") for i in range(5000)], batch_size=1000
+    )
+    with connections[tenant_alias].cursor() as cursor:
+        cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+    if filters.get("project_id") == "filler":
+        filters = {"project_id": filler[0].id}
+    plan = TaskService.list_tasks(user=client.user, **filters)[:50].explain()
+
+    assert index in plan
@@ -16,6 +16,7 @@ class LoginAPIView(TokenObtainPairView):
 class UserListCreateAPIView(generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    keyset_ordering = ("-date_joined", "-id")
 
     def get_queryset(self):
         return UserService.list_users(user=self.request.user)
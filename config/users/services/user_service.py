@@ -1,15 +1,15 @@
 from system.models import User
 from django.core.exceptions import PermissionDenied
 from config.permissions import Permissions
-from system.tenant_context import get_current_tenant_db as get_current_tenant, set_current_tenant_db as set_current_tenant
-from system.db_registry import ensure_tenant_db_registered
+from system.tenant_context import set_current_tenant_db as set_current_tenant
+from system.db_registry import get_tenant_db
 from users.models import TenantUser
 
 class UserService:
 
     @staticmethod
     def list_users(*, user):
-        base_qs = User.objects.filter(tenant_id=user.tenant.id).order_by("role", "username")
+        base_qs = User.objects.filter(tenant_id=user.tenant_id).order_by("role", "username")
 
         if user.role == User.Role.ADMIN:
             return base_qs
@@ -22,7 +22,7 @@ class UserService:
 
     @staticmethod
     def create_user(*, user, username: str, email: str, password: str, role: str) -> User:
-        db = ensure_tenant_db_registered(user.tenant)
+        db = get_tenant_db(user)
         set_current_tenant(db)
         if not Permissions.can_create_user(user):
             raise PermissionDenied("Not allowed to create users")
@@ -33,9 +33,9 @@ class UserService:
             email=email,
             password=password,
             role=role,
-            tenant=user.tenant,
+            tenant_id=user.tenant_id,
         )
-        TenantUser.objects.using(db).create(auth_user=user_obj.id, tenant=user.tenant.id.hex, role=user_obj .Role)
+        TenantUser.objects.using(db).create(auth_user=user_obj.id, tenant=user.tenant_id.hex, role=user_obj .Role)
 
         return user_obj
     @staticmethod
@@ -56,10 +56,7 @@ class UserService:
         if not Permissions.can_delete_user(user):
             raise PermissionDenied("Not allowed to delete users")
 
-        tenant = get_current_tenant()
-        if not tenant or target_user.tenant != tenant:
-            raise PermissionDenied("Not allowed to delete users in other tenants")
-        if user.role != 'ADMIN' and tenant != user.tenant:
+        if target_user.tenant_id is None or target_user.tenant_id != user.tenant_id:
             raise PermissionDenied("Not allowed to delete users in other tenants")
 
         target_user.delete()
\ No newline at end of file
@@ -2,7 +2,7 @@ import requests
 from django.conf import settings
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout, authenticate
-from system.services.tenant_service import TenantService
+from system.services.tenant_provisioning import TenantProvisioningService
 from system.models import Tenant, User
 
 # def signup_ui_view(request):
@@ -51,44 +51,23 @@ def signup_ui_view(request):
                 "password": password,
                 "email": email,
             },
-            # timeout=5,
+            timeout=5,
         )
 
-        if signup_res.status_code != 201:
+        if signup_res.status_code != 202:
             return render(
                 request,
                 "auth/signup.html",
                 {"error": "Signup failed"},
             )
 
-        # 2️⃣ Login via JWT
-        login_res = requests.post(
-            f"{settings.API_BASE_URL}/api/v1/auth/login/",
-            json={
-                "username": username,
-                "password": password,
-            },
-            timeout=5,
+        # 2️⃣ Database is provisioned in the background: poll, then log in
+        return render(
+            request,
+            "auth/signup_pending.html",
+            {"status_url": signup_res.json()["status_url"], "username": username},
         )
 
-        if login_res.status_code != 200:
-            return render(
-                request,
-                "auth/signup.html",
-                {"error": "Login failed after signup"},
-            )
-
-        data = login_res.json()
-
-        # 3️⃣ Store JWT
-        request.session["access_token"] = data["access"]
-        request.session["refresh_token"] = data["refresh"]
-        request.session["tenant_id"] = data["tenant_id"]
-        request.session["role"] = data["role"]
-        request.session.save()
-
-        return redirect("project-list")
-
     return render(request, "auth/signup.html")
 # def login_ui_view(request):
 #     if request.method == "POST":
@@ -313,7 +292,7 @@ def tenant_list_ui(request):
     if request.user.role != 'ADMIN':
         return redirect('project-list')
     
-    tenants = Tenant.objects.all()
+    tenants = Tenant.objects.select_related("provisioning")
     return render(request, 'system/tenant_list.html', {'tenants': tenants})
 
 
@@ -328,13 +307,12 @@ def tenant_create_ui(request):
         email = request.POST['email']
         
         try:
-            tenant, user = TenantService.create_tenant(
+            TenantProvisioningService.start(
                 tenant_name=tenant_name,
                 admin_username=admin_username,
                 admin_password=admin_password,
+                admin_email=email,
             )
-            user.email = email
-            user.save()
             return redirect('tenant-list')
         except Exception as e:
             return render(request, 'system/tenant_create.html', {'error': str(e)})